@@ -32,6 +32,26 @@ _expression_cache: Dict[str, ast.Expression] = {}
 _regex_cache: Dict[str, re.Pattern] = {}
 
 
+# Characters normalized() ignores: spaces, hyphens, apostrophes, periods, asterisks
+_NORMALIZE_STRIP_RE = re.compile(r"[\s\-'.*]+")
+
+# Cache for normalized() patterns (pattern string -> normalized string)
+_normalized_cache: Dict[str, str] = {}
+
+
+def _normalize_text(text: str) -> str:
+    """Uppercase text and drop the characters normalized() ignores."""
+    return _NORMALIZE_STRIP_RE.sub('', text.upper())
+
+
+def _compile_regex(pattern: str) -> re.Pattern:
+    """Compile a case-insensitive regex, reusing the cached Pattern if any."""
+    compiled = _regex_cache.get(pattern)
+    if compiled is None:
+        compiled = _regex_cache[pattern] = re.compile(pattern, re.IGNORECASE)
+    return compiled
+
+
 # =============================================================================
 # Whitelist of allowed AST nodes
 # =============================================================================
@@ -169,7 +189,8 @@ class TransactionContext:
     """
 
     __slots__ = ('description', 'amount', 'date', 'variables', 'field', 'source',
-                 'month', 'year', 'day', 'weekday', 'location', 'data_sources')
+                 'month', 'year', 'day', 'weekday', 'location', 'data_sources',
+                 '_description_upper', '_description_normalized')
 
     # Class-level function name mapping (looked up dynamically)
     _FUNCTION_NAMES: Set[str] = {
@@ -198,6 +219,8 @@ class TransactionContext:
         self.source = source or ""  # Data source name (e.g., "Amex", "Chase")
         self.location = location or ""  # Transaction location (e.g., "Seattle, WA")
         self.data_sources = data_sources or {}  # Source name -> list of row dicts
+        self._description_upper: Optional[str] = None
+        self._description_normalized: Optional[str] = None
 
         # Extract date components
         if date:
@@ -211,6 +234,20 @@ class TransactionContext:
             self.day = 0
             self.weekday = 0
 
+    @property
+    def description_upper(self) -> str:
+        """Uppercased description, computed once for all matching functions."""
+        if self._description_upper is None:
+            self._description_upper = self.description.upper()
+        return self._description_upper
+
+    @property
+    def description_normalized(self) -> str:
+        """Description as normalized() compares it, computed once."""
+        if self._description_normalized is None:
+            self._description_normalized = _normalize_text(self.description)
+        return self._description_normalized
+
     def get_function(self, name: str) -> Optional[Callable]:
         """Get a function by name, looking up method dynamically."""
         if name == 'abs':
@@ -229,7 +266,7 @@ class TransactionContext:
             contains(field.memo, "REF")  # Search custom field
         """
         if len(args) == 1:
-            text, pattern = self.description, args[0]
+            return args[0].upper() in self.description_upper
         elif len(args) == 2:
             text, pattern = args[0], args[1]
         else:
@@ -250,10 +287,7 @@ class TransactionContext:
         else:
             raise ExpressionError("regex() requires 1 or 2 arguments: regex(pattern) or regex(text, pattern)")
         try:
-            # Use cached compiled pattern
-            if pattern not in _regex_cache:
-                _regex_cache[pattern] = re.compile(pattern, re.IGNORECASE)
-            return bool(_regex_cache[pattern].search(text))
+            return bool(_compile_regex(pattern).search(text))
         except re.error as e:
             raise ExpressionError(f"Invalid regex pattern: {e}")
 
@@ -268,16 +302,18 @@ class TransactionContext:
             normalized(field.name, "WHOLEFOODS")   # Search custom field
         """
         if len(args) == 1:
-            text, pattern = self.description, args[0]
+            text, pattern = None, args[0]
         elif len(args) == 2:
             text, pattern = args[0], args[1]
         else:
             raise ExpressionError("normalized() requires 1 or 2 arguments: normalized(pattern) or normalized(text, pattern)")
 
-        def normalize(s: str) -> str:
-            # Remove spaces, hyphens, apostrophes, periods, asterisks
-            return re.sub(r"[\s\-'.*]+", '', s.upper())
-        return normalize(pattern) in normalize(text)
+        needle = _normalized_cache.get(pattern)
+        if needle is None:
+            needle = _normalized_cache[pattern] = _normalize_text(pattern)
+        if text is None:
+            return needle in self.description_normalized
+        return needle in _normalize_text(text)
 
     def _fn_anyof(self, *patterns: str) -> bool:
         """Check if description contains any of the given patterns (case-insensitive).
@@ -285,7 +321,7 @@ class TransactionContext:
         Cleaner syntax for: contains("A") or contains("B") or contains("C")
         Note: This function only works on description (not custom fields).
         """
-        desc_upper = self.description.upper()
+        desc_upper = self.description_upper
         return any(p.upper() in desc_upper for p in patterns)
 
     def _fn_startswith(self, *args) -> bool:
@@ -298,7 +334,7 @@ class TransactionContext:
             startswith(field.vendor, "COST") # Check custom field
         """
         if len(args) == 1:
-            text, pattern = self.description, args[0]
+            return self.description_upper.startswith(args[0].upper())
         elif len(args) == 2:
             text, pattern = args[0], args[1]
         else:
@@ -339,9 +375,13 @@ class TransactionContext:
         # Slide a window of pattern length across text
         if len(pattern_upper) > len(text_upper):
             return SequenceMatcher(None, text_upper, pattern_upper).ratio() >= threshold
+        # SequenceMatcher indexes its second sequence, so keep the pattern
+        # there and only swap in each window; quick_ratio() bounds ratio()
+        # from above and rules out most windows cheaply
+        matcher = SequenceMatcher(None, b=pattern_upper)
         for i in range(len(text_upper) - len(pattern_upper) + 1):
-            window = text_upper[i:i + len(pattern_upper)]
-            if SequenceMatcher(None, window, pattern_upper).ratio() >= threshold:
+            matcher.set_seq1(text_upper[i:i + len(pattern_upper)])
+            if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
                 return True
         return False
 
@@ -364,7 +404,7 @@ class TransactionContext:
             raise ExpressionError("extract() requires 1 or 2 arguments: extract(pattern) or extract(text, pattern)")
 
         try:
-            match = re.search(pattern, text, re.IGNORECASE)
+            match = _compile_regex(pattern).search(text)
             if match and match.groups():
                 return match.group(1)
             return ''
@@ -440,7 +480,7 @@ class TransactionContext:
         if len(args) != 3:
             raise ExpressionError("regex_replace() requires 3 arguments: regex_replace(text, pattern, replacement)")
         text, pattern, replacement = str(args[0]), str(args[1]), str(args[2])
-        return re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+        return _compile_regex(pattern).sub(replacement, text)
 
     def _fn_uppercase(self, *args) -> str:
         """Convert text to uppercase.
@@ -494,9 +534,14 @@ class TransactionContext:
         txn: Dict,
         variables: Optional[Dict[str, Any]] = None,
         data_sources: Optional[Dict[str, List[Dict]]] = None,
+        description_upper: Optional[str] = None,
     ) -> 'TransactionContext':
-        """Create context from a transaction dictionary."""
-        return cls(
+        """Create context from a transaction dictionary.
+
+        description_upper may pass in the already uppercased description so
+        matching functions don't uppercase it again.
+        """
+        ctx = cls(
             description=txn.get('description', txn.get('raw_description', '')),
             amount=txn.get('amount', 0.0),
             date=txn.get('date'),
@@ -506,6 +551,8 @@ class TransactionContext:
             location=txn.get('location'),
             data_sources=data_sources,
         )
+        ctx._description_upper = description_upper
+        return ctx
 
 
 class ExpressionContext:
@@ -876,6 +923,19 @@ class ExpressionEvaluator:
             return self.evaluate(node.orelse)
 
 
+# txn.<name> and built-in field.<name> -> TransactionContext slot, so
+# attribute access is one dict lookup instead of a chain of comparisons
+_TXN_ATTRIBUTES: Dict[str, str] = {
+    'description': 'description', 'amount': 'amount', 'date': 'date',
+    'source': 'source', 'location': 'location', 'month': 'month',
+    'year': 'year', 'day': 'day', 'weekday': 'weekday',
+}
+_BUILTIN_FIELDS: Dict[str, str] = {
+    'description': 'description', 'amount': 'amount', 'date': 'date',
+    'source': 'source', 'location': 'location',
+}
+
+
 class TransactionEvaluator:
     """
     Evaluates a parsed AST expression against a transaction context.
@@ -894,9 +954,9 @@ class TransactionEvaluator:
 
     def evaluate(self, node: ast.AST) -> Any:
         """Evaluate an AST node and return its value."""
-        method = f'_eval_{type(node).__name__}'
-        if hasattr(self, method):
-            return getattr(self, method)(node)
+        method = getattr(self, f'_eval_{type(node).__name__}', None)
+        if method is not None:
+            return method(node)
         raise ExpressionError(f"Cannot evaluate node type: {type(node).__name__}")
 
     def _eval_Expression(self, node: ast.Expression) -> Any:
@@ -1047,65 +1107,41 @@ class TransactionEvaluator:
 
     def _eval_Attribute(self, node: ast.Attribute) -> Any:
         """Handle attribute access like field.txn_type, txn.amount, or r.item."""
-        # Handle txn.name access (explicit transaction context)
-        if isinstance(node.value, ast.Name) and node.value.id.lower() == 'txn':
-            attr_name = node.attr.lower()
-
-            if attr_name == 'description':
-                return self.ctx.description
-            elif attr_name == 'amount':
-                return self.ctx.amount
-            elif attr_name == 'date':
-                return self.ctx.date
-            elif attr_name == 'source':
-                return getattr(self.ctx, 'source', '')
-            elif attr_name == 'location':
-                return getattr(self.ctx, 'location', '')
-            elif attr_name == 'month':
-                return self.ctx.month
-            elif attr_name == 'year':
-                return self.ctx.year
-            elif attr_name == 'day':
-                return self.ctx.day
-            elif attr_name == 'weekday':
-                return self.ctx.weekday
-            else:
-                available = ['description', 'amount', 'date', 'source', 'location',
-                             'month', 'year', 'day', 'weekday']
+        if isinstance(node.value, ast.Name):
+            owner = node.value.id.lower()
+
+            # Handle txn.name access (explicit transaction context)
+            if owner == 'txn':
+                slot = _TXN_ATTRIBUTES.get(node.attr.lower())
+                if slot is None:
+                    raise ExpressionError(
+                        f"Unknown txn attribute: txn.{node.attr}. "
+                        f"Available: {', '.join(_TXN_ATTRIBUTES)}"
+                    )
+                return getattr(self.ctx, slot)
+
+            # Handle field.name access (custom CSV fields)
+            if owner == 'field':
+                field_name = node.attr.lower()
+
+                # Built-in fields
+                slot = _BUILTIN_FIELDS.get(field_name)
+                if slot is not None:
+                    return getattr(self.ctx, slot)
+
+                # Custom fields from CSV
+                if self.ctx.field is not None and field_name in self.ctx.field:
+                    return self.ctx.field[field_name]
+
+                # Field not found
+                available = list(_BUILTIN_FIELDS)
+                if self.ctx.field:
+                    available.extend(sorted(self.ctx.field.keys()))
                 raise ExpressionError(
-                    f"Unknown txn attribute: txn.{node.attr}. "
-                    f"Available: {', '.join(available)}"
+                    f"Unknown field: field.{node.attr}. "
+                    f"Available fields: {', '.join(available)}"
                 )
 
-        # Handle field.name access (custom CSV fields)
-        if isinstance(node.value, ast.Name) and node.value.id.lower() == 'field':
-            field_name = node.attr.lower()
-
-            # Built-in fields
-            if field_name == 'description':
-                return self.ctx.description
-            elif field_name == 'amount':
-                return self.ctx.amount
-            elif field_name == 'date':
-                return self.ctx.date
-            elif field_name == 'source':
-                return getattr(self.ctx, 'source', '')
-            elif field_name == 'location':
-                return getattr(self.ctx, 'location', '')
-
-            # Custom fields from CSV
-            if self.ctx.field is not None and field_name in self.ctx.field:
-                return self.ctx.field[field_name]
-
-            # Field not found
-            available = ['description', 'amount', 'date', 'source', 'location']
-            if self.ctx.field:
-                available.extend(sorted(self.ctx.field.keys()))
-            raise ExpressionError(
-                f"Unknown field: field.{node.attr}. "
-                f"Available fields: {', '.join(available)}"
-            )
-
         # Handle row.attr access for list comprehension loop variables or subscript access
         # Examples: r.name, orders[0].name, merchant.item
         try:
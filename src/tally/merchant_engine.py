@@ -20,7 +20,10 @@ File format:
     tags: large
 """
 
+import ast
+import operator
 import re
+import sys
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set, Tuple
@@ -47,6 +50,13 @@ class MerchantRule:
     def __post_init__(self):
         if not self.merchant:
             self.merchant = self.name
+        # Many rules share a category; interned, every matched transaction
+        # carries the same string object into the analyzer's grouping dicts.
+        # Short legacy CSV rows leave them None.
+        if isinstance(self.category, str):
+            self.category = sys.intern(self.category)
+        if isinstance(self.subcategory, str):
+            self.subcategory = sys.intern(self.subcategory)
 
     @property
     def is_categorization_rule(self) -> bool:
@@ -76,7 +86,7 @@ class MatchResult:
     matched_rule: Optional[MerchantRule] = None  # Rule that set category (most specific)
     merchant_rule: Optional[MerchantRule] = None  # Rule that set merchant (most specific)
     subcategory_rule: Optional[MerchantRule] = None  # Rule that set subcategory (most specific)
-    all_matching_rules: List[MerchantRule] = field(default_factory=list)  # All rules that matched
+    all_matching_rules: List[MerchantRule] = field(default_factory=list)  # All rules that matched (see match())
     tag_rules: List[MerchantRule] = field(default_factory=list)  # Rules that contributed tags
     extra_fields: Dict[str, Any] = field(default_factory=dict)  # Evaluated fields from matching rule
     tag_sources: Dict[str, Dict] = field(default_factory=dict)  # {tag: {rule: name, pattern: expr}}
@@ -120,6 +130,113 @@ def _extract_pattern_length(match_expr: str) -> int:
     return sum(len(s) for s in strings)
 
 
+def _required_literals(match_expr: str) -> Tuple[Tuple[str, ...], bool]:
+    """Return uppercased contains("...") literals a match requires.
+
+    Collects the literals of contains("X") terms at the top level of an
+    'and' chain, e.g. ('COSTCO',) for contains("COSTCO") and amount > 200.
+    The description must contain all of them for the rule to match. The
+    flag is True when those terms are the whole expression, so the literal
+    checks alone decide the match.
+    """
+    try:
+        tree = expr_parser.parse_expression(match_expr)
+    except expr_parser.ExpressionError:
+        return (), False
+
+    body = tree.body
+    if isinstance(body, ast.BoolOp) and isinstance(body.op, ast.And):
+        terms = body.values
+    else:
+        terms = [body]
+
+    literals = []
+    for term in terms:
+        if (isinstance(term, ast.Call)
+                and isinstance(term.func, ast.Name)
+                and term.func.id == 'contains'
+                and len(term.args) == 1
+                and not term.keywords
+                and isinstance(term.args[0], ast.Constant)
+                and isinstance(term.args[0].value, str)):
+            literals.append(term.args[0].value.upper())
+    return tuple(literals), len(literals) == len(terms)
+
+
+# Comparison operators a numeric guard may use
+_GUARD_OPS = {
+    ast.Gt: operator.gt, ast.GtE: operator.ge,
+    ast.Lt: operator.lt, ast.LtE: operator.le,
+    ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+
+
+def _numeric_guards(match_expr: str) -> Tuple[Tuple[str, Any, float], ...]:
+    """Return (name, op, value) for amount/month comparisons a match requires.
+
+    Collects terms like amount > 500 or month == 12 at the top level of an
+    'and' chain, which can be checked without the expression evaluator.
+    """
+    try:
+        tree = expr_parser.parse_expression(match_expr)
+    except expr_parser.ExpressionError:
+        return ()
+    # A walrus could rebind amount/month before the comparison runs
+    if any(isinstance(node, ast.NamedExpr) for node in ast.walk(tree)):
+        return ()
+
+    body = tree.body
+    if isinstance(body, ast.BoolOp) and isinstance(body.op, ast.And):
+        terms = body.values
+    else:
+        terms = [body]
+
+    guards = []
+    for term in terms:
+        if not (isinstance(term, ast.Compare)
+                and len(term.ops) == 1
+                and type(term.ops[0]) in _GUARD_OPS
+                and isinstance(term.left, ast.Name)
+                and term.left.id.lower() in ('amount', 'month')):
+            continue
+        right = term.comparators[0]
+        negate = isinstance(right, ast.UnaryOp) and isinstance(right.op, ast.USub)
+        if negate:
+            right = right.operand
+        if not (isinstance(right, ast.Constant)
+                and type(right.value) in (int, float)):
+            continue
+        value = -right.value if negate else right.value
+        guards.append((term.left.id.lower(), _GUARD_OPS[type(term.ops[0])], value))
+    return tuple(guards)
+
+
+def _compile_tag(tag: str) -> Tuple[Optional[str], Optional[ast.Expression]]:
+    """Split a rule tag into (static tag, dynamic expression AST).
+
+    Static tags come back lowercased and interned, so a tag shared by many
+    rules is one string object; {expression} tags come back parsed. Both are
+    None for empty tags and invalid expressions, which are skipped.
+    """
+    tag = tag.strip()
+    if not tag:
+        return None, None
+    if tag.startswith('{') and tag.endswith('}'):
+        expr = tag[1:-1].strip()
+        if not expr:
+            return None, None
+        try:
+            return None, expr_parser.parse_expression(expr)
+        except expr_parser.ExpressionError:
+            return None, None
+    return sys.intern(tag.lower()), None
+
+
+# Line patterns for the .rules parser
+_ASSIGNMENT_RE = re.compile(r'^(field\.[a-zA-Z_][a-zA-Z0-9_]*|[a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(.+)$')
+_BINDING_RE = re.compile(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(.+)$')  # let: and field: values
+
+
 class MerchantParseError(Exception):
     """Error parsing .rules file."""
 
@@ -153,6 +270,9 @@ class MerchantEngine:
         self.variables: Dict[str, Any] = {}
         self.transforms: List[Tuple[str, str]] = []  # [(field_path, expression), ...]
         self._compiled_exprs: Dict[str, Any] = {}  # Cache of parsed ASTs
+        self._literal_exprs: Dict[str, Tuple[Tuple[str, ...], bool]] = {}  # Cache of _required_literals()
+        self._tag_exprs: Dict[str, Tuple[Optional[str], Optional[ast.Expression]]] = {}  # Cache of _compile_tag()
+        self._guard_exprs: Dict[str, Tuple[Tuple[str, Any, float], ...]] = {}  # Cache of _numeric_guards()
         self.match_mode = match_mode
 
     def load_file(self, filepath: Path) -> None:
@@ -166,6 +286,9 @@ class MerchantEngine:
         self.variables = {}
         self.transforms = []
         self._compiled_exprs = {}
+        self._literal_exprs = {}
+        self._tag_exprs = {}
+        self._guard_exprs = {}
 
         lines = content.split('\n')
         current_rule: Optional[Dict[str, Any]] = None
@@ -196,7 +319,7 @@ class MerchantEngine:
             if '=' in stripped and current_rule is None:
                 # Check if it's not inside a rule (i.e., a top-level assignment)
                 # Match field.name or regular variable name
-                match = re.match(r'^(field\.[a-zA-Z_][a-zA-Z0-9_]*|[a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(.+)$', stripped)
+                match = _ASSIGNMENT_RE.match(stripped)
                 if match:
                     lhs, rhs = match.groups()
                     try:
@@ -220,7 +343,7 @@ class MerchantEngine:
 
                 if key == 'let':
                     # let: var_name = expression
-                    let_match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(.+)$', value)
+                    let_match = _BINDING_RE.match(value)
                     if not let_match:
                         raise MerchantParseError(
                             f"Invalid let syntax. Expected: let: name = expression",
@@ -232,7 +355,7 @@ class MerchantEngine:
                     current_rule['let_bindings'].append((var_name.lower(), expr))
                 elif key == 'field':
                     # field: name = expression (adds extra field to transaction)
-                    field_match = re.match(r'^([a-zA-Z_][a-zA-Z0-9_]*)\s*=\s*(.+)$', value)
+                    field_match = _BINDING_RE.match(value)
                     if not field_match:
                         raise MerchantParseError(
                             f"Invalid field syntax. Expected: field: name = expression",
@@ -252,27 +375,31 @@ class MerchantEngine:
                     current_rule['merchant'] = value
                 elif key == 'tags':
                     # Parse comma-separated tags, but don't split inside parentheses
-                    tags = set()
-                    depth = 0
-                    current = []
-                    for char in value:
-                        if char == '(':
-                            depth += 1
-                            current.append(char)
-                        elif char == ')':
-                            depth -= 1
-                            current.append(char)
-                        elif char == ',' and depth == 0:
-                            tag = ''.join(current).strip()
-                            if tag:
-                                tags.add(tag)
-                            current = []
-                        else:
-                            current.append(char)
-                    # Don't forget the last tag
-                    tag = ''.join(current).strip()
-                    if tag:
-                        tags.add(tag)
+                    if '(' not in value and ')' not in value:
+                        # Common case: static tags, nothing to protect from splitting
+                        tags = {t for t in map(str.strip, value.split(',')) if t}
+                    else:
+                        tags = set()
+                        depth = 0
+                        current = []
+                        for char in value:
+                            if char == '(':
+                                depth += 1
+                                current.append(char)
+                            elif char == ')':
+                                depth -= 1
+                                current.append(char)
+                            elif char == ',' and depth == 0:
+                                tag = ''.join(current).strip()
+                                if tag:
+                                    tags.add(tag)
+                                current = []
+                            else:
+                                current.append(char)
+                        # Don't forget the last tag
+                        tag = ''.join(current).strip()
+                        if tag:
+                            tags.add(tag)
                     current_rule['tags'] = tags
                 elif key == 'priority':
                     try:
@@ -446,37 +573,39 @@ class MerchantEngine:
             Set of resolved tag strings (lowercased)
         """
         resolved = set()
+        ctx = None
         for tag in rule.tags:
-            tag = tag.strip()
-            if not tag:
-                continue
+            if tag in self._tag_exprs:
+                static, tree = self._tag_exprs[tag]
+            else:
+                static, tree = self._tag_exprs[tag] = _compile_tag(tag)
 
-            if tag.startswith('{') and tag.endswith('}'):
-                # Dynamic tag - evaluate expression
-                expr = tag[1:-1].strip()
-                if not expr:
-                    continue
+            if static is not None:
+                resolved.add(static)
+                continue
+            if tree is None:
+                continue
 
-                try:
-                    result = expr_parser.evaluate_transaction(
-                        expr, transaction, variables=variables, data_sources=data_sources
-                    )
-                    if result:
-                        # Handle list results (e.g., from list comprehensions)
-                        if isinstance(result, list):
-                            for item in result:
-                                if item:
-                                    resolved.add(str(item).strip().lower())
-                        else:
-                            stripped = str(result).strip()
-                            if stripped:
-                                resolved.add(stripped.lower())
-                except expr_parser.ExpressionError:
-                    # Skip invalid expressions silently
-                    pass
-            else:
-                # Static tag
-                resolved.add(tag.lower())
+            # Dynamic tag - evaluate expression (one context shared by all tags)
+            if ctx is None:
+                ctx = expr_parser.TransactionContext.from_transaction(
+                    transaction, variables, data_sources
+                )
+            try:
+                result = expr_parser.TransactionEvaluator(ctx).evaluate(tree)
+                if result:
+                    # Handle list results (e.g., from list comprehensions)
+                    if isinstance(result, list):
+                        for item in result:
+                            if item:
+                                resolved.add(str(item).strip().lower())
+                    else:
+                        stripped = str(result).strip()
+                        if stripped:
+                            resolved.add(stripped.lower())
+            except expr_parser.ExpressionError:
+                # Skip invalid expressions silently
+                pass
 
         return resolved
 
@@ -488,27 +617,77 @@ class MerchantEngine:
         - 'first_match': First matching rule with category wins (backwards compatible)
         - 'most_specific': Most specific matching rule wins
 
-        In both modes, tags are collected from ALL matching rules.
+        In both modes, tags are collected from ALL matching rules. In
+        'first_match' mode, categorization rules without tags are not
+        evaluated once a category is set, since they can't affect the result
+        (so they don't appear in all_matching_rules either).
 
         Args:
             transaction: Transaction dict with description, amount, date, etc.
             data_sources: Optional dict mapping source names to list of row dicts
         """
         result = MatchResult()
-        all_tags: Set[str] = set()
+        # Keys double as the unique tags, in the order rules first added them
         tag_sources: Dict[str, Dict] = {}
 
         # Evaluate global variables for this transaction
         global_variables = self._evaluate_variables(transaction, data_sources)
 
+        # Uppercased description for rules that are plain contains() checks
+        description = transaction.get('description', transaction.get('raw_description', ''))
+        desc_upper = description.upper() if isinstance(description, str) else None
+
+        # Values for amount/month guards, as the evaluator would see them
+        amount = transaction.get('amount', 0.0)
+        txn_date = transaction.get('date')
+        guard_values = {
+            'amount': amount if type(amount) in (int, float) else None,
+            'month': txn_date.month if txn_date else 0,
+        }
+
+        # Evaluation context shared by every rule without let bindings
+        shared_ctx: Optional[expr_parser.TransactionContext] = None
+
         # Track the first categorization rule (for first_match mode)
         first_category_rule: Optional[Tuple[MerchantRule, Dict]] = None
+        first_match = self.match_mode == 'first_match'
 
         # Collect all matching rules (needed for most_specific mode and tag collection)
         matching_rules: List[Tuple[MerchantRule, Tuple[int, int, int, int], Dict]] = []
 
         # Evaluate ALL rules (we always need to do this for tag collection)
         for rule in self.rules:
+            # Once first_match has its category, later categorization rules
+            # only matter for their tags
+            if (first_match and first_category_rule is not None
+                    and rule.is_categorization_rule and not rule.tags):
+                continue
+
+            expr = rule.match_expr
+            if expr in self._literal_exprs:
+                literals, exact = self._literal_exprs[expr]
+            else:
+                literals, exact = self._literal_exprs[expr] = _required_literals(expr)
+
+            # A rule can't match if a contains() literal it requires is absent
+            if desc_upper is not None and literals:
+                if not all(literal in desc_upper for literal in literals):
+                    continue
+
+            # ...or if a required amount/month comparison fails. Skipped when
+            # a variable shadows the name, since the evaluator reads that first.
+            if expr in self._guard_exprs:
+                guards = self._guard_exprs[expr]
+            else:
+                guards = self._guard_exprs[expr] = _numeric_guards(expr)
+            if guards and not rule.let_bindings and any(
+                name not in self.variables
+                and guard_values[name] is not None
+                and not op(guard_values[name], value)
+                for name, op, value in guards
+            ):
+                continue
+
             try:
                 # Evaluate rule-level let bindings (can reference global variables)
                 if rule.let_bindings:
@@ -518,9 +697,21 @@ class MerchantEngine:
                 else:
                     variables = global_variables
 
-                matches = expr_parser.matches_transaction(
-                    rule.match_expr, transaction, variables, data_sources
-                )
+                if exact and desc_upper is not None:
+                    matches = True
+                else:
+                    if rule.let_bindings:
+                        ctx = expr_parser.TransactionContext.from_transaction(
+                            transaction, variables, data_sources, desc_upper
+                        )
+                    else:
+                        if shared_ctx is None:
+                            shared_ctx = expr_parser.TransactionContext.from_transaction(
+                                transaction, global_variables, data_sources, desc_upper
+                            )
+                        ctx = shared_ctx
+                    tree = expr_parser.parse_expression(expr)
+                    matches = bool(expr_parser.TransactionEvaluator(ctx).evaluate(tree))
             except expr_parser.ExpressionError:
                 # Skip rules that can't be evaluated
                 continue
@@ -536,8 +727,7 @@ class MerchantEngine:
                 # Collect tags from ALL matching rules (resolve dynamic expressions)
                 resolved_tags = self._resolve_tags(rule, transaction, variables, data_sources)
                 for tag in resolved_tags:
-                    if tag not in all_tags:
-                        all_tags.add(tag)
+                    if tag not in tag_sources:
                         tag_sources[tag] = {'rule': rule.name, 'pattern': rule.match_expr}
                 result.tag_rules.append(rule)
 
@@ -545,7 +735,7 @@ class MerchantEngine:
         result.all_matching_rules = [r for r, _, _ in matching_rules]
 
         # Resolve category based on match_mode
-        if self.match_mode == 'first_match':
+        if first_match:
             # First match wins (backwards compatible)
             if first_category_rule:
                 rule, variables = first_category_rule
@@ -594,7 +784,7 @@ class MerchantEngine:
                     result.subcategory = winner[0].subcategory
                     result.subcategory_rule = winner[0]
 
-        result.tags = all_tags
+        result.tags = set(tag_sources)
         result.tag_sources = tag_sources
         return result
 
@@ -5,11 +5,14 @@ This module provides functions to clean and categorize merchant descriptions
 from credit card and bank statements.
 """
 
+import copy
 import csv
+import functools
 import os
 import re
+import time
 from datetime import date
-from typing import Optional, List, Tuple, Dict, TYPE_CHECKING
+from typing import Callable, Optional, List, NamedTuple, Tuple, Dict, TextIO, TYPE_CHECKING
 
 from .modifier_parser import (
     parse_pattern_with_modifiers,
@@ -26,6 +29,76 @@ if TYPE_CHECKING:
 _cached_engine: Optional["MerchantEngine"] = None
 _cached_engine_path: Optional[str] = None
 
+# Parsed .rules files: (abspath, match_mode) -> (stat signature, content,
+# time read in ns, engine)
+# get_all_rules, get_tag_only_rules and get_transforms all load the same file
+_engine_file_cache: Dict[Tuple[str, str], Tuple[tuple, str, int, "MerchantEngine"]] = {}
+
+# Coarsest mtime resolution to allow for (FAT records 2 seconds)
+_MTIME_GRANULARITY_NS = 2_000_000_000
+
+class CsvRule(NamedTuple):
+    """A rule loaded from merchant_categories.csv.
+
+    Still a plain tuple to callers that index or unpack by position.
+    """
+    pattern: str  # Pure regex for matching (modifiers stripped)
+    merchant: str
+    category: str
+    subcategory: str
+    parsed: ParsedPattern  # Full parsed pattern with conditions
+    tags: List[str]
+
+
+class _PreparedRule(NamedTuple):
+    """A legacy rule tuple unpacked and compiled by _prepare_rules()."""
+    pattern: str
+    merchant: str
+    category: str
+    subcategory: str
+    conditions: Optional[ParsedPattern]  # Only set when there are modifiers to check
+    source: str
+    tags: List[str]
+    search: Optional[Callable]  # Compiled regex search, None for expressions
+    literal: Optional[str]  # Uppercased pattern when it has no regex syntax
+    required: Optional[str]  # Uppercased literal any regex match must contain
+
+
+# Legacy tuple rules unpacked and compiled for matching. The same rules list is
+# passed to normalize_merchant() for every transaction, so this is rebuilt only
+# when a different (or modified) list comes in.
+_prepared_rules: List[_PreparedRule] = []
+_prepared_rules_source: Optional[list] = None
+
+# Uppercased description -> indices of prepared regex/literal rules whose
+# pattern matches it. Statements repeat the same descriptions many times, and
+# the pattern part of a rule depends only on the description.
+_pattern_hits_cache: Dict[str, frozenset] = {}
+_PATTERN_HITS_CACHE_SIZE = 8192
+
+# normalize_merchant() results keyed by every input a rule can read. Owned by
+# the engine or prepared rules list they were computed with; cleared when
+# that changes.
+_merchant_cache: Dict[tuple, tuple] = {}
+_merchant_cache_owner: Optional[object] = None
+_MERCHANT_CACHE_SIZE = 8192
+
+# Characters that make a pattern a regex rather than a plain literal
+_REGEX_METACHARS = frozenset('.^$*+?{}[]\\|()')
+
+# Precompiled patterns for classifying and converting rule expressions
+_EXPR_FUNCTION_RE = re.compile(
+    r'^(contains|normalized|anyof|startswith|fuzzy|regex|extract|split|substring|trim|exists)\s*\('
+)
+_EXPR_VARIABLE_RE = re.compile(r'^(amount|month|year|day|source|description)\s*[<>=!]')
+_EXPR_NEW_FUNCTION_RE = re.compile(r'\b(normalized|anyof|startswith|fuzzy)\s*\(')
+_EXPR_CONTAINS_RE = re.compile(r'contains\s*\(\s*["\']([^"\']+)["\']\s*\)')
+_EXPR_REGEX_RE = re.compile(r'regex\s*\(\s*["\']([^"\']+)["\']\s*\)')
+_EXPR_QUOTED_RE = re.compile(r'["\']([^"\']+)["\']')
+
+# Characters dropped when deriving a fallback merchant name
+_NON_ALPHA_RE = re.compile(r'[^A-Za-z\s]+')
+
 
 def get_cached_engine() -> Optional["MerchantEngine"]:
     """Get the cached MerchantEngine if available."""
@@ -34,15 +107,161 @@ def get_cached_engine() -> Optional["MerchantEngine"]:
 
 def clear_engine_cache():
     """Clear the cached engine (useful for testing)."""
-    global _cached_engine, _cached_engine_path
+    global _cached_engine, _cached_engine_path, _merchant_cache_owner
     _cached_engine = None
     _cached_engine_path = None
+    _engine_file_cache.clear()
+    _merchant_cache.clear()
+    _merchant_cache_owner = None
+
+
+def _load_engine(rules_path: str, match_mode: str) -> "MerchantEngine":
+    """Load a .rules file, reusing the parsed engine while the file is unchanged.
+
+    An unchanged stat is only trusted once the file's mtime is well before
+    the last read. A same-size rewrite within the filesystem's mtime
+    granularity keeps the same stat, so recent files are reread and
+    compared by content instead.
+    """
+    from .merchant_engine import parse_merchants
+    st = os.stat(rules_path)
+    signature = (st.st_mtime_ns, st.st_size, st.st_ino)
+    key = (os.path.abspath(rules_path), match_mode)
+    cached = _engine_file_cache.get(key)
+    if (cached is not None and cached[0] == signature
+            and st.st_mtime_ns < cached[2] - _MTIME_GRANULARITY_NS):
+        return cached[3]
+    read_ns = time.time_ns()
+    with open(rules_path, encoding='utf-8') as f:
+        content = f.read()
+    if cached is not None and cached[1] == content:
+        engine = cached[3]
+    else:
+        engine = parse_merchants(content, match_mode=match_mode)
+    _engine_file_cache[key] = (signature, content, read_ns, engine)
+    return engine
+
+
+def _prepare_rules(rules: list) -> List[_PreparedRule]:
+    """Unpack and classify legacy rule tuples once per rules list.
+
+    ``conditions`` is the rule's ParsedPattern only when it has amount/date
+    modifiers to check, else None. ``search`` is the bound search method of
+    the compiled regex, or None for expression patterns. ``literal`` is the
+    uppercased pattern when it has no regex syntax (e.g. ``NETFLIX``), so it
+    can be matched with a substring check, else None. ``required`` is a
+    literal prefix that every match of a regex pattern must contain (e.g.
+    ``COSTCO`` for ``COSTCO(?!.*GAS)``), used to skip the regex when absent.
+    Rules with invalid regexes are dropped since they can never match.
+    """
+    global _prepared_rules, _prepared_rules_source, _pattern_hits_cache
+
+    # List equality checks element identity first, so this is cheap for the
+    # common case of the same list being passed again
+    if _prepared_rules_source is not None and _prepared_rules_source == rules:
+        return _prepared_rules
+
+    prepared = []
+    for rule in rules:
+        # Handle various formats: 4-tuple, 5-tuple, 6-tuple, 7-tuple (with tags)
+        tags = []
+        if len(rule) == 7:
+            pattern, merchant, category, subcategory, parsed, source, tags = rule
+        elif len(rule) == 6:
+            pattern, merchant, category, subcategory, parsed, source = rule
+        elif len(rule) == 5:
+            pattern, merchant, category, subcategory, parsed = rule
+            source = 'unknown'
+        else:
+            pattern, merchant, category, subcategory = rule
+            parsed = None
+            source = 'unknown'
+
+        # Most rules have no modifiers; resolve that here rather than per match
+        conditions = parsed if parsed and (parsed.amount_conditions or parsed.date_conditions) else None
+
+        literal = None
+        required = None
+        if _is_expression_pattern(pattern):
+            search = None
+        else:
+            if pattern.isascii() and _REGEX_METACHARS.isdisjoint(pattern):
+                literal = pattern.upper()
+            else:
+                required = _required_literal(pattern)
+            try:
+                search = re.compile(pattern, re.IGNORECASE).search
+            except re.error:
+                # Invalid pattern, skip
+                continue
+
+        prepared.append(_PreparedRule(
+            pattern, merchant, category, subcategory, conditions, source, tags, search, literal, required
+        ))
+
+    _prepared_rules = prepared
+    _prepared_rules_source = list(rules)
+    _pattern_hits_cache = {}
+    return prepared
+
+
+def _required_literal(pattern: str) -> Optional[str]:
+    """Return the uppercased literal prefix every match of ``pattern`` contains.
+
+    Only the leading run of plain characters is used, so this stays correct
+    without parsing the regex: UBER\\s(?!EATS) -> UBER. Returns None when
+    there is no usable prefix (under 3 chars, alternation, non-ASCII).
+    """
+    if '|' in pattern or not pattern.isascii():
+        return None
+    end = 0
+    while end < len(pattern) and pattern[end] not in _REGEX_METACHARS:
+        end += 1
+    prefix = pattern[:end]
+    # A quantifier that allows zero repeats makes the preceding char optional
+    if end < len(pattern) and pattern[end] in '?*{':
+        prefix = prefix[:-1]
+    return prefix.upper() if len(prefix) >= 3 else None
+
+
+def _pattern_hits(prepared: List[_PreparedRule], desc_upper: str) -> frozenset:
+    """Indices of regex/literal rules in ``prepared`` whose pattern matches.
+
+    Only the description-dependent part is cached; amount/date modifiers and
+    expression rules are still evaluated per transaction.
+    """
+    hits = _pattern_hits_cache.get(desc_upper)
+    if hits is None:
+        hits = frozenset(
+            i for i, rule in enumerate(prepared)
+            if rule.search is not None and (
+                (rule.literal in desc_upper) if rule.literal is not None
+                else (rule.required is None or rule.required in desc_upper) and rule.search(desc_upper)
+            )
+        )
+        if len(_pattern_hits_cache) >= _PATTERN_HITS_CACHE_SIZE:
+            _pattern_hits_cache.clear()
+        _pattern_hits_cache[desc_upper] = hits
+    return hits
 
 
 
 def load_merchant_rules(csv_path):
     """Load user merchant categorization rules from CSV file.
 
+    See parse_merchant_rules() for the CSV format. Returns an empty list if
+    the file doesn't exist.
+    """
+    if not os.path.exists(csv_path):
+        return []  # No user rules file
+
+    with open(csv_path, 'r', encoding='utf-8', newline='') as f:
+        return parse_merchant_rules(f)
+
+
+def parse_merchant_rules(f: TextIO):
+    """Parse merchant categorization rules from an open CSV text stream.
+
     CSV format: Pattern,Merchant,Category,Subcategory[,Tags]
 
     Patterns support inline modifiers for amount/date matching:
@@ -55,42 +274,55 @@ def load_merchant_rules(csv_path):
     Lines starting with # are treated as comments and skipped.
     Patterns are Python regular expressions matched against transaction descriptions.
 
-    Returns list of tuples: (pattern, merchant_name, category, subcategory, parsed_pattern, tags)
+    Returns list of CsvRule tuples: (pattern, merchant, category, subcategory, parsed, tags)
     """
-    if not os.path.exists(csv_path):
-        return []  # No user rules file
-
     rules = []
-    with open(csv_path, 'r', encoding='utf-8') as f:
-        # Filter out comment and empty lines before passing to DictReader
-        lines = [line for line in f if line.strip() and not line.strip().startswith('#')]
-        reader = csv.DictReader(lines)
-        for row in reader:
-            # Skip empty patterns
-            pattern_str = row.get('Pattern', '').strip()
-            if not pattern_str:
-                continue
+    # Filter out comment and empty lines as the reader pulls them, rather
+    # than materializing the whole file as a list first
+    lines = (line for line in f if line.strip() and not line.lstrip().startswith('#'))
+    reader = csv.reader(lines)
+    header = next(reader, None)
+    if header is None:
+        return rules
+
+    # Resolve column positions once instead of building a dict per row
+    col = {name: i for i, name in enumerate(header)}
+    pattern_i = col.get('Pattern')
+    tags_i = col.get('Tags')
+    missing = [name for name in ('Merchant', 'Category', 'Subcategory') if name not in col]
+    merchant_i = col.get('Merchant')
+    category_i = col.get('Category')
+    subcategory_i = col.get('Subcategory')
+
+    for row in reader:
+        n = len(row)
+
+        # Skip empty patterns
+        pattern_str = row[pattern_i].strip() if pattern_i is not None and pattern_i < n else ''
+        if not pattern_str:
+            continue
+        if missing:
+            raise KeyError(missing[0])
 
-            # Parse pattern with inline modifiers
-            try:
-                parsed = parse_pattern_with_modifiers(pattern_str)
-            except ModifierParseError:
-                # Invalid modifier syntax - use pattern as-is without modifiers
-                parsed = ParsedPattern(regex_pattern=pattern_str)
-
-            # Parse tags (optional, pipe-separated)
-            tags_str = row.get('Tags') or ''
-            tags_str = tags_str.strip()
-            tags = [t.strip() for t in tags_str.split('|') if t.strip()] if tags_str else []
-
-            rules.append((
-                parsed.regex_pattern,  # Pure regex for matching
-                row['Merchant'],
-                row['Category'],
-                row['Subcategory'],
-                parsed,  # Full parsed pattern with conditions
-                tags  # List of tags
-            ))
+        # Parse pattern with inline modifiers
+        try:
+            parsed = parse_pattern_with_modifiers(pattern_str)
+        except ModifierParseError:
+            # Invalid modifier syntax - use pattern as-is without modifiers
+            parsed = ParsedPattern(regex_pattern=pattern_str)
+
+        # Parse tags (optional, pipe-separated)
+        tags_str = row[tags_i].strip() if tags_i is not None and tags_i < n else ''
+        tags = [t for t in map(str.strip, tags_str.split('|')) if t] if tags_str else []
+
+        rules.append(CsvRule(
+            pattern=parsed.regex_pattern,
+            merchant=row[merchant_i] if merchant_i < n else None,
+            category=row[category_i] if category_i < n else None,
+            subcategory=row[subcategory_i] if subcategory_i < n else None,
+            parsed=parsed,
+            tags=tags,
+        ))
     return rules
 
 
@@ -106,24 +338,22 @@ def _expr_to_regex(match_expr: str) -> str:
         contains("COSTCO") and amount > 200 -> COSTCO (amount ignored in regex)
         normalized("UBEREATS") -> normalized("UBEREATS")  # preserved for expr parser
     """
-    import re as regex_module
-
     # Check if expression uses new functions that need to be preserved
-    if regex_module.search(r'\b(normalized|anyof|startswith|fuzzy)\s*\(', match_expr):
+    if _EXPR_NEW_FUNCTION_RE.search(match_expr):
         # Return full expression - will be handled by expression parser
         return match_expr
 
     # Extract pattern from contains("...") or regex("...")
-    contains_match = regex_module.search(r'contains\s*\(\s*["\']([^"\']+)["\']\s*\)', match_expr)
+    contains_match = _EXPR_CONTAINS_RE.search(match_expr)
     if contains_match:
         return contains_match.group(1)
 
-    regex_match = regex_module.search(r'regex\s*\(\s*["\']([^"\']+)["\']\s*\)', match_expr)
+    regex_match = _EXPR_REGEX_RE.search(match_expr)
     if regex_match:
         return regex_match.group(1)
 
     # If no function found, try to extract a quoted string
-    quoted_match = regex_module.search(r'["\']([^"\']+)["\']', match_expr)
+    quoted_match = _EXPR_QUOTED_RE.search(match_expr)
     if quoted_match:
         return quoted_match.group(1)
 
@@ -153,32 +383,13 @@ def get_all_rules(rules_path=None, match_mode='first_match'):
         # Check if it's the new .rules format
         if rules_path.endswith('.rules'):
             try:
-                from .merchant_engine import load_merchants_file
-                from pathlib import Path
-                engine = load_merchants_file(Path(rules_path), match_mode=match_mode)
+                engine = _load_engine(rules_path, match_mode)
 
                 # Cache the engine for use by normalize_merchant()
                 _cached_engine = engine
                 _cached_engine_path = rules_path
 
-                # Convert MerchantRule objects to the tuple format used by parsing code
-                # Only include categorization rules (skip tag-only rules)
-                for rule in engine.rules:  # Include ALL rules (categorization + tag-only)
-                    # Preserve the full match_expr for expression-based rules
-                    # This allows amount/date conditions like "regex(...) and amount == 1500" to work
-                    pattern = rule.match_expr
-                    regex_pattern = _expr_to_regex(rule.match_expr)
-                    parsed = ParsedPattern(regex_pattern=regex_pattern)
-                    user_rules_with_source.append((
-                        pattern,          # Full expression (for expr matching)
-                        rule.name,        # merchant name
-                        rule.category,    # Empty for tag-only rules
-                        rule.subcategory, # Empty for tag-only rules
-                        parsed,
-                        'user',
-                        list(rule.tags)
-                    ))
-                return user_rules_with_source
+                return _engine_rules(engine)
             except Exception:
                 pass  # Fall through to CSV handling if .rules parsing fails
 
@@ -202,6 +413,44 @@ def get_all_rules(rules_path=None, match_mode='first_match'):
     return user_rules_with_source
 
 
+def get_rules_from_string(content: str, match_mode='first_match'):
+    """Get rules from .rules content, as get_all_rules() does for a file.
+
+    The parsed MerchantEngine is cached for normalize_merchant() just like
+    a loaded .rules file.
+
+    Raises:
+        MerchantParseError: If the content is not valid .rules syntax
+    """
+    global _cached_engine, _cached_engine_path
+    from .merchant_engine import parse_merchants
+    engine = parse_merchants(content, match_mode=match_mode)
+    _cached_engine = engine
+    _cached_engine_path = None
+    return _engine_rules(engine)
+
+
+def _engine_rules(engine: "MerchantEngine") -> list:
+    """Convert a MerchantEngine's rules to the tuple format used by parsing code."""
+    rules = []
+    for rule in engine.rules:  # Include ALL rules (categorization + tag-only)
+        # Preserve the full match_expr for expression-based rules
+        # This allows amount/date conditions like "regex(...) and amount == 1500" to work
+        pattern = rule.match_expr
+        regex_pattern = _expr_to_regex(rule.match_expr)
+        parsed = ParsedPattern(regex_pattern=regex_pattern)
+        rules.append((
+            pattern,          # Full expression (for expr matching)
+            rule.name,        # merchant name
+            rule.category,    # Empty for tag-only rules
+            rule.subcategory, # Empty for tag-only rules
+            parsed,
+            'user',
+            list(rule.tags)
+        ))
+    return rules
+
+
 def get_tag_only_rules(rules_path, match_mode='first_match'):
     """Get tag-only rules from a .rules file.
 
@@ -218,9 +467,7 @@ def get_tag_only_rules(rules_path, match_mode='first_match'):
         return []
 
     try:
-        from .merchant_engine import load_merchants_file
-        from pathlib import Path
-        engine = load_merchants_file(Path(rules_path), match_mode=match_mode)
+        engine = _load_engine(rules_path, match_mode)
         return engine.tag_only_rules
     except Exception:
         return []
@@ -286,9 +533,7 @@ def get_transforms(rules_path, match_mode='first_match'):
         return []
 
     try:
-        from .merchant_engine import load_merchants_file
-        from pathlib import Path
-        engine = load_merchants_file(Path(rules_path), match_mode=match_mode)
+        engine = _load_engine(rules_path, match_mode)
         return engine.transforms
     except Exception:
         return []
@@ -433,7 +678,7 @@ def diagnose_rules(csv_path=None):
                 # Parse tags (optional, pipe-separated)
                 tags_str = row.get('Tags') or ''
                 tags_str = tags_str.strip()
-                tags = [t.strip() for t in tags_str.split('|') if t.strip()] if tags_str else []
+                tags = [t for t in map(str.strip, tags_str.split('|')) if t] if tags_str else []
 
                 if not merchant:
                     result['user_rules_errors'].append(
@@ -469,19 +714,20 @@ def clean_description(description):
     Returns:
         Cleaned description with whitespace normalized.
     """
-    # Normalize whitespace
-    return re.sub(r'\s+', ' ', description).strip()
+    # Normalize whitespace (split() with no argument also drops leading/trailing runs)
+    return ' '.join(description.split())
 
 
+@functools.lru_cache(maxsize=4096)
 def extract_merchant_name(description):
     """Extract a readable merchant name from a cleaned description.
 
-    Used as fallback when no pattern matches.
+    Used as fallback when no pattern matches. Cached, since the same
+    uncategorized description usually repeats across a statement.
     """
-    cleaned = clean_description(description)
-
-    # Remove non-alphabetic characters for grouping, keep first 2-3 words
-    words = re.sub(r'[^A-Za-z\s]', ' ', cleaned).split()[:3]
+    # Remove non-alphabetic characters for grouping, keep first 2-3 words.
+    # split() also normalizes whitespace, so no separate clean_description() pass.
+    words = _NON_ALPHA_RE.sub(' ', description).split()[:3]
 
     if words:
         return ' '.join(words).title()
@@ -523,6 +769,52 @@ def normalize_merchant(
         When using .rules files with let:/field: directives, match_info
         also includes 'extra_fields' from the matched rule.
     """
+    global _merchant_cache_owner
+
+    # Statements repeat the same merchants, so reuse results for identical
+    # inputs. Cross-source queries depend on data outside the key, but an
+    # empty data_sources (no supplemental sources) leaves nothing to query.
+    key = None
+    if not data_sources:
+        owner = _cached_engine if _cached_engine is not None else _prepare_rules(rules)
+        if owner is not _merchant_cache_owner:
+            _merchant_cache.clear()
+            _merchant_cache_owner = owner
+        key = (
+            description, amount, txn_date, data_source, location,
+            tuple(field.items()) if field else None,
+            tuple(transforms) if transforms else None,
+        )
+        cached = _merchant_cache.get(key)
+        if cached is not None:
+            merchant, category, subcategory, match_info = cached
+            # Callers own the returned match_info, nested containers included
+            return (merchant, category, subcategory, copy.deepcopy(match_info))
+
+    result = _normalize_merchant_uncached(
+        description, rules, amount, txn_date, field, data_source,
+        transforms, location, data_sources,
+    )
+    if key is not None:
+        if len(_merchant_cache) >= _MERCHANT_CACHE_SIZE:
+            _merchant_cache.clear()
+        merchant, category, subcategory, match_info = result
+        _merchant_cache[key] = (merchant, category, subcategory, copy.deepcopy(match_info))
+    return result
+
+
+def _normalize_merchant_uncached(
+    description: str,
+    rules: list,
+    amount: Optional[float],
+    txn_date: Optional[date],
+    field: Optional[Dict[str, str]],
+    data_source: Optional[str],
+    transforms: Optional[List[Tuple[str, str]]],
+    location: Optional[str],
+    data_sources: Optional[Dict[str, List[Dict]]],
+) -> Tuple[str, str, str, Optional[dict]]:
+    """Match a transaction against the rules; see normalize_merchant()."""
     from tally import expr_parser
 
     # Build transaction context for transforms
@@ -551,7 +843,8 @@ def normalize_merchant(
             match_info = {
                 'pattern': result.matched_rule.match_expr if result.matched_rule else None,
                 'source': 'user',
-                'tags': list(result.tags),
+                # tag_sources keys are the unique tags in first-match order
+                'tags': list(result.tag_sources),
             }
             if result.tag_sources:
                 match_info['tag_sources'] = result.tag_sources
@@ -565,7 +858,7 @@ def normalize_merchant(
         # No categorization match - fallback to extract merchant name
         merchant_name = extract_merchant_name(description)
         if result.tags or raw_values:
-            match_info = {'pattern': None, 'source': 'auto', 'tags': list(result.tags)}
+            match_info = {'pattern': None, 'source': 'auto', 'tags': list(result.tag_sources)}
             if result.tag_sources:
                 match_info['tag_sources'] = result.tag_sources
             if raw_values:
@@ -589,34 +882,34 @@ def normalize_merchant(
     # Track which rule added each tag: {tag: (rule_name, pattern)}
     tag_sources = {}
 
-    for rule in rules:
-        # Handle various formats: 4-tuple, 5-tuple, 6-tuple, 7-tuple (with tags)
-        tags = []
-        if len(rule) == 7:
-            pattern, merchant, category, subcategory, parsed, source, tags = rule
-        elif len(rule) == 6:
-            pattern, merchant, category, subcategory, parsed, source = rule
-        elif len(rule) == 5:
-            pattern, merchant, category, subcategory, parsed = rule
-            source = 'unknown'
-        else:
-            pattern, merchant, category, subcategory = rule
-            parsed = None
-            source = 'unknown'
+    prepared = _prepare_rules(rules)
+    hits = _pattern_hits(prepared, desc_upper)
+    # Evaluation context shared by all expression rules for this transaction
+    ctx = None
+
+    for i, (pattern, merchant, category, subcategory, conditions, source, tags, search, literal, required) in enumerate(prepared):
+        # Once a category is set, later rules only matter for their tags
+        if result_merchant is not None and not tags:
+            continue
 
         try:
             # Check if rule matches
             matches = False
 
-            if _is_expression_pattern(pattern):
+            if search is None:
                 # Use expression parser for expression-based rules
-                matches = expr_parser.matches_transaction(pattern, transaction, data_sources=data_sources)
+                if ctx is None:
+                    ctx = expr_parser.TransactionContext.from_transaction(
+                        transaction, data_sources=data_sources
+                    )
+                tree = expr_parser.parse_expression(pattern)
+                matches = bool(expr_parser.TransactionEvaluator(ctx).evaluate(tree))
             else:
-                # Legacy regex pattern matching
-                if re.search(pattern, desc_upper, re.IGNORECASE):
+                # Legacy regex pattern matching (pattern results cached per description)
+                if i in hits:
                     # Check modifiers if present
-                    if parsed and (parsed.amount_conditions or parsed.date_conditions):
-                        matches = check_all_conditions(parsed, amount, txn_date)
+                    if conditions is not None:
+                        matches = check_all_conditions(conditions, amount, txn_date)
                     else:
                         matches = True
 
@@ -670,17 +963,14 @@ def normalize_merchant(
 
 def _is_expression_pattern(pattern: str) -> bool:
     """Check if a pattern is an expression (uses function syntax) vs a regex."""
-    import re
     # Expression patterns start with:
     # - Function calls like contains(), normalized(), extract(), etc.
     # - Field access like field.txn_type
     # - Boolean operators like 'and', 'or'
     # - Parenthesized expressions
     # - Variable comparisons like amount > 500, month == 12, source == "Amex"
-    function_pattern = r'^(contains|normalized|anyof|startswith|fuzzy|regex|extract|split|substring|trim|exists)\s*\('
-    variable_pattern = r'^(amount|month|year|day|source|description)\s*[<>=!]'
-    return bool(re.match(function_pattern, pattern)) or \
-           bool(re.match(variable_pattern, pattern)) or \
+    return bool(_EXPR_FUNCTION_RE.match(pattern)) or \
+           bool(_EXPR_VARIABLE_RE.match(pattern)) or \
            pattern.startswith('field.') or \
            ' and ' in pattern or ' or ' in pattern or pattern.startswith('(')
 
@@ -710,6 +1000,7 @@ def _resolve_dynamic_tags(
     from tally import expr_parser
 
     resolved = []
+    ctx = None
     for tag in tags:
         tag = tag.strip()
         if not tag:
@@ -722,7 +1013,8 @@ def _resolve_dynamic_tags(
                 continue
 
             try:
-                ctx = expr_parser.TransactionContext.from_transaction(transaction)
+                if ctx is None:
+                    ctx = expr_parser.TransactionContext.from_transaction(transaction)
                 tree = expr_parser.parse_expression(expr)
                 evaluator = expr_parser.TransactionEvaluator(ctx)
                 value = evaluator.evaluate(tree)
@@ -782,24 +1074,10 @@ def explain_description(
     # Try pattern matching against transformed description
     desc_upper = transformed_desc.upper()
 
-    for rule in rules:
-        # Handle various formats
-        tags = []
-        if len(rule) == 7:
-            pattern, merchant, category, subcategory, parsed, source, tags = rule
-        elif len(rule) == 6:
-            pattern, merchant, category, subcategory, parsed, source = rule
-        elif len(rule) == 5:
-            pattern, merchant, category, subcategory, parsed = rule
-            source = 'unknown'
-        else:
-            pattern, merchant, category, subcategory = rule
-            parsed = None
-            source = 'unknown'
-
+    for pattern, merchant, category, subcategory, conditions, source, tags, search, literal, required in _prepare_rules(rules):
         try:
             # Determine if this is an expression pattern or a regex pattern
-            if _is_expression_pattern(pattern):
+            if search is None:
                 # Use expression parser for expression-based rules
                 # Use the already-transformed transaction
                 matches = expr_parser.matches_transaction(pattern, transaction)
@@ -808,12 +1086,12 @@ def explain_description(
                     continue
             else:
                 # Legacy regex pattern matching
-                if not re.search(pattern, desc_upper, re.IGNORECASE):
+                if not search(desc_upper):
                     continue
 
                 # If pattern has modifiers, check them
-                if parsed and (parsed.amount_conditions or parsed.date_conditions):
-                    if not check_all_conditions(parsed, amount, txn_date):
+                if conditions is not None:
+                    if not check_all_conditions(conditions, amount, txn_date):
                         continue
 
             result['matched_rule'] = {
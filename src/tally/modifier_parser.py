@@ -5,10 +5,11 @@ Parses patterns like: COSTCO[amount>200][date=2025-01-15]
 Extracts the regex pattern and conditions for amount/date matching.
 """
 
+import functools
 import re
 from dataclasses import dataclass, field
 from datetime import date, datetime, timedelta
-from typing import Optional, List
+from typing import Optional, List, Tuple
 
 
 @dataclass
@@ -85,6 +86,25 @@ def parse_pattern_with_modifiers(pattern_str: str) -> ParsedPattern:
     if not pattern_str:
         return ParsedPattern(regex_pattern='', amount_conditions=[], date_conditions=[])
 
+    regex_pattern, amount_conditions, date_conditions = _split_modifiers(pattern_str)
+    # Fresh lists so callers can't mutate the cached parse
+    return ParsedPattern(
+        regex_pattern=regex_pattern,
+        amount_conditions=list(amount_conditions),
+        date_conditions=list(date_conditions)
+    )
+
+
+@functools.lru_cache(maxsize=4096)
+def _split_modifiers(
+    pattern_str: str
+) -> Tuple[str, Tuple[AmountCondition, ...], Tuple[DateCondition, ...]]:
+    """Split modifiers off a pattern, cached since rule files repeat them.
+
+    Returns (regex_pattern, amount_conditions, date_conditions) with the
+    conditions as tuples. Relative dates are resolved at evaluation time,
+    so a cached parse stays valid.
+    """
     amount_conditions = []
     date_conditions = []
 
@@ -127,11 +147,7 @@ def parse_pattern_with_modifiers(pattern_str: str) -> ParsedPattern:
         # Remove this modifier from the remaining pattern
         remaining = remaining[:match.start()]
 
-    return ParsedPattern(
-        regex_pattern=remaining,
-        amount_conditions=amount_conditions,
-        date_conditions=date_conditions
-    )
+    return remaining, tuple(amount_conditions), tuple(date_conditions)
 
 
 def _parse_amount_modifier(value_part: str) -> AmountCondition:
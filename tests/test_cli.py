@@ -2,351 +2,264 @@
 
 import pytest
 import subprocess
-import tempfile
-import os
 from pathlib import Path
+from types import SimpleNamespace
 
+from tally.commands.explain import _parse_month_filter
 
-class TestCLIErrorHandling:
-    """Tests for helpful error messages when CLI is misused."""
 
-    def test_explain_no_config_suggests_init(self):
-        """Running explain without config should suggest tally init."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'explain'],
-                cwd=tmpdir,
-                capture_output=True,
-                text=True
-            )
-            assert result.returncode == 1
-            assert 'tally init' in result.stderr
-
-    def test_explain_invalid_merchant_suggests_similar(self):
-        """Typo in merchant name should suggest similar names."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Set up minimal config
-            config_dir = os.path.join(tmpdir, 'config')
-            data_dir = os.path.join(tmpdir, 'data')
-            os.makedirs(config_dir)
-            os.makedirs(data_dir)
-
-            # Create settings
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("""year: 2025
-data_sources:
-  - name: Test
-    file: data/test.csv
-    format: "{date:%Y-%m-%d},{description},{amount}"
-""")
-
-            # Create merchant rules file
-            with open(os.path.join(config_dir, 'merchant_categories.csv'), 'w') as f:
-                f.write("Pattern,Merchant,Category,Subcategory\n")
-                f.write("NETFLIX,Netflix,Subscriptions,Streaming\n")
-
-            # Create test data with Netflix
-            with open(os.path.join(data_dir, 'test.csv'), 'w') as f:
-                f.write("date,description,amount\n")
-                f.write("2025-01-15,NETFLIX STREAMING,15.99\n")
-
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'explain', 'Netflx', config_dir],
-                capture_output=True,
-                text=True
-            )
-            assert result.returncode == 1
-            assert 'Did you mean' in result.stderr
-            assert 'Netflix' in result.stderr
-
-    def test_up_invalid_only_shows_warning(self):
-        """Invalid --only value should warn and show valid options."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Set up minimal config
-            config_dir = os.path.join(tmpdir, 'config')
-            data_dir = os.path.join(tmpdir, 'data')
-            os.makedirs(config_dir)
-            os.makedirs(data_dir)
-
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("""year: 2025
+_DEFAULT_YAML = """year: 2025
 data_sources:
   - name: Test
     file: data/test.csv
     format: "{date:%Y-%m-%d},{description},{amount}"
-""")
+"""
+
+
+@pytest.fixture
+def sample_config(tmp_path):
+    """Minimal config/ + data/ layout with a single CSV data source."""
+    config_dir = tmp_path / 'config'
+    data_dir = tmp_path / 'data'
+    config_dir.mkdir()
+    data_dir.mkdir()
+    (config_dir / 'settings.yaml').write_text(_DEFAULT_YAML)
+    return SimpleNamespace(
+        config_dir=str(config_dir),
+        data_dir=str(data_dir),
+        write_csv=lambda name, rows: (data_dir / name).write_text(rows),
+    )
+
+
+@pytest.fixture(scope='session')
+def shared_config(tmp_path_factory):
+    """Read-only config with one uncategorized transaction, written once per session.
+
+    Only for tests that never modify the config or data directories.
+    """
+    root = tmp_path_factory.mktemp('shared_cfg')
+    config_dir = root / 'config'
+    data_dir = root / 'data'
+    config_dir.mkdir()
+    data_dir.mkdir()
+    (config_dir / 'settings.yaml').write_text(_DEFAULT_YAML)
+    (data_dir / 'test.csv').write_text('date,description,amount\n2025-01-15,TEST,10.00\n')
+    return str(config_dir)
+
 
-            with open(os.path.join(data_dir, 'test.csv'), 'w') as f:
-                f.write("date,description,amount\n")
-                f.write("2025-01-15,TEST,10.00\n")
+class TestCLIErrorHandling:
+    """Tests for helpful error messages when CLI is misused."""
+
+    def test_explain_no_config_suggests_init(self, tmp_path):
+        """Running explain without config should suggest tally init."""
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'explain'],
+            cwd=tmp_path,
+            capture_output=True
+        )
+        assert result.returncode == 1
+        assert b'tally init' in result.stderr
 
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'up', '--only', 'invalid', '--format', 'summary', config_dir],
-                capture_output=True,
-                text=True
-            )
-            assert 'Warning: Invalid view' in result.stderr
-            # Valid views may or may not be shown depending on whether views.rules exists
+    def test_explain_invalid_merchant_suggests_similar(self, sample_config):
+        """Typo in merchant name should suggest similar names."""
+        # Create merchant rules file
+        rules_file = Path(sample_config.config_dir) / 'merchant_categories.csv'
+        rules_file.write_text(
+            "Pattern,Merchant,Category,Subcategory\n"
+            "NETFLIX,Netflix,Subscriptions,Streaming\n"
+        )
 
-    def test_up_mixed_only_filters_invalid(self):
+        # Create test data with Netflix
+        sample_config.write_csv('test.csv', 'date,description,amount\n2025-01-15,NETFLIX STREAMING,15.99\n')
+
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'explain', 'Netflx', sample_config.config_dir],
+            capture_output=True
+        )
+        assert result.returncode == 1
+        assert b'Did you mean' in result.stderr
+        assert b'Netflix' in result.stderr
+
+    def test_up_invalid_only_shows_warning(self, shared_config):
+        """Invalid --only value should warn and show valid options."""
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'up', '--only', 'invalid', '--format', 'summary', shared_config],
+            capture_output=True
+        )
+        assert b'Warning: Invalid view' in result.stderr
+        # Valid views may or may not be shown depending on whether views.rules exists
+
+    def test_up_mixed_only_filters_invalid(self, shared_config):
         """Mixed valid/invalid --only values should warn about invalid ones."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_dir = os.path.join(tmpdir, 'config')
-            data_dir = os.path.join(tmpdir, 'data')
-            os.makedirs(config_dir)
-            os.makedirs(data_dir)
-
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("""year: 2025
-data_sources:
-  - name: Test
-    file: data/test.csv
-    format: "{date:%Y-%m-%d},{description},{amount}"
-""")
-
-            with open(os.path.join(data_dir, 'test.csv'), 'w') as f:
-                f.write("date,description,amount\n")
-                f.write("2025-01-15,TEST,10.00\n")
-
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'up', '--only', 'monthly,invalid,travel', '--format', 'summary', config_dir],
-                capture_output=True,
-                text=True
-            )
-            assert 'Warning: Invalid view' in result.stderr
-            assert 'invalid' in result.stderr
-            # Should exit since no valid views remain
-            # (monthly and travel are not valid view names anymore)
-
-    def test_explain_invalid_category_shows_available(self):
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'up', '--only', 'monthly,invalid,travel', '--format', 'summary', shared_config],
+            capture_output=True
+        )
+        assert b'Warning: Invalid view' in result.stderr
+        assert b'invalid' in result.stderr
+        # Should exit since no valid views remain
+        # (monthly and travel are not valid view names anymore)
+
+    def test_explain_invalid_category_shows_available(self, sample_config):
         """Invalid --category should show available categories."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_dir = os.path.join(tmpdir, 'config')
-            data_dir = os.path.join(tmpdir, 'data')
-            os.makedirs(config_dir)
-            os.makedirs(data_dir)
-
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("""year: 2025
-data_sources:
-  - name: Test
-    file: data/test.csv
-    format: "{date:%Y-%m-%d},{description},{amount}"
-""")
-
-            # Create merchant rules file
-            with open(os.path.join(config_dir, 'merchant_categories.csv'), 'w') as f:
-                f.write("Pattern,Merchant,Category,Subcategory\n")
-                f.write("NETFLIX,Netflix,Subscriptions,Streaming\n")
-
-            # Create data that will be categorized
-            with open(os.path.join(data_dir, 'test.csv'), 'w') as f:
-                f.write("date,description,amount\n")
-                f.write("2025-01-15,NETFLIX STREAMING,15.99\n")
-
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'explain', '--category', 'NonExistent', config_dir],
-                capture_output=True,
-                text=True
-            )
-            assert "No merchants found matching: category:NonExistent" in result.stdout
-            assert 'Available categories:' in result.stdout
+        # No rules needed: the category listing is printed even when empty
+        sample_config.write_csv('test.csv', 'date,description,amount\n2025-01-15,NETFLIX STREAMING,15.99\n')
+
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'explain', '--category', 'NonExistent', sample_config.config_dir],
+            capture_output=True
+        )
+        assert b"No merchants found matching: category:NonExistent" in result.stdout
+        assert b'Available categories:' in result.stdout
 
     def test_invalid_format_shows_choices(self):
         """Invalid --format should show valid choices."""
         result = subprocess.run(
             ['uv', 'run', 'tally', 'run', '--format', 'invalid'],
-            capture_output=True,
-            text=True
+            capture_output=True
         )
         assert result.returncode == 2
-        assert 'invalid choice' in result.stderr
-        assert 'html' in result.stderr
-        assert 'json' in result.stderr
+        assert b'invalid choice' in result.stderr
+        assert b'html' in result.stderr
+        assert b'json' in result.stderr
 
-    def test_invalid_view_shows_available(self):
+    def test_invalid_view_shows_available(self, shared_config):
         """Invalid --view should show available views."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_dir = os.path.join(tmpdir, 'config')
-            data_dir = os.path.join(tmpdir, 'data')
-            os.makedirs(config_dir)
-            os.makedirs(data_dir)
-
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("""year: 2025
-data_sources:
-  - name: Test
-    file: data/test.csv
-    format: "{date:%Y-%m-%d},{description},{amount}"
-""")
-
-            with open(os.path.join(data_dir, 'test.csv'), 'w') as f:
-                f.write("date,description,amount\n")
-                f.write("2025-01-15,TEST,10.00\n")
-
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'explain', '--view', 'invalid', config_dir],
-                capture_output=True,
-                text=True
-            )
-            # Should fail because 'invalid' is not a valid view
-            assert result.returncode == 1
-            # Message may be in stdout or stderr depending on error type
-            output = result.stdout + result.stderr
-            assert 'No view' in output or 'views' in output.lower()
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'explain', '--view', 'invalid', shared_config],
+            capture_output=True
+        )
+        # Should fail because 'invalid' is not a valid view
+        assert result.returncode == 1
+        # Message may be in stdout or stderr depending on error type
+        output = result.stdout + result.stderr
+        assert b'No view' in output or b'views' in output.lower()
 
 
 class TestMigration:
     """Tests for migration from old tally format to new format."""
 
-    def test_init_detects_existing_config_directory(self):
+    def test_init_detects_existing_config_directory(self, tmp_path):
         """Running tally init in existing config dir should use current dir."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create existing config structure (like old tally would)
-            config_dir = os.path.join(tmpdir, 'config')
-            os.makedirs(config_dir)
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("year: 2025\n")
-
-            # Run tally init (default would create ./tally/)
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'init'],
-                cwd=tmpdir,
-                capture_output=True,
-                text=True
-            )
-            assert result.returncode == 0
-            # Should detect existing config and use current dir
-            assert 'Found existing config/' in result.stdout
-            # Should NOT create nested tally/tally/ directory
-            assert not os.path.exists(os.path.join(tmpdir, 'tally'))
-            # Should create new files in existing config/
-            assert os.path.exists(os.path.join(config_dir, 'merchants.rules'))
-            assert os.path.exists(os.path.join(config_dir, 'views.rules'))
-
-    def test_init_migrates_csv_to_rules(self):
+        # Create existing config structure (like old tally would)
+        config_dir = tmp_path / 'config'
+        config_dir.mkdir()
+        (config_dir / 'settings.yaml').write_text("year: 2025\n")
+
+        # Run tally init (default would create ./tally/)
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'init'],
+            cwd=tmp_path,
+            capture_output=True
+        )
+        assert result.returncode == 0
+        # Should detect existing config and use current dir
+        assert b'Found existing config/' in result.stdout
+        # Should NOT create nested tally/tally/ directory
+        assert not (tmp_path / 'tally').exists()
+        # Should create new files in existing config/
+        assert (config_dir / 'merchants.rules').exists()
+        assert (config_dir / 'views.rules').exists()
+
+    def test_init_migrates_csv_to_rules(self, tmp_path):
         """Running tally init should migrate merchant_categories.csv to merchants.rules."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_dir = os.path.join(tmpdir, 'config')
-            os.makedirs(config_dir)
-
-            # Create old-style settings.yaml
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("year: 2025\n")
-
-            # Create old-style merchant_categories.csv with rules
-            with open(os.path.join(config_dir, 'merchant_categories.csv'), 'w') as f:
-                f.write("Pattern,Merchant,Category,Subcategory\n")
-                f.write("NETFLIX,Netflix,Subscriptions,Streaming\n")
-                f.write("AMAZON,Amazon,Shopping,Online\n")
-
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'init'],
-                cwd=tmpdir,
-                capture_output=True,
-                text=True
-            )
-            assert result.returncode == 0
-            # Should mention migration
-            assert 'legacy' in result.stdout.lower() or 'converting' in result.stdout.lower()
-            # Should create merchants.rules
-            assert os.path.exists(os.path.join(config_dir, 'merchants.rules'))
-            # Should backup old CSV
-            assert os.path.exists(os.path.join(config_dir, 'merchant_categories.csv.bak'))
-            # Old CSV should be gone
-            assert not os.path.exists(os.path.join(config_dir, 'merchant_categories.csv'))
-
-            # Verify merchants.rules has the converted rules
-            with open(os.path.join(config_dir, 'merchants.rules'), 'r') as f:
-                content = f.read()
-            assert 'Netflix' in content
-            assert 'Amazon' in content
-
-    def test_init_updates_settings_yaml(self):
+        config_dir = tmp_path / 'config'
+        config_dir.mkdir()
+
+        # Create old-style settings.yaml
+        (config_dir / 'settings.yaml').write_text("year: 2025\n")
+
+        # Create old-style merchant_categories.csv with rules
+        (config_dir / 'merchant_categories.csv').write_text(
+            "Pattern,Merchant,Category,Subcategory\n"
+            "NETFLIX,Netflix,Subscriptions,Streaming\n"
+            "AMAZON,Amazon,Shopping,Online\n"
+        )
+
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'init'],
+            cwd=tmp_path,
+            capture_output=True
+        )
+        assert result.returncode == 0
+        # Should mention migration
+        assert b'legacy' in result.stdout.lower() or b'converting' in result.stdout.lower()
+        # Should create merchants.rules
+        assert (config_dir / 'merchants.rules').exists()
+        # Should backup old CSV
+        assert (config_dir / 'merchant_categories.csv.bak').exists()
+        # Old CSV should be gone
+        assert not (config_dir / 'merchant_categories.csv').exists()
+
+        # Verify merchants.rules has the converted rules
+        content = (config_dir / 'merchants.rules').read_text()
+        assert 'Netflix' in content
+        assert 'Amazon' in content
+
+    def test_init_updates_settings_yaml(self, tmp_path):
         """Running tally init should add merchants_file and views_file to settings.yaml."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_dir = os.path.join(tmpdir, 'config')
-            os.makedirs(config_dir)
-
-            # Create minimal old-style settings.yaml
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("year: 2025\ntitle: Test\n")
-
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'init'],
-                cwd=tmpdir,
-                capture_output=True,
-                text=True
-            )
-            assert result.returncode == 0
-
-            # Check settings.yaml was updated
-            with open(os.path.join(config_dir, 'settings.yaml'), 'r') as f:
-                content = f.read()
-            assert 'views_file:' in content
-            assert 'config/views.rules' in content
-
-    def test_init_skips_migration_for_empty_csv(self):
+        config_dir = tmp_path / 'config'
+        config_dir.mkdir()
+
+        # Create minimal old-style settings.yaml
+        (config_dir / 'settings.yaml').write_text("year: 2025\ntitle: Test\n")
+
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'init'],
+            cwd=tmp_path,
+            capture_output=True
+        )
+        assert result.returncode == 0
+
+        # Check settings.yaml was updated
+        content = (config_dir / 'settings.yaml').read_text()
+        assert 'views_file:' in content
+        assert 'config/views.rules' in content
+
+    def test_init_skips_migration_for_empty_csv(self, tmp_path):
         """CSV with only headers/comments should not trigger migration."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_dir = os.path.join(tmpdir, 'config')
-            os.makedirs(config_dir)
-
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("year: 2025\n")
-
-            # Create CSV with only header, no rules
-            with open(os.path.join(config_dir, 'merchant_categories.csv'), 'w') as f:
-                f.write("# Comments\n")
-                f.write("Pattern,Merchant,Category,Subcategory\n")
-                f.write("# More comments\n")
-
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'init'],
-                cwd=tmpdir,
-                capture_output=True,
-                text=True
-            )
-            assert result.returncode == 0
-            # Should NOT mention migration (no rules to migrate)
-            assert 'converting' not in result.stdout.lower()
-            # CSV should still exist (not renamed to .bak)
-            assert os.path.exists(os.path.join(config_dir, 'merchant_categories.csv'))
-
-    def test_run_migrate_flag_converts_csv(self):
+        config_dir = tmp_path / 'config'
+        config_dir.mkdir()
+
+        (config_dir / 'settings.yaml').write_text("year: 2025\n")
+
+        # Create CSV with only header, no rules
+        (config_dir / 'merchant_categories.csv').write_text(
+            "# Comments\n"
+            "Pattern,Merchant,Category,Subcategory\n"
+            "# More comments\n"
+        )
+
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'init'],
+            cwd=tmp_path,
+            capture_output=True
+        )
+        assert result.returncode == 0
+        # Should NOT mention migration (no rules to migrate)
+        assert b'converting' not in result.stdout.lower()
+        # CSV should still exist (not renamed to .bak)
+        assert (config_dir / 'merchant_categories.csv').exists()
+
+    def test_run_migrate_flag_converts_csv(self, sample_config):
         """Running tally run --migrate should convert CSV to rules format."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            config_dir = os.path.join(tmpdir, 'config')
-            data_dir = os.path.join(tmpdir, 'data')
-            os.makedirs(config_dir)
-            os.makedirs(data_dir)
-
-            # Create settings with data source
-            with open(os.path.join(config_dir, 'settings.yaml'), 'w') as f:
-                f.write("""year: 2025
-data_sources:
-  - name: Test
-    file: data/test.csv
-    format: "{date:%Y-%m-%d},{description},{amount}"
-""")
+        config_dir = Path(sample_config.config_dir)
 
-            # Create old-style CSV rules
-            with open(os.path.join(config_dir, 'merchant_categories.csv'), 'w') as f:
-                f.write("Pattern,Merchant,Category,Subcategory\n")
-                f.write("TEST,Test Merchant,Shopping,General\n")
+        # Create old-style CSV rules
+        (config_dir / 'merchant_categories.csv').write_text(
+            "Pattern,Merchant,Category,Subcategory\n"
+            "TEST,Test Merchant,Shopping,General\n"
+        )
 
-            # Create test data
-            with open(os.path.join(data_dir, 'test.csv'), 'w') as f:
-                f.write("date,description,amount\n")
-                f.write("2025-01-15,TEST PURCHASE,-10.00\n")
+        # Create test data
+        sample_config.write_csv('test.csv', 'date,description,amount\n2025-01-15,TEST PURCHASE,-10.00\n')
 
-            result = subprocess.run(
-                ['uv', 'run', 'tally', 'run', '--migrate', '--format', 'summary', config_dir],
-                capture_output=True,
-                text=True
-            )
-            # Should succeed and create merchants.rules
-            assert os.path.exists(os.path.join(config_dir, 'merchants.rules'))
+        result = subprocess.run(
+            ['uv', 'run', 'tally', 'run', '--migrate', '--format', 'summary', sample_config.config_dir],
+            capture_output=True
+        )
+        # Should succeed and create merchants.rules
+        assert (config_dir / 'merchants.rules').exists()
 
 
 class TestMonthFilter:
@@ -354,7 +267,6 @@ class TestMonthFilter:
 
     def test_yyyy_mm_format_passes_through(self):
         """YYYY-MM format should be returned as-is."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2025-01', '2025-02', '2025-03'}
         assert _parse_month_filter('2025-02', available) == '2025-02'
         # Even if not in available, YYYY-MM passes through
@@ -362,7 +274,6 @@ class TestMonthFilter:
 
     def test_month_name_single_match(self):
         """Month name with single year match should find it."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2025-01', '2025-02', '2025-03'}
         assert _parse_month_filter('Jan', available) == '2025-01'
         assert _parse_month_filter('feb', available) == '2025-02'
@@ -370,21 +281,18 @@ class TestMonthFilter:
 
     def test_month_name_multiple_years_picks_most_recent(self):
         """Month name appearing in multiple years should pick most recent."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2024-03', '2025-03', '2023-03'}
         assert _parse_month_filter('Mar', available) == '2025-03'
         assert _parse_month_filter('march', available) == '2025-03'
 
     def test_month_name_no_match_returns_none(self):
         """Month name not in data should return None."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2025-01', '2025-02', '2025-03'}
         assert _parse_month_filter('Dec', available) is None
         assert _parse_month_filter('december', available) is None
 
     def test_month_number_single_digit(self):
         """Single digit month numbers should work."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2025-01', '2025-02', '2025-03'}
         assert _parse_month_filter('1', available) == '2025-01'
         assert _parse_month_filter('2', available) == '2025-02'
@@ -392,7 +300,6 @@ class TestMonthFilter:
 
     def test_month_number_double_digit(self):
         """Double digit month numbers should work."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2025-10', '2025-11', '2025-12'}
         assert _parse_month_filter('10', available) == '2025-10'
         assert _parse_month_filter('11', available) == '2025-11'
@@ -400,7 +307,6 @@ class TestMonthFilter:
 
     def test_month_number_invalid(self):
         """Invalid month numbers should return None."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2025-01', '2025-02', '2025-03'}
         assert _parse_month_filter('0', available) is None
         assert _parse_month_filter('13', available) is None
@@ -408,13 +314,11 @@ class TestMonthFilter:
 
     def test_month_number_multiple_years(self):
         """Month number appearing in multiple years should pick most recent."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2024-01', '2025-01'}
         assert _parse_month_filter('1', available) == '2025-01'
 
     def test_empty_available_months(self):
         """Empty available months should return None for names/numbers."""
-        from tally.commands.explain import _parse_month_filter
         available = set()
         assert _parse_month_filter('Jan', available) is None
         assert _parse_month_filter('1', available) is None
@@ -423,7 +327,6 @@ class TestMonthFilter:
 
     def test_invalid_input(self):
         """Random strings should return None."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2025-01', '2025-02', '2025-03'}
         assert _parse_month_filter('foo', available) is None
         assert _parse_month_filter('', available) is None
@@ -432,7 +335,6 @@ class TestMonthFilter:
 
     def test_case_insensitivity(self):
         """Month names should be case-insensitive."""
-        from tally.commands.explain import _parse_month_filter
         available = {'2025-01'}
         assert _parse_month_filter('jan', available) == '2025-01'
         assert _parse_month_filter('JAN', available) == '2025-01'
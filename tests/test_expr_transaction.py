@@ -66,6 +66,24 @@ class TestTransactionContext:
         assert ctx.year == 0
         assert ctx.day == 0
 
+    def test_description_upper_shared_by_functions(self):
+        """contains/startswith/anyof read the same uppercased description."""
+        ctx = TransactionContext(description="Netflix.com")
+        assert ctx.description_upper == "NETFLIX.COM"
+        evaluator = TransactionEvaluator(ctx)
+        assert evaluator.evaluate(parse_expression('contains("netflix")'))
+        assert evaluator.evaluate(parse_expression('startswith("NETF")'))
+        assert evaluator.evaluate(parse_expression('anyof("HULU", ".COM")'))
+        assert ctx.description == "Netflix.com"
+
+    def test_from_transaction_reuses_description_upper(self):
+        """An uppercased description passed in is used instead of recomputed."""
+        txn = {'description': 'Netflix.com', 'amount': 15.99}
+        upper = 'NETFLIX.COM'
+        ctx = TransactionContext.from_transaction(txn, description_upper=upper)
+        assert ctx.description_upper is upper
+        assert TransactionEvaluator(ctx).evaluate(parse_expression('contains("netflix")'))
+
 
 class TestContainsFunction:
     """Tests for the contains() function."""
@@ -125,6 +143,17 @@ class TestRegexFunction:
         with pytest.raises(ExpressionError, match="Invalid regex pattern"):
             matches_transaction('regex("[invalid")', txn)
 
+    def test_regex_compiled_once_per_pattern(self):
+        """regex() and extract() reuse the compiled pattern across calls."""
+        from tally.expr_parser import _regex_cache
+        for desc in ('STORE-101', 'STORE-202'):
+            txn = {'description': desc, 'amount': 10.00}
+            assert matches_transaction('regex("STORE-([0-9]+)")', txn)
+        compiled = _regex_cache['STORE-([0-9]+)']
+        txn = {'description': 'STORE-303', 'amount': 10.00}
+        assert evaluate_transaction('extract("STORE-([0-9]+)")', txn) == '303'
+        assert _regex_cache['STORE-([0-9]+)'] is compiled
+
 
 class TestAmountConditions:
     """Tests for amount-based conditions."""
@@ -225,6 +254,15 @@ class TestCombinedExpressions:
         assert not matches_transaction(expr, regular)
         assert not matches_transaction(expr, small_holiday)
 
+    def test_and_or_short_circuit(self):
+        """Later operands are not evaluated once the result is decided."""
+        txn = {'description': 'NETFLIX.COM', 'amount': 15.99}
+        # The invalid regex would raise if it were evaluated
+        assert not matches_transaction('contains("HULU") and regex("[invalid")', txn)
+        assert matches_transaction('contains("NETFLIX") or regex("[invalid")', txn)
+        # Guard idiom: field.memo is only read when it exists
+        assert not matches_transaction('exists(field.memo) and field.memo == "X"', txn)
+
     def test_or_conditions(self):
         """OR conditions."""
         netflix = {'description': 'NETFLIX', 'amount': 15.99}
@@ -280,6 +318,13 @@ class TestInOperator:
 class TestNormalizedFunction:
     """Tests for the normalized() function."""
 
+    def test_normalized_description_computed_once(self):
+        """Several normalized() calls share the context's normalized description."""
+        ctx = TransactionContext(description="Whole Foods Mkt #10")
+        evaluator = TransactionEvaluator(ctx)
+        assert evaluator.evaluate(parse_expression('normalized("WHOLEFOODS") and normalized("mkt#10")'))
+        assert ctx.description_normalized == "WHOLEFOODSMKT#10"
+
     def test_normalized_ignores_spaces(self):
         """normalized() matches ignoring spaces."""
         txn = {'description': 'UBER EATS ORDER', 'amount': 25.00}
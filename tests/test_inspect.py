@@ -1,8 +1,6 @@
 """Tests for inspect command - CSV sniffing and column analysis."""
 
 import pytest
-import tempfile
-import os
 
 from tally.commands.inspect import (
     _detect_column_type,
@@ -97,37 +95,33 @@ class TestDetectColumnType:
 class TestAnalyzeColumns:
     """Tests for _analyze_columns function."""
 
-    def test_basic_csv(self):
+    def test_basic_csv(self, tmp_path):
         """Analyze a basic CSV with date, description, amount."""
         csv_content = """Date,Description,Amount
 01/15/2025,GROCERY STORE,123.45
 01/16/2025,COFFEE SHOP,-5.99
 01/17/2025,GAS STATION,45.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            cols = _analyze_columns(tmpfile, has_header=True)
-            assert len(cols) == 3
-
-            # Date column
-            assert cols[0]['header'] == 'Date'
-            assert cols[0]['type'] == 'date'
-            assert cols[0]['format'] == '%m/%d/%Y'
-
-            # Description column
-            assert cols[1]['header'] == 'Description'
-            assert cols[1]['type'] in ('text', 'categorical')
-
-            # Amount column
-            assert cols[2]['header'] == 'Amount'
-            assert cols[2]['type'] == 'currency'
-        finally:
-            os.unlink(tmpfile)
-
-    def test_brokerage_csv(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        cols = _analyze_columns(tmpfile, has_header=True)
+        assert len(cols) == 3
+
+        # Date column
+        assert cols[0]['header'] == 'Date'
+        assert cols[0]['type'] == 'date'
+        assert cols[0]['format'] == '%m/%d/%Y'
+
+        # Description column
+        assert cols[1]['header'] == 'Description'
+        assert cols[1]['type'] in ('text', 'categorical')
+
+        # Amount column
+        assert cols[2]['header'] == 'Amount'
+        assert cols[2]['type'] == 'currency'
+
+    def test_brokerage_csv(self, tmp_path):
         """Analyze a brokerage-style CSV with Symbol, Quantity columns."""
         # Need enough rows for categorical detection (min 5 values)
         csv_content = """Run Date,Action,Symbol,Description,Type,Quantity,Amount ($),Cash Balance ($)
@@ -138,54 +132,46 @@ class TestAnalyzeColumns:
 06/20/2025,YOU BOUGHT,FFFFX,FIDELITY FREEDOM,Cash,50.000,-1000.00,-1000.00
 06/25/2025,DIVIDEND,FFFFX,FIDELITY FREEDOM,Cash,0.000,5.00,5.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            cols = _analyze_columns(tmpfile, has_header=True)
-            assert len(cols) == 8
-
-            # Check Symbol column is detected
-            symbol_col = next(c for c in cols if c['header'] == 'Symbol')
-            # Could be ticker/symbol or categorical depending on values
-            assert symbol_col['type'] in ('ticker/symbol', 'text', 'categorical')
-
-            # Check Amount column
-            amount_col = next(c for c in cols if 'Amount' in c['header'])
-            assert amount_col['type'] == 'currency'
-
-            # Check Action column is categorical with enough rows
-            action_col = next(c for c in cols if c['header'] == 'Action')
-            assert action_col['type'] == 'categorical'
-            assert action_col['distinct_values'] is not None
-        finally:
-            os.unlink(tmpfile)
-
-    def test_empty_columns_detected(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        cols = _analyze_columns(tmpfile, has_header=True)
+        assert len(cols) == 8
+
+        # Check Symbol column is detected
+        symbol_col = next(c for c in cols if c['header'] == 'Symbol')
+        # Could be ticker/symbol or categorical depending on values
+        assert symbol_col['type'] in ('ticker/symbol', 'text', 'categorical')
+
+        # Check Amount column
+        amount_col = next(c for c in cols if 'Amount' in c['header'])
+        assert amount_col['type'] == 'currency'
+
+        # Check Action column is categorical with enough rows
+        action_col = next(c for c in cols if c['header'] == 'Action')
+        assert action_col['type'] == 'categorical'
+        assert action_col['distinct_values'] is not None
+
+    def test_empty_columns_detected(self, tmp_path):
         """Detect columns that are mostly empty."""
         csv_content = """Date,Description,Notes,Amount
 01/15/2025,GROCERY,,123.45
 01/16/2025,COFFEE,,5.99
 01/17/2025,GAS,,45.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
 
-        try:
-            cols = _analyze_columns(tmpfile, has_header=True)
-            notes_col = next(c for c in cols if c['header'] == 'Notes')
-            assert notes_col['type'] == 'empty'
-            assert notes_col['empty_pct'] == 100
-        finally:
-            os.unlink(tmpfile)
+        cols = _analyze_columns(tmpfile, has_header=True)
+        notes_col = next(c for c in cols if c['header'] == 'Notes')
+        assert notes_col['type'] == 'empty'
+        assert notes_col['empty_pct'] == 100
 
 
 class TestAnalyzeAmountColumnDetailed:
     """Tests for _analyze_amount_column_detailed function."""
 
-    def test_mixed_positive_negative(self):
+    def test_mixed_positive_negative(self, tmp_path):
         """Analyze amount column with both positive and negative values."""
         csv_content = """Date,Description,Amount
 01/15/2025,ROTH CONVERSION,7000
@@ -193,117 +179,97 @@ class TestAnalyzeAmountColumnDetailed:
 01/17/2025,YOU BOUGHT FUND,-7002.04
 01/18/2025,ACCOUNT FEE,-25.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2, desc_col=1)
-
-            assert result is not None
-            assert result['positive_count'] == 2
-            assert result['negative_count'] == 2
-            assert result['positive_total'] == pytest.approx(7002.04)
-            assert result['negative_total'] == pytest.approx(7027.04)
-
-            # Check samples
-            assert len(result['sample_positive']) == 2
-            assert len(result['sample_negative']) == 2
-
-            # Verify positive samples contain expected transactions
-            positive_descs = [d for d, _ in result['sample_positive']]
-            assert 'ROTH CONVERSION' in positive_descs
-            assert 'DIVIDEND RECEIVED' in positive_descs
-
-            # Verify negative samples
-            negative_descs = [d for d, _ in result['sample_negative']]
-            assert 'YOU BOUGHT FUND' in negative_descs
-        finally:
-            os.unlink(tmpfile)
-
-    def test_format_observations_mixed_decimals(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2, desc_col=1)
+
+        assert result is not None
+        assert result['positive_count'] == 2
+        assert result['negative_count'] == 2
+        assert result['positive_total'] == pytest.approx(7002.04)
+        assert result['negative_total'] == pytest.approx(7027.04)
+
+        # Check samples
+        assert len(result['sample_positive']) == 2
+        assert len(result['sample_negative']) == 2
+
+        # Verify positive samples contain expected transactions
+        positive_descs = [d for d, _ in result['sample_positive']]
+        assert 'ROTH CONVERSION' in positive_descs
+        assert 'DIVIDEND RECEIVED' in positive_descs
+
+        # Verify negative samples
+        negative_descs = [d for d, _ in result['sample_negative']]
+        assert 'YOU BOUGHT FUND' in negative_descs
+
+    def test_format_observations_mixed_decimals(self, tmp_path):
         """Detect mixed decimal formatting (integers and decimals)."""
         csv_content = """Date,Description,Amount
 01/15/2025,ROTH CONVERSION,7000
 01/16/2025,DIVIDEND,2.04
 01/17/2025,PURCHASE,-7002.04
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
 
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
 
-            assert result is not None
-            # Should detect that some values have decimals and some don't
-            assert any('Mixed' in obs or 'integer' in obs.lower()
-                       for obs in result['format_observations'])
-        finally:
-            os.unlink(tmpfile)
+        assert result is not None
+        # Should detect that some values have decimals and some don't
+        assert any('Mixed' in obs or 'integer' in obs.lower()
+                   for obs in result['format_observations'])
 
-    def test_all_positive(self):
+    def test_all_positive(self, tmp_path):
         """Analyze amount column with only positive values."""
         csv_content = """Date,Description,Amount
 01/15/2025,EXPENSE 1,100.00
 01/16/2025,EXPENSE 2,200.00
 01/17/2025,EXPENSE 3,300.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
-
-            assert result is not None
-            assert result['positive_count'] == 3
-            assert result['negative_count'] == 0
-            assert len(result['sample_positive']) == 3
-            assert len(result['sample_negative']) == 0
-        finally:
-            os.unlink(tmpfile)
-
-    def test_parentheses_negative(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
+
+        assert result is not None
+        assert result['positive_count'] == 3
+        assert result['negative_count'] == 0
+        assert len(result['sample_positive']) == 3
+        assert len(result['sample_negative']) == 0
+
+    def test_parentheses_negative(self, tmp_path):
         """Detect parentheses notation for negative amounts."""
         csv_content = """Date,Description,Amount
 01/15/2025,EXPENSE,(100.00)
 01/16/2025,REFUND,50.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
-
-            assert result is not None
-            assert result['negative_count'] == 1
-            assert result['positive_count'] == 1
-            # Should note parentheses notation
-            assert any('parentheses' in obs.lower()
-                       for obs in result['format_observations'])
-        finally:
-            os.unlink(tmpfile)
-
-    def test_currency_symbols_detected(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
+
+        assert result is not None
+        assert result['negative_count'] == 1
+        assert result['positive_count'] == 1
+        # Should note parentheses notation
+        assert any('parentheses' in obs.lower()
+                   for obs in result['format_observations'])
+
+    def test_currency_symbols_detected(self, tmp_path):
         """Detect currency symbols in values."""
         csv_content = """Date,Description,Amount
 01/15/2025,EXPENSE,$100.00
 01/16/2025,REFUND,$50.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
 
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
 
-            assert result is not None
-            assert any('currency symbol' in obs.lower()
-                       for obs in result['format_observations'])
-        finally:
-            os.unlink(tmpfile)
+        assert result is not None
+        assert any('currency symbol' in obs.lower()
+                   for obs in result['format_observations'])
 
 
 class TestDetectColumnTypeAdditional:
@@ -357,27 +323,23 @@ class TestDetectColumnTypeAdditional:
 class TestAnalyzeColumnsAdditional:
     """Additional edge case tests for _analyze_columns."""
 
-    def test_csv_without_headers(self):
+    def test_csv_without_headers(self, tmp_path):
         """Analyze CSV that has no header row."""
         csv_content = """01/15/2025,GROCERY STORE,123.45
 01/16/2025,COFFEE SHOP,5.99
 01/17/2025,GAS STATION,45.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            cols = _analyze_columns(tmpfile, has_header=False)
-            # With has_header=False, first row is treated as data
-            # Headers will be auto-generated
-            assert len(cols) == 3
-            # First column should be detected as date
-            assert cols[0]['type'] == 'date'
-        finally:
-            os.unlink(tmpfile)
-
-    def test_partially_empty_column(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        cols = _analyze_columns(tmpfile, has_header=False)
+        # With has_header=False, first row is treated as data
+        # Headers will be auto-generated
+        assert len(cols) == 3
+        # First column should be detected as date
+        assert cols[0]['type'] == 'date'
+
+    def test_partially_empty_column(self, tmp_path):
         """Detect columns that are partially empty."""
         csv_content = """Date,Description,Notes,Amount
 01/15/2025,GROCERY,bought milk,123.45
@@ -385,126 +347,102 @@ class TestAnalyzeColumnsAdditional:
 01/17/2025,GAS,filled tank,45.00
 01/18/2025,LUNCH,,12.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            cols = _analyze_columns(tmpfile, has_header=True)
-            notes_col = next(c for c in cols if c['header'] == 'Notes')
-            # 50% empty - should not be classified as 'empty' type
-            assert notes_col['type'] != 'empty'
-            assert notes_col['empty_pct'] == 50.0
-        finally:
-            os.unlink(tmpfile)
-
-    def test_quoted_values_with_commas(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        cols = _analyze_columns(tmpfile, has_header=True)
+        notes_col = next(c for c in cols if c['header'] == 'Notes')
+        # 50% empty - should not be classified as 'empty' type
+        assert notes_col['type'] != 'empty'
+        assert notes_col['empty_pct'] == 50.0
+
+    def test_quoted_values_with_commas(self, tmp_path):
         """Handle quoted values containing commas."""
         csv_content = """Date,Description,Amount
 01/15/2025,"SMITH, JOHN - PAYMENT",123.45
 01/16/2025,"ACME, INC.",5.99
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
 
-        try:
-            cols = _analyze_columns(tmpfile, has_header=True)
-            assert len(cols) == 3
-            # Description should contain the full quoted value
-            assert cols[1]['header'] == 'Description'
-            assert 'SMITH, JOHN' in cols[1]['sample_values'][0]
-        finally:
-            os.unlink(tmpfile)
+        cols = _analyze_columns(tmpfile, has_header=True)
+        assert len(cols) == 3
+        # Description should contain the full quoted value
+        assert cols[1]['header'] == 'Description'
+        assert 'SMITH, JOHN' in cols[1]['sample_values'][0]
 
 
 class TestAnalyzeAmountColumnDetailedAdditional:
     """Additional edge case tests for _analyze_amount_column_detailed."""
 
-    def test_all_negative(self):
+    def test_all_negative(self, tmp_path):
         """Analyze amount column with only negative values (bank style)."""
         csv_content = """Date,Description,Amount
 01/15/2025,CHECKCARD PURCHASE,-32.43
 01/16/2025,ATM WITHDRAWAL,-100.00
 01/17/2025,BILL PAY,-250.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
-
-            assert result is not None
-            assert result['positive_count'] == 0
-            assert result['negative_count'] == 3
-            assert len(result['sample_positive']) == 0
-            assert len(result['sample_negative']) == 3
-        finally:
-            os.unlink(tmpfile)
-
-    def test_zero_amounts_skipped(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
+
+        assert result is not None
+        assert result['positive_count'] == 0
+        assert result['negative_count'] == 3
+        assert len(result['sample_positive']) == 0
+        assert len(result['sample_negative']) == 3
+
+    def test_zero_amounts_skipped(self, tmp_path):
         """Zero amounts should be skipped in analysis."""
         csv_content = """Date,Description,Amount
 01/15/2025,REAL TRANSACTION,100.00
 01/16/2025,ZERO BALANCE,0.00
 01/17/2025,ANOTHER REAL,-50.00
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
 
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
 
-            assert result is not None
-            # Zero should not be counted
-            assert result['positive_count'] == 1
-            assert result['negative_count'] == 1
-        finally:
-            os.unlink(tmpfile)
+        assert result is not None
+        # Zero should not be counted
+        assert result['positive_count'] == 1
+        assert result['negative_count'] == 1
 
-    def test_thousands_separators(self):
+    def test_thousands_separators(self, tmp_path):
         """Handle amounts with thousands separators."""
         csv_content = """Date,Description,Amount
 01/15/2025,BIG PURCHASE,"1,234.56"
 01/16/2025,HUGE PURCHASE,"12,345.67"
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
 
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
 
-            assert result is not None
-            assert result['positive_count'] == 2
-            assert result['positive_total'] == pytest.approx(13580.23)
-        finally:
-            os.unlink(tmpfile)
+        assert result is not None
+        assert result['positive_count'] == 2
+        assert result['positive_total'] == pytest.approx(13580.23)
 
-    def test_empty_amount_column(self):
+    def test_empty_amount_column(self, tmp_path):
         """Handle case where amount column is empty."""
         csv_content = """Date,Description,Amount
 01/15/2025,NO AMOUNT,
 01/16/2025,ALSO EMPTY,
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
 
-        try:
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
-            # Should return None when no valid amounts found
-            assert result is None
-        finally:
-            os.unlink(tmpfile)
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=2)
+        # Should return None when no valid amounts found
+        assert result is None
 
 
 class TestDetectFileFormat:
     """Tests for _detect_file_format function."""
 
-    def test_csv_detection(self):
+    def test_csv_detection(self, tmp_path):
         """Detect standard CSV format."""
         from tally.commands.inspect import _detect_file_format
 
@@ -512,18 +450,14 @@ class TestDetectFileFormat:
 01/15/2025,GROCERY STORE,123.45
 01/16/2025,COFFEE SHOP,5.99
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            result = _detect_file_format(tmpfile)
-            assert result['format_type'] == 'csv'
-            assert result['has_header'] == True
-        finally:
-            os.unlink(tmpfile)
-
-    def test_fixed_width_detection(self):
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
+
+        result = _detect_file_format(tmpfile)
+        assert result['format_type'] == 'csv'
+        assert result['has_header'] == True
+
+    def test_fixed_width_detection(self, tmp_path):
         """Detect fixed-width format (like BOA statements)."""
         from tally.commands.inspect import _detect_file_format
 
@@ -534,22 +468,18 @@ Beginning balance as of 01/01/2025
 01/03/2025  First Tech Federal Credit Union Transfer                            -3,235.00     31,966.16
 01/04/2025  CHECKCARD 0103 AMAZON PRIME                                           -14.99     31,951.17
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write(fixed_content)
-            tmpfile = f.name
+        tmpfile = tmp_path / 'sample.txt'
+        tmpfile.write_text(fixed_content)
 
-        try:
-            result = _detect_file_format(tmpfile)
-            assert result['format_type'] == 'fixed_width'
-            assert len(result['issues']) > 0
-        finally:
-            os.unlink(tmpfile)
+        result = _detect_file_format(tmpfile)
+        assert result['format_type'] == 'fixed_width'
+        assert len(result['issues']) > 0
 
 
 class TestRothIraScenario:
     """Test the specific Roth IRA scenario from chatlog3."""
 
-    def test_roth_ira_csv_analysis(self):
+    def test_roth_ira_csv_analysis(self, tmp_path):
         """
         Test analyzing a Fidelity Roth IRA CSV similar to chatlog3.
 
@@ -563,46 +493,41 @@ class TestRothIraScenario:
 06/06/2025,"YOU BOUGHT PROSPECTUS UNDER SEPARATE COVER FIDELITY FREEDOM 2040 (FFFFX) (Cash)",FFFFX,,Cash,20.01,350.000,,,,-7002.04,0.00,06/10/2025
 06/10/2025,"DIVIDEND RECEIVED FIDELITY FREEDOM 2040 (FFFFX) (Cash)",FFFFX,,Cash,,,,,0,2.04,2.04,
 """
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False) as f:
-            f.write(csv_content)
-            tmpfile = f.name
-
-        try:
-            # Test column analysis
-            cols = _analyze_columns(tmpfile, has_header=True)
+        tmpfile = tmp_path / 'sample.csv'
+        tmpfile.write_text(csv_content)
 
-            # Verify we have the expected number of columns
-            assert len(cols) == 13
+        # Test column analysis
+        cols = _analyze_columns(tmpfile, has_header=True)
 
-            # Check Amount column
-            amount_col = next(c for c in cols if 'Amount' in c['header'])
-            assert amount_col['type'] == 'currency'
+        # Verify we have the expected number of columns
+        assert len(cols) == 13
 
-            # Check Action column shows categorical values
-            action_col = next(c for c in cols if c['header'] == 'Action')
-            assert action_col['distinct_values'] is not None
+        # Check Amount column
+        amount_col = next(c for c in cols if 'Amount' in c['header'])
+        assert amount_col['type'] == 'currency'
 
-            # Test detailed amount analysis (column 10 is Amount)
-            result = _analyze_amount_column_detailed(tmpfile, amount_col=10, desc_col=1)
+        # Check Action column shows categorical values
+        action_col = next(c for c in cols if c['header'] == 'Action')
+        assert action_col['distinct_values'] is not None
 
-            assert result is not None
+        # Test detailed amount analysis (column 10 is Amount)
+        result = _analyze_amount_column_detailed(tmpfile, amount_col=10, desc_col=1)
 
-            # Should have 2 positive (ROTH CONVERSION, DIVIDEND)
-            # and 1 negative (YOU BOUGHT)
-            assert result['positive_count'] == 2
-            assert result['negative_count'] == 1
+        assert result is not None
 
-            # Verify the samples show the key transactions
-            positive_descs = [d for d, _ in result['sample_positive']]
-            negative_descs = [d for d, _ in result['sample_negative']]
+        # Should have 2 positive (ROTH CONVERSION, DIVIDEND)
+        # and 1 negative (YOU BOUGHT)
+        assert result['positive_count'] == 2
+        assert result['negative_count'] == 1
 
-            assert any('ROTH CONVERSION' in d for d in positive_descs)
-            assert any('DIVIDEND' in d for d in positive_descs)
-            assert any('YOU BOUGHT' in d for d in negative_descs)
+        # Verify the samples show the key transactions
+        positive_descs = [d for d, _ in result['sample_positive']]
+        negative_descs = [d for d, _ in result['sample_negative']]
 
-            # Verify format observations include the mixed decimal note
-            # (7000 is integer, 7002.04 has decimals)
-            assert any('Mixed' in obs for obs in result['format_observations'])
+        assert any('ROTH CONVERSION' in d for d in positive_descs)
+        assert any('DIVIDEND' in d for d in positive_descs)
+        assert any('YOU BOUGHT' in d for d in negative_descs)
 
-        finally:
-            os.unlink(tmpfile)
+        # Verify format observations include the mixed decimal note
+        # (7000 is integer, 7002.04 has decimals)
+        assert any('Mixed' in obs for obs in result['format_observations'])
@@ -1,5 +1,6 @@
 """Tests for the merchant rule engine."""
 
+import io
 import pytest
 from datetime import date
 from tally.merchant_engine import (
@@ -11,7 +12,10 @@ from tally.merchant_engine import (
     csv_to_rules,
     csv_to_merchants_content,
     csv_rule_to_merchant_rule,
+    _required_literals,
+    _numeric_guards,
 )
+from tally.merchant_utils import parse_merchant_rules
 from tally.modifier_parser import parse_pattern_with_modifiers
 
 
@@ -236,6 +240,18 @@ subcategory: Streaming
         assert result.merchant == ""
         assert result.category == ""
 
+    def test_contains_and_contains_match(self):
+        """Rules made only of contains() calls need every literal present."""
+        content = '''
+[Uber Eats]
+match: contains("uber") and contains("EATS")
+category: Food
+subcategory: Delivery
+'''
+        engine = parse_merchants(content)
+        assert engine.match({'description': 'Uber Eats Order', 'amount': 20}).matched
+        assert not engine.match({'description': 'UBER TRIP', 'amount': 20}).matched
+
     def test_most_specific_wins(self):
         """Most specific matching rule wins when match_mode='most_specific'."""
         content = '''
@@ -480,6 +496,34 @@ tags: entertainment
         rule_names = {r.name for r in result.all_matching_rules}
         assert rule_names == {"Netflix", "Large", "Entertainment"}
 
+    def test_first_match_skips_later_untagged_categorization_rules(self):
+        """After first_match sets a category, only later rules with tags are evaluated."""
+        content = '''
+[Netflix]
+match: contains("NETFLIX")
+category: Subscriptions
+
+[Streaming]
+match: contains("NETFLIX") or contains("HULU")
+category: Entertainment
+
+[Streaming Tags]
+match: contains("NETFLIX")
+category: Entertainment
+tags: streaming
+'''
+        engine = parse_merchants(content)
+        result = engine.match({'description': 'NETFLIX.COM', 'amount': 15.99})
+
+        assert result.category == "Subscriptions"
+        assert result.tags == {"streaming"}
+        assert [r.name for r in result.all_matching_rules] == ["Netflix", "Streaming Tags"]
+
+        # most_specific still considers every categorization rule
+        engine = parse_merchants(content, match_mode='most_specific')
+        result = engine.match({'description': 'NETFLIX.COM', 'amount': 15.99})
+        assert len(result.all_matching_rules) == 3
+
 
 class TestTwoPassTagging:
     """Tests for two-pass evaluation (categorization + tagging)."""
@@ -791,6 +835,18 @@ class TestCSVConversion:
         assert rules[1].merchant == "Amazon"
         assert "entertainment" in rules[0].tags
 
+    def test_csv_to_rules_short_row(self):
+        """A CSV row without category columns still converts."""
+        csv_rules = parse_merchant_rules(io.StringIO(
+            "Pattern,Merchant,Category,Subcategory\nNETFLIX,Netflix\n"
+        ))
+        rules = csv_to_rules(csv_rules)
+
+        assert len(rules) == 1
+        assert rules[0].merchant == "Netflix"
+        assert not rules[0].category
+        assert not rules[0].subcategory
+
     def test_csv_to_merchants_content(self):
         """Convert CSV rules to .rules file content."""
         csv_rules = [
@@ -945,6 +1001,41 @@ tags: tag1, tag2, tag3
         engine = parse_merchants(content)
         assert engine.rules[0].tags == {'tag1', 'tag2', 'tag3'}
 
+    def test_static_and_dynamic_tags_resolved_per_transaction(self):
+        """Parsed tag expressions are reused but evaluated per transaction."""
+        content = '''
+[Card Tag]
+match: true
+category: Test
+subcategory: Test
+tags: Shared, {field.holder}, {split(}
+'''
+        engine = parse_merchants(content)
+        david = engine.match({'description': 'X', 'amount': 1.0, 'field': {'holder': 'David'}})
+        sarah = engine.match({'description': 'X', 'amount': 1.0, 'field': {'holder': 'Sarah'}})
+        # Invalid expression tags are skipped
+        assert david.tags == {'shared', 'david'}
+        assert sarah.tags == {'shared', 'sarah'}
+
+    def test_static_tag_shared_across_rules(self):
+        """The same static tag from different rules resolves to one string."""
+        content = '''
+[Netflix]
+match: contains("NETFLIX")
+category: Subscriptions
+tags: Recurring
+
+[Bills]
+match: amount < 50
+tags: recurring
+'''
+        engine = parse_merchants(content)
+        result = engine.match({'description': 'NETFLIX', 'amount': 15.99})
+        assert result.tags == {'recurring'}
+        netflix_tag = next(iter(engine._resolve_tags(engine.rules[0], {}, {})))
+        bills_tag = next(iter(engine._resolve_tags(engine.rules[1], {}, {})))
+        assert netflix_tag is bills_tag
+
     def test_single_tag_no_comma(self):
         """Single tag without commas works."""
         content = '''
@@ -1635,3 +1726,66 @@ category: Food
         assert engine2.match(txn).category == "Food"
 
 
+class TestContainsLiterals:
+    """Tests for the contains() fast-path detection."""
+
+    def test_single_contains(self):
+        """A lone contains() yields its uppercased literal and is exact."""
+        assert _required_literals('contains("netflix")') == (('NETFLIX',), True)
+
+    def test_other_expressions_not_exact(self):
+        """Anything beyond plain contains() falls back to the evaluator."""
+        assert _required_literals('contains(field.memo, "REF")') == ((), False)
+        assert _required_literals('regex("UBER(?!.*EATS)")') == ((), False)
+
+    def test_required_literals_of_mixed_and(self):
+        """contains() terms in an 'and' chain are required even with other terms."""
+        assert _required_literals('contains("costco") and amount > 200') == (('COSTCO',), False)
+        assert _required_literals('contains("UBER") and contains("EATS")') == (('UBER', 'EATS'), True)
+
+    def test_required_literals_none_under_or(self):
+        """Literals under 'or' or with a field argument are not required."""
+        assert _required_literals('contains("UBER") or contains("LYFT")') == ((), False)
+        assert _required_literals('contains(field.memo, "REF") and amount > 5') == ((), False)
+
+    def test_numeric_guards(self):
+        """amount/month comparisons in an 'and' chain are collected."""
+        guards = _numeric_guards('contains("X") and amount > -50 and month == 12')
+        assert [(name, value) for name, _, value in guards] == [('amount', -50), ('month', 12)]
+        assert _numeric_guards('amount > 500 or month == 12') == ()
+        assert _numeric_guards('amount > limit') == ()
+
+    def test_guard_not_applied_when_variable_shadows_name(self):
+        """A variable named like a guard is what the evaluator compares."""
+        engine = parse_merchants('''
+month = 12
+
+[December]
+match: month == 12
+category: Holiday
+''')
+        txn = {'description': 'X', 'amount': 1.0, 'date': date(2025, 6, 1)}
+        assert engine.match(txn).matched
+
+    def test_guarded_rules_match_as_before(self):
+        """Rules with amount/month guards match only when the guards hold."""
+        engine = parse_merchants('''
+[Large Holiday]
+match: amount >= 500 and month == 12
+tags: large-holiday
+''')
+        december = date(2025, 12, 20)
+        assert engine.match({'description': 'X', 'amount': 500.0, 'date': december}).tags == {'large-holiday'}
+        assert not engine.match({'description': 'X', 'amount': 499.0, 'date': december}).tags
+        assert not engine.match({'description': 'X', 'amount': 600.0, 'date': date(2025, 11, 20)}).tags
+
+    def test_mixed_rule_skipped_without_literal(self):
+        """A contains() + amount rule still matches only when both hold."""
+        engine = parse_merchants('''
+[Costco Bulk]
+match: contains("COSTCO") and amount > 200
+category: Shopping
+''')
+        assert engine.match({'description': 'COSTCO #12', 'amount': 250.0}).matched
+        assert not engine.match({'description': 'COSTCO #12', 'amount': 50.0}).matched
+        assert not engine.match({'description': 'TARGET', 'amount': 250.0}).matched
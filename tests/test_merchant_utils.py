@@ -1,45 +1,53 @@
 """Tests for merchant utilities - rule loading and matching."""
 
-import pytest
-import tempfile
+import io
 import os
+import pytest
 from datetime import date
+from unittest import mock
 
+from tally import merchant_utils
 from tally.merchant_utils import (
     load_merchant_rules,
+    parse_merchant_rules,
     get_all_rules,
+    get_rules_from_string,
     normalize_merchant,
     clean_description,
     extract_merchant_name,
     _expr_to_regex,
+    clear_engine_cache,
 )
 from tally.modifier_parser import ParsedPattern
 
 
+@pytest.fixture
+def rules_from(tmp_path):
+    """Write rules content to a file under tmp_path and return its path."""
+    def write(content, name='merchants.rules'):
+        rules_file = tmp_path / name
+        rules_file.write_text(content)
+        return str(rules_file)
+    return write
+
+
 class TestLoadMerchantRules:
     """Tests for loading rules from CSV files."""
 
-    def test_load_simple_rules(self):
+    def test_load_simple_rules(self, rules_from):
         """Load basic rules from CSV."""
         csv_content = """Pattern,Merchant,Category,Subcategory
 COSTCO,Costco,Food,Grocery
 STARBUCKS,Starbucks,Food,Coffee
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = load_merchant_rules(rules_from(csv_content, 'merchant_categories.csv'))
 
-            rules = load_merchant_rules(f.name)
-
-            assert len(rules) == 2
-            # Rules are 5-tuples: (pattern, merchant, category, subcategory, parsed)
-            assert rules[0][0] == 'COSTCO'
-            assert rules[0][1] == 'Costco'
-            assert rules[0][2] == 'Food'
-            assert rules[0][3] == 'Grocery'
-        finally:
-            os.unlink(f.name)
+        assert len(rules) == 2
+        # Rules are 5-tuples: (pattern, merchant, category, subcategory, parsed)
+        assert rules[0][0] == 'COSTCO'
+        assert rules[0][1] == 'Costco'
+        assert rules[0][2] == 'Food'
+        assert rules[0][3] == 'Grocery'
 
     def test_load_rules_with_modifiers(self):
         """Load rules with inline modifiers."""
@@ -47,29 +55,34 @@ STARBUCKS,Starbucks,Food,Coffee
 COSTCO[amount>200],Costco Bulk,Shopping,Bulk
 BESTBUY[date=2025-01-15],TV Purchase,Shopping,Electronics
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = parse_merchant_rules(io.StringIO(csv_content))
 
-            rules = load_merchant_rules(f.name)
+        assert len(rules) == 2
 
-            assert len(rules) == 2
+        # First rule: COSTCO with amount modifier
+        assert rules[0][0] == 'COSTCO'  # Regex pattern (modifier stripped)
+        assert rules[0][1] == 'Costco Bulk'
+        assert len(rules[0][4].amount_conditions) == 1
+        assert rules[0][4].amount_conditions[0].operator == '>'
+        assert rules[0][4].amount_conditions[0].value == 200.0
 
-            # First rule: COSTCO with amount modifier
-            assert rules[0][0] == 'COSTCO'  # Regex pattern (modifier stripped)
-            assert rules[0][1] == 'Costco Bulk'
-            assert len(rules[0][4].amount_conditions) == 1
-            assert rules[0][4].amount_conditions[0].operator == '>'
-            assert rules[0][4].amount_conditions[0].value == 200.0
+        # Second rule: BESTBUY with date modifier
+        assert rules[1][0] == 'BESTBUY'
+        assert rules[1][1] == 'TV Purchase'
+        assert len(rules[1][4].date_conditions) == 1
+        assert rules[1][4].date_conditions[0].value == date(2025, 1, 15)
 
-            # Second rule: BESTBUY with date modifier
-            assert rules[1][0] == 'BESTBUY'
-            assert rules[1][1] == 'TV Purchase'
-            assert len(rules[1][4].date_conditions) == 1
-            assert rules[1][4].date_conditions[0].value == date(2025, 1, 15)
-        finally:
-            os.unlink(f.name)
+    def test_rules_have_named_fields(self):
+        """Loaded rules expose named fields and still unpack as tuples."""
+        csv_content = """Pattern,Merchant,Category,Subcategory,Tags
+COSTCO,Costco,Food,Grocery,bulk
+"""
+        rules = parse_merchant_rules(io.StringIO(csv_content))
+
+        assert rules[0].merchant == 'Costco'
+        assert rules[0].tags == ['bulk']
+        pattern, merchant, category, subcategory, parsed, tags = rules[0]
+        assert (pattern, category, subcategory) == ('COSTCO', 'Food', 'Grocery')
 
     def test_load_rules_with_comments(self):
         """Comments should be ignored."""
@@ -79,18 +92,11 @@ COSTCO,Costco,Food,Grocery
 # Another comment
 STARBUCKS,Starbucks,Food,Coffee
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = parse_merchant_rules(io.StringIO(csv_content))
 
-            rules = load_merchant_rules(f.name)
-
-            assert len(rules) == 2
-            assert rules[0][1] == 'Costco'
-            assert rules[1][1] == 'Starbucks'
-        finally:
-            os.unlink(f.name)
+        assert len(rules) == 2
+        assert rules[0][1] == 'Costco'
+        assert rules[1][1] == 'Starbucks'
 
     def test_load_rules_with_empty_lines(self):
         """Empty lines should be ignored."""
@@ -101,16 +107,9 @@ COSTCO,Costco,Food,Grocery
 STARBUCKS,Starbucks,Food,Coffee
 
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
-
-            rules = load_merchant_rules(f.name)
+        rules = parse_merchant_rules(io.StringIO(csv_content))
 
-            assert len(rules) == 2
-        finally:
-            os.unlink(f.name)
+        assert len(rules) == 2
 
     def test_load_rules_with_regex_patterns(self):
         """Load rules with complex regex patterns."""
@@ -118,18 +117,27 @@ STARBUCKS,Starbucks,Food,Coffee
 UBER\\s(?!EATS),Uber,Transport,Rideshare
 COSTCO(?!.*GAS),Costco,Food,Grocery
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = parse_merchant_rules(io.StringIO(csv_content))
 
-            rules = load_merchant_rules(f.name)
+        assert len(rules) == 2
+        assert rules[0][0] == 'UBER\\s(?!EATS)'
+        assert rules[1][0] == 'COSTCO(?!.*GAS)'
 
-            assert len(rules) == 2
-            assert rules[0][0] == 'UBER\\s(?!EATS)'
-            assert rules[1][0] == 'COSTCO(?!.*GAS)'
-        finally:
-            os.unlink(f.name)
+    def test_load_rules_with_crlf_and_quoted_commas(self, tmp_path):
+        """Windows line endings and quoted patterns with commas parse cleanly."""
+        csv_content = (
+            'Pattern,Merchant,Category,Subcategory\r\n'
+            '# Comment\r\n'
+            '"COSTCO, INC",Costco,Food,Grocery\r\n'
+        )
+        rules_file = tmp_path / 'merchant_categories.csv'
+        rules_file.write_bytes(csv_content.encode('utf-8'))
+
+        rules = load_merchant_rules(str(rules_file))
+
+        assert len(rules) == 1
+        assert rules[0][0] == 'COSTCO, INC'
+        assert rules[0][3] == 'Grocery'
 
     def test_load_nonexistent_file(self):
         """Loading nonexistent file returns empty list."""
@@ -143,18 +151,11 @@ COSTCO,Costco,Food,Grocery
 ,Empty Pattern,Food,Other
 STARBUCKS,Starbucks,Food,Coffee
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = parse_merchant_rules(io.StringIO(csv_content))
 
-            rules = load_merchant_rules(f.name)
-
-            assert len(rules) == 2
-            assert rules[0][1] == 'Costco'
-            assert rules[1][1] == 'Starbucks'
-        finally:
-            os.unlink(f.name)
+        assert len(rules) == 2
+        assert rules[0][1] == 'Costco'
+        assert rules[1][1] == 'Starbucks'
 
 
 class TestNormalizeMerchant:
@@ -176,6 +177,87 @@ class TestNormalizeMerchant:
         result = normalize_merchant('costco wholesale', rules)
         assert result[:3] == ('Costco', 'Food', 'Grocery')
 
+    def test_lowercase_literal_pattern_match(self):
+        """Plain literal patterns match regardless of the pattern's case."""
+        rules = [
+            ('netflix', 'Netflix', 'Subscriptions', 'Streaming', ParsedPattern(regex_pattern='netflix')),
+        ]
+        result = normalize_merchant('NETFLIX.COM 866-579-7172', rules)
+        assert result[:3] == ('Netflix', 'Subscriptions', 'Streaming')
+
+    def test_optional_char_regex_prefix(self):
+        """A quantified last prefix char is not required to be present."""
+        rules = [
+            ('lyfts?\\s', 'Lyft', 'Transport', 'Rideshare', ParsedPattern(regex_pattern='lyfts?\\s')),
+        ]
+        result = normalize_merchant('LYFT RIDE SAT 5PM', rules)
+        assert result[:3] == ('Lyft', 'Transport', 'Rideshare')
+        assert normalize_merchant('LIFT TICKETS', rules)[0] == 'Lift Tickets'
+
+    def test_repeated_description_returns_fresh_match_info(self):
+        """Repeated lookups give equal results that callers can mutate."""
+        rules = [
+            ('NETFLIX', 'Netflix', 'Subscriptions', 'Streaming',
+             ParsedPattern(regex_pattern='NETFLIX'), 'user', ['streaming']),
+        ]
+        first = normalize_merchant('NETFLIX.COM', rules, amount=15.99)
+        first[3]['tags'].append('mutated')
+        second = normalize_merchant('NETFLIX.COM', rules, amount=15.99)
+        assert second[:3] == ('Netflix', 'Subscriptions', 'Streaming')
+        assert second[3]['tags'] == ['streaming']
+        # A different amount is a different lookup
+        assert normalize_merchant('NETFLIX.COM', rules, amount=9.99)[0] == 'Netflix'
+
+    def test_repeated_description_cached_without_supplemental_sources(self):
+        """An empty data_sources, as tally run passes by default, still uses the cache."""
+        rules = get_rules_from_string("""[Netflix]
+match: contains("NETFLIX")
+category: Subscriptions
+""")
+        try:
+            with mock.patch.object(
+                merchant_utils, '_normalize_merchant_uncached',
+                wraps=merchant_utils._normalize_merchant_uncached,
+            ) as uncached:
+                first = normalize_merchant('NETFLIX.COM', rules, amount=15.99, data_sources={})
+                second = normalize_merchant('NETFLIX.COM', rules, amount=15.99, data_sources={})
+        finally:
+            clear_engine_cache()
+        assert first == second
+        assert second[:2] == ('Netflix', 'Subscriptions')
+        assert uncached.call_count == 1
+
+    def test_cached_match_info_nested_dicts_not_shared(self):
+        """Mutating a result's tag_sources or extra_fields can't change later lookups."""
+        rules = get_rules_from_string("""[Netflix]
+match: contains("NETFLIX")
+category: Subscriptions
+tags: streaming
+field: plan = "premium"
+""")
+        try:
+            first = normalize_merchant('NETFLIX.COM', rules, amount=15.99, data_sources={})
+            first[3]['extra_fields']['plan'] = 'mutated'
+            first[3]['tag_sources'].clear()
+            second = normalize_merchant('NETFLIX.COM', rules, amount=15.99, data_sources={})
+            second[3]['extra_fields']['plan'] = 'mutated again'
+            third = normalize_merchant('NETFLIX.COM', rules, amount=15.99, data_sources={})
+        finally:
+            clear_engine_cache()
+        assert third[3]['extra_fields'] == {'plan': 'premium'}
+        assert 'streaming' in third[3]['tag_sources']
+
+    def test_clear_engine_cache_clears_results(self):
+        """clear_engine_cache() also drops memoized normalize_merchant results."""
+        rules = get_rules_from_string("""[Netflix]
+match: contains("NETFLIX")
+category: Subscriptions
+""")
+        normalize_merchant('NETFLIX.COM', rules, amount=15.99)
+        assert merchant_utils._merchant_cache
+        clear_engine_cache()
+        assert not merchant_utils._merchant_cache
+
     def test_first_match_wins(self):
         """First matching rule wins."""
         rules = [
@@ -318,6 +400,27 @@ class TestNormalizeMerchant:
         result = normalize_merchant('AMAZON.COM', rules, txn_date=date(2025, 6, 15))
         assert result[:3] == ('Amazon', 'Shopping', 'Online')
 
+    def test_rules_list_modified_between_calls(self):
+        """Rules added to the same list after a match are still used."""
+        rules = [
+            ('COSTCO', 'Costco', 'Food', 'Grocery', ParsedPattern(regex_pattern='COSTCO')),
+        ]
+        assert normalize_merchant('NETFLIX.COM', rules)[1] == 'Unknown'
+
+        rules.insert(0, ('NETFLIX', 'Netflix', 'Subscriptions', 'Streaming',
+                         ParsedPattern(regex_pattern='NETFLIX')))
+        result = normalize_merchant('NETFLIX.COM', rules)
+        assert result[:3] == ('Netflix', 'Subscriptions', 'Streaming')
+
+    def test_invalid_regex_rule_skipped(self):
+        """A rule with an invalid regex is skipped, later rules still match."""
+        rules = [
+            ('COSTCO(', 'Broken', 'Food', 'Grocery', ParsedPattern(regex_pattern='COSTCO(')),
+            ('COSTCO', 'Costco', 'Food', 'Grocery', ParsedPattern(regex_pattern='COSTCO')),
+        ]
+        result = normalize_merchant('COSTCO WHOLESALE', rules)
+        assert result[:3] == ('Costco', 'Food', 'Grocery')
+
 
 class TestCleanDescription:
     """Tests for clean_description function."""
@@ -357,48 +460,33 @@ class TestGetAllRules:
         rules = get_all_rules(None)
         assert len(rules) == 0  # No baseline rules
 
-    def test_user_rules_loaded(self):
+    def test_user_rules_loaded(self, rules_from):
         """User rules should be loaded from CSV file."""
         csv_content = """Pattern,Merchant,Category,Subcategory
 MYCUSTOM,My Custom Merchant,Custom,Category
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = get_all_rules(rules_from(csv_content, 'merchant_categories.csv'))
 
-            rules = get_all_rules(f.name)
+        # Should have the user rule
+        assert len(rules) == 1
+        assert rules[0][1] == 'My Custom Merchant'
 
-            # Should have the user rule
-            assert len(rules) == 1
-            assert rules[0][1] == 'My Custom Merchant'
-
-            # All rules should be 7-tuples (with source and tags)
-            assert all(len(r) == 7 for r in rules)
-            # Tags should be empty list when not specified
-            assert rules[0][6] == []
-        finally:
+        # All rules should be 7-tuples (with source and tags)
+        assert all(len(r) == 7 for r in rules)
+        # Tags should be empty list when not specified
+        assert rules[0][6] == []
 
-            os.unlink(f.name)
-
-    def test_user_rule_matching(self):
+    def test_user_rule_matching(self, rules_from):
         """User rules should match transactions."""
         csv_content = """Pattern,Merchant,Category,Subcategory
 NETFLIX,My Netflix,Entertainment,Movies
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = get_all_rules(rules_from(csv_content, 'merchant_categories.csv'))
 
-            rules = get_all_rules(f.name)
-
-            # When we match NETFLIX, user rule should match
-            merchant, category, subcategory, match_info = normalize_merchant('NETFLIX.COM', rules)
-            assert (merchant, category, subcategory) == ('My Netflix', 'Entertainment', 'Movies')
-            assert match_info['source'] == 'user'
-        finally:
-            os.unlink(f.name)
+        # When we match NETFLIX, user rule should match
+        merchant, category, subcategory, match_info = normalize_merchant('NETFLIX.COM', rules)
+        assert (merchant, category, subcategory) == ('My Netflix', 'Entertainment', 'Movies')
+        assert match_info['source'] == 'user'
 
 
 class TestTags:
@@ -411,58 +499,37 @@ NETFLIX,Netflix,Subscriptions,Streaming,entertainment|recurring
 UBER,Uber,Transport,Rideshare,business|reimbursable
 COSTCO,Costco,Food,Grocery,
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = parse_merchant_rules(io.StringIO(csv_content))
 
-            rules = load_merchant_rules(f.name)
+        assert len(rules) == 3
+        # Rules are now 6-tuples: (pattern, merchant, category, subcategory, parsed, tags)
+        assert rules[0][5] == ['entertainment', 'recurring']
+        assert rules[1][5] == ['business', 'reimbursable']
+        assert rules[2][5] == []  # Empty tags
 
-            assert len(rules) == 3
-            # Rules are now 6-tuples: (pattern, merchant, category, subcategory, parsed, tags)
-            assert rules[0][5] == ['entertainment', 'recurring']
-            assert rules[1][5] == ['business', 'reimbursable']
-            assert rules[2][5] == []  # Empty tags
-        finally:
-            os.unlink(f.name)
-
-    def test_normalize_returns_tags_in_match_info(self):
+    def test_normalize_returns_tags_in_match_info(self, rules_from):
         """normalize_merchant should return tags in match_info."""
         csv_content = """Pattern,Merchant,Category,Subcategory,Tags
 NETFLIX,Netflix,Subscriptions,Streaming,entertainment|recurring
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = get_all_rules(rules_from(csv_content, 'merchant_categories.csv'))
+        merchant, category, subcategory, match_info = normalize_merchant('NETFLIX.COM', rules)
 
-            rules = get_all_rules(f.name)
-            merchant, category, subcategory, match_info = normalize_merchant('NETFLIX.COM', rules)
-
-            assert merchant == 'Netflix'
-            assert match_info['tags'] == ['entertainment', 'recurring']
-        finally:
-            os.unlink(f.name)
+        assert merchant == 'Netflix'
+        assert match_info['tags'] == ['entertainment', 'recurring']
 
-    def test_normalize_empty_tags_when_no_tags(self):
+    def test_normalize_empty_tags_when_no_tags(self, rules_from):
         """normalize_merchant returns empty tags list when rule has no tags."""
         csv_content = """Pattern,Merchant,Category,Subcategory,Tags
 COSTCO,Costco,Food,Grocery,
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-            merchant, category, subcategory, match_info = normalize_merchant('COSTCO WHOLESALE', rules)
+        rules = get_all_rules(rules_from(csv_content, 'merchant_categories.csv'))
+        merchant, category, subcategory, match_info = normalize_merchant('COSTCO WHOLESALE', rules)
 
-            assert merchant == 'Costco'
-            assert match_info['tags'] == []
-        finally:
-            os.unlink(f.name)
+        assert merchant == 'Costco'
+        assert match_info['tags'] == []
 
-    def test_diagnose_rules_includes_tag_stats(self):
+    def test_diagnose_rules_includes_tag_stats(self, rules_from):
         """diagnose_rules should include tag statistics."""
         from tally.merchant_utils import diagnose_rules
 
@@ -471,33 +538,19 @@ NETFLIX,Netflix,Subscriptions,Streaming,entertainment|recurring
 UBER,Uber,Transport,Rideshare,business
 COSTCO,Costco,Food,Grocery,
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        diag = diagnose_rules(rules_from(csv_content, 'merchant_categories.csv'))
 
-            diag = diagnose_rules(f.name)
-
-            assert diag['rules_with_tags'] == 2  # Netflix and Uber have tags
-            assert diag['unique_tags'] == {'entertainment', 'recurring', 'business'}
-        finally:
-            os.unlink(f.name)
+        assert diag['rules_with_tags'] == 2  # Netflix and Uber have tags
+        assert diag['unique_tags'] == {'entertainment', 'recurring', 'business'}
 
     def test_tags_with_whitespace_are_trimmed(self):
         """Tags with leading/trailing whitespace should be trimmed."""
         csv_content = """Pattern,Merchant,Category,Subcategory,Tags
 NETFLIX,Netflix,Subscriptions,Streaming, entertainment | recurring
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
+        rules = parse_merchant_rules(io.StringIO(csv_content))
 
-            rules = load_merchant_rules(f.name)
-
-            assert rules[0][5] == ['entertainment', 'recurring']
-        finally:
-            os.unlink(f.name)
+        assert rules[0][5] == ['entertainment', 'recurring']
 
     def test_missing_tags_column_in_row_handled_gracefully(self):
         """Rows with fewer columns than header (Tags=None) should work."""
@@ -507,19 +560,12 @@ NETFLIX,Netflix,Subscriptions,Streaming,entertainment
 COSTCO,Costco,Food,Grocery
 UBER,Uber,Transport,Rideshare,business
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.csv', delete=False)
-        try:
-            f.write(csv_content)
-            f.close()
-
-            rules = load_merchant_rules(f.name)
+        rules = parse_merchant_rules(io.StringIO(csv_content))
 
-            assert len(rules) == 3
-            assert rules[0][5] == ['entertainment']
-            assert rules[1][5] == []  # Row has no Tags column value
-            assert rules[2][5] == ['business']
-        finally:
-            os.unlink(f.name)
+        assert len(rules) == 3
+        assert rules[0][5] == ['entertainment']
+        assert rules[1][5] == []  # Row has no Tags column value
+        assert rules[2][5] == ['business']
 
 
 class TestExprToRegex:
@@ -568,7 +614,7 @@ class TestExprToRegex:
 class TestGetAllRulesRulesFormat:
     """Tests for get_all_rules loading .rules files."""
 
-    def test_load_simple_rules_file(self):
+    def test_load_simple_rules_file(self, rules_from):
         """Load rules from .rules file."""
         content = """[Netflix]
 match: contains("NETFLIX")
@@ -580,26 +626,44 @@ match: contains("SPOTIFY")
 category: Subscriptions
 subcategory: Music
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-
-            assert len(rules) == 2
-            # First rule - full expression preserved for expr matching
-            assert rules[0][0] == 'contains("NETFLIX")'
-            assert rules[0][1] == 'Netflix'  # Merchant name
-            assert rules[0][2] == 'Subscriptions'  # Category
-            assert rules[0][3] == 'Streaming'  # Subcategory
-            # Second rule
-            assert rules[1][0] == 'contains("SPOTIFY")'
-            assert rules[1][1] == 'Spotify'
-        finally:
-            os.unlink(f.name)
-
-    def test_load_rules_with_tags(self):
+        rules = get_all_rules(rules_from(content))
+
+        assert len(rules) == 2
+        # First rule - full expression preserved for expr matching
+        assert rules[0][0] == 'contains("NETFLIX")'
+        assert rules[0][1] == 'Netflix'  # Merchant name
+        assert rules[0][2] == 'Subscriptions'  # Category
+        assert rules[0][3] == 'Streaming'  # Subcategory
+        # Second rule
+        assert rules[1][0] == 'contains("SPOTIFY")'
+        assert rules[1][1] == 'Spotify'
+
+    def test_unchanged_rules_file_parsed_once(self, rules_from):
+        """Reloading an unchanged file reuses the engine; edits are picked up."""
+        from tally.merchant_utils import get_cached_engine
+        rules_path = rules_from('[Netflix]\nmatch: contains("NETFLIX")\ncategory: Subscriptions\n')
+        get_all_rules(rules_path)
+        engine = get_cached_engine()
+        get_all_rules(rules_path)
+        assert get_cached_engine() is engine
+
+        rules_from('[Hulu]\nmatch: contains("HULU")\ncategory: Subscriptions\nsubcategory: Streaming\n')
+        rules = get_all_rules(rules_path)
+        assert get_cached_engine() is not engine
+        assert rules[0][1] == 'Hulu'
+
+    def test_same_size_rewrite_with_same_mtime_picked_up(self, rules_from):
+        """A rewrite that keeps the size and mtime is still noticed."""
+        rules_path = rules_from('[Netflix]\nmatch: contains("NETFLIX")\ncategory: Subscriptions\n')
+        st = os.stat(rules_path)
+        assert get_all_rules(rules_path)[0][1] == 'Netflix'
+
+        rules_from('[Hulu123]\nmatch: contains("HULU123")\ncategory: Subscriptions\n')
+        os.utime(rules_path, ns=(st.st_atime_ns, st.st_mtime_ns))
+        assert os.stat(rules_path).st_size == st.st_size
+        assert get_all_rules(rules_path)[0][1] == 'Hulu123'
+
+    def test_load_rules_with_tags(self, rules_from):
         """Load .rules file with tags."""
         content = """[Netflix]
 match: contains("NETFLIX")
@@ -607,62 +671,41 @@ category: Subscriptions
 subcategory: Streaming
 tags: entertainment, recurring
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
+        rules = get_all_rules(rules_from(content))
 
-            rules = get_all_rules(f.name)
-
-            assert len(rules) == 1
-            # Tags are at index 6
-            assert set(rules[0][6]) == {'entertainment', 'recurring'}
-        finally:
-            os.unlink(f.name)
+        assert len(rules) == 1
+        # Tags are at index 6
+        assert set(rules[0][6]) == {'entertainment', 'recurring'}
 
-    def test_load_rules_regex_pattern(self):
+    def test_load_rules_regex_pattern(self, rules_from):
         """Load .rules file with regex() match expression."""
         content = r"""[Uber Rides]
 match: regex("UBER(?!.*EATS)")
 category: Transportation
 subcategory: Rideshare
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
+        rules = get_all_rules(rules_from(content))
 
-            assert len(rules) == 1
-            # Full expression preserved for expr matching
-            assert rules[0][0] == r'regex("UBER(?!.*EATS)")'
-            assert rules[0][1] == 'Uber Rides'
-        finally:
-            os.unlink(f.name)
+        assert len(rules) == 1
+        # Full expression preserved for expr matching
+        assert rules[0][0] == r'regex("UBER(?!.*EATS)")'
+        assert rules[0][1] == 'Uber Rides'
 
-    def test_rules_can_match_transactions(self):
+    def test_rules_can_match_transactions(self, rules_from):
         """Rules loaded from .rules should work with normalize_merchant."""
         content = """[Netflix]
 match: contains("NETFLIX")
 category: Subscriptions
 subcategory: Streaming
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-            merchant, category, subcategory, match_info = normalize_merchant('NETFLIX.COM', rules)
+        rules = get_all_rules(rules_from(content))
+        merchant, category, subcategory, match_info = normalize_merchant('NETFLIX.COM', rules)
 
-            assert merchant == 'Netflix'
-            assert category == 'Subscriptions'
-            assert subcategory == 'Streaming'
-        finally:
-            os.unlink(f.name)
+        assert merchant == 'Netflix'
+        assert category == 'Subscriptions'
+        assert subcategory == 'Streaming'
 
-    def test_rules_with_amount_conditions(self):
+    def test_rules_with_amount_conditions(self, rules_from):
         """Amount conditions in expressions should work when loaded from .rules files."""
         content = """[Costco Gas]
 match: contains("COSTCO") and amount <= 100
@@ -674,36 +717,29 @@ match: contains("COSTCO") and amount > 100
 category: Food
 subcategory: Grocery
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-
-            # Low amount should match Gas
-            merchant, category, subcategory, _ = normalize_merchant(
-                'COSTCO FUEL', rules, amount=50.00
-            )
-            assert merchant == 'Costco Gas'
-            assert category == 'Transportation'
-            assert subcategory == 'Gas'
-
-            # High amount should match Groceries
-            merchant, category, subcategory, _ = normalize_merchant(
-                'COSTCO WHOLESALE', rules, amount=200.00
-            )
-            assert merchant == 'Costco Groceries'
-            assert category == 'Food'
-            assert subcategory == 'Grocery'
-        finally:
-            os.unlink(f.name)
+        rules = get_all_rules(rules_from(content))
+
+        # Low amount should match Gas
+        merchant, category, subcategory, _ = normalize_merchant(
+            'COSTCO FUEL', rules, amount=50.00
+        )
+        assert merchant == 'Costco Gas'
+        assert category == 'Transportation'
+        assert subcategory == 'Gas'
+
+        # High amount should match Groceries
+        merchant, category, subcategory, _ = normalize_merchant(
+            'COSTCO WHOLESALE', rules, amount=200.00
+        )
+        assert merchant == 'Costco Groceries'
+        assert category == 'Food'
+        assert subcategory == 'Grocery'
 
 
 class TestNegativeLookaheadMatching:
     """Tests for negative lookahead patterns in .rules format."""
 
-    def test_uber_not_uber_eats_matching(self):
+    def test_uber_not_uber_eats_matching(self, rules_from):
         """Negative lookahead should match Uber but not Uber Eats."""
         content = r"""[Uber Rides]
 match: regex("UBER(?!.*EATS)")
@@ -715,57 +751,43 @@ match: contains("UBER") and contains("EATS")
 category: Food
 subcategory: Delivery
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
+        rules = get_all_rules(rules_from(content))
 
-            # "UBER TRIP" should match Uber Rides
-            merchant, category, subcategory, _ = normalize_merchant('UBER TRIP 12345', rules)
-            assert merchant == 'Uber Rides'
-            assert category == 'Transportation'
+        # "UBER TRIP" should match Uber Rides
+        merchant, category, subcategory, _ = normalize_merchant('UBER TRIP 12345', rules)
+        assert merchant == 'Uber Rides'
+        assert category == 'Transportation'
 
-            # "UBER EATS" should NOT match Uber Rides (negative lookahead)
-            # It should fall through to Uber Eats rule
-            merchant, category, subcategory, _ = normalize_merchant('UBER EATS ORDER', rules)
-            assert merchant == 'Uber Eats'
-            assert category == 'Food'
-        finally:
-            os.unlink(f.name)
+        # "UBER EATS" should NOT match Uber Rides (negative lookahead)
+        # It should fall through to Uber Eats rule
+        merchant, category, subcategory, _ = normalize_merchant('UBER EATS ORDER', rules)
+        assert merchant == 'Uber Eats'
+        assert category == 'Food'
 
-    def test_negative_lookahead_various_formats(self):
+    def test_negative_lookahead_various_formats(self, rules_from):
         """Test negative lookahead with different Uber description formats."""
         content = r"""[Uber Rides]
 match: regex("UBER(?!.*EATS)")
 category: Transportation
 subcategory: Rideshare
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
+        rules = get_all_rules(rules_from(content))
 
-            # Should match - regular Uber
-            for desc in ['UBER', 'UBER TRIP', 'UBER*RIDE', 'UBER BV AMSTERDAM']:
-                merchant, _, _, _ = normalize_merchant(desc, rules)
-                assert merchant == 'Uber Rides', f"'{desc}' should match Uber Rides"
+        # Should match - regular Uber
+        for desc in ['UBER', 'UBER TRIP', 'UBER*RIDE', 'UBER BV AMSTERDAM']:
+            merchant, _, _, _ = normalize_merchant(desc, rules)
+            assert merchant == 'Uber Rides', f"'{desc}' should match Uber Rides"
 
-            # Should NOT match - Uber Eats variations
-            for desc in ['UBER EATS', 'UBEREATS', 'UBER* EATS', 'UBER EATS ORDER']:
-                merchant, category, _, _ = normalize_merchant(desc, rules)
-                assert category == 'Unknown', f"'{desc}' should NOT match Uber Rides (got {merchant})"
-        finally:
-            os.unlink(f.name)
+        # Should NOT match - Uber Eats variations
+        for desc in ['UBER EATS', 'UBEREATS', 'UBER* EATS', 'UBER EATS ORDER']:
+            merchant, category, _, _ = normalize_merchant(desc, rules)
+            assert category == 'Unknown', f"'{desc}' should NOT match Uber Rides (got {merchant})"
 
 
 class TestRulesFormatComplexConditions:
     """Tests for .rules format with conditions (amount, date, etc.)."""
 
-    def test_amount_condition_in_expression(self):
+    def test_amount_condition_in_expression(self, rules_from):
         """Amount conditions in match expression should be preserved."""
         content = """[Costco Bulk]
 match: contains("COSTCO") and amount > 200
@@ -777,20 +799,13 @@ match: contains("COSTCO")
 category: Food
 subcategory: Grocery
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
+        rules = get_all_rules(rules_from(content))
 
-            rules = get_all_rules(f.name)
-
-            # Both rules should load with full expressions preserved
-            assert len(rules) == 2
-            # Full expressions preserved for expr matching (amount conditions work)
-            assert rules[0][0] == 'contains("COSTCO") and amount > 200'
-            assert rules[1][0] == 'contains("COSTCO")'
-        finally:
-            os.unlink(f.name)
+        # Both rules should load with full expressions preserved
+        assert len(rules) == 2
+        # Full expressions preserved for expr matching (amount conditions work)
+        assert rules[0][0] == 'contains("COSTCO") and amount > 200'
+        assert rules[1][0] == 'contains("COSTCO")'
 
 
 class TestTwoPassTagging:
@@ -812,31 +827,24 @@ tags: large
 match: month >= 11 and month <= 12
 tags: holiday
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-
-            # Match Netflix + Large + Holiday
-            merchant, category, subcategory, match_info = normalize_merchant(
-                'NETFLIX PREMIUM',
-                rules,
-                amount=600.00,
-                txn_date=date(2025, 12, 15)
-            )
-
-            # Category from first categorization rule (Netflix)
-            assert merchant == 'Netflix'
-            assert category == 'Subscriptions'
-
-            # Tags from ALL matching rules
-            assert 'entertainment' in match_info['tags']
-            assert 'large' in match_info['tags']
-            assert 'holiday' in match_info['tags']
-        finally:
-            os.unlink(f.name)
+        rules = get_rules_from_string(content)
+
+        # Match Netflix + Large + Holiday
+        merchant, category, subcategory, match_info = normalize_merchant(
+            'NETFLIX PREMIUM',
+            rules,
+            amount=600.00,
+            txn_date=date(2025, 12, 15)
+        )
+
+        # Category from first categorization rule (Netflix)
+        assert merchant == 'Netflix'
+        assert category == 'Subscriptions'
+
+        # Tags from ALL matching rules
+        assert 'entertainment' in match_info['tags']
+        assert 'large' in match_info['tags']
+        assert 'holiday' in match_info['tags']
 
     def test_tag_only_rules_dont_set_category(self):
         """Tag-only rules (no category) don't affect categorization."""
@@ -850,31 +858,24 @@ category: Subscriptions
 subcategory: Streaming
 tags: entertainment
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-
-            # Large Purchase matches first, but shouldn't set category
-            merchant, category, subcategory, match_info = normalize_merchant(
-                'NETFLIX PREMIUM',
-                rules,
-                amount=600.00
-            )
-
-            # Category from Netflix rule (first with category)
-            assert merchant == 'Netflix'
-            assert category == 'Subscriptions'
-            assert subcategory == 'Streaming'
-
-            # Tags from both matching rules
-            assert 'large' in match_info['tags']
-            assert 'expensive' in match_info['tags']
-            assert 'entertainment' in match_info['tags']
-        finally:
-            os.unlink(f.name)
+        rules = get_rules_from_string(content)
+
+        # Large Purchase matches first, but shouldn't set category
+        merchant, category, subcategory, match_info = normalize_merchant(
+            'NETFLIX PREMIUM',
+            rules,
+            amount=600.00
+        )
+
+        # Category from Netflix rule (first with category)
+        assert merchant == 'Netflix'
+        assert category == 'Subscriptions'
+        assert subcategory == 'Streaming'
+
+        # Tags from both matching rules
+        assert 'large' in match_info['tags']
+        assert 'expensive' in match_info['tags']
+        assert 'entertainment' in match_info['tags']
 
     def test_unknown_merchant_still_gets_tags(self):
         """Unknown merchants can have tags from tag-only rules."""
@@ -886,31 +887,24 @@ tags: large
 match: month == 12
 tags: holiday
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-
-            # No categorization rule matches, but tag-only rules do
-            merchant, category, subcategory, match_info = normalize_merchant(
-                'RANDOM UNKNOWN MERCHANT',
-                rules,
-                amount=750.00,
-                txn_date=date(2025, 12, 25)
-            )
-
-            # No categorization - Unknown
-            assert category == 'Unknown'
-            assert subcategory == 'Unknown'
-
-            # But tags from matching tag-only rules
-            assert match_info is not None
-            assert 'large' in match_info['tags']
-            assert 'holiday' in match_info['tags']
-        finally:
-            os.unlink(f.name)
+        rules = get_rules_from_string(content)
+
+        # No categorization rule matches, but tag-only rules do
+        merchant, category, subcategory, match_info = normalize_merchant(
+            'RANDOM UNKNOWN MERCHANT',
+            rules,
+            amount=750.00,
+            txn_date=date(2025, 12, 25)
+        )
+
+        # No categorization - Unknown
+        assert category == 'Unknown'
+        assert subcategory == 'Unknown'
+
+        # But tags from matching tag-only rules
+        assert match_info is not None
+        assert 'large' in match_info['tags']
+        assert 'holiday' in match_info['tags']
 
     def test_tags_deduplicated_order_preserved(self):
         """Duplicate tags are removed, order preserved."""
@@ -927,31 +921,22 @@ tags: entertainment, streaming
 match: amount < 50
 tags: recurring, small
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-
-            merchant, category, subcategory, match_info = normalize_merchant(
-                'NETFLIX.COM',
-                rules,
-                amount=15.99
-            )
-
-            # Tags should be deduplicated
-            tags = match_info['tags']
-            assert tags.count('recurring') == 1
-            assert tags.count('entertainment') == 1
-
-            # All unique tags present
-            assert 'recurring' in tags
-            assert 'entertainment' in tags
-            assert 'streaming' in tags
-            assert 'small' in tags
-        finally:
-            os.unlink(f.name)
+        rules = get_rules_from_string(content)
+
+        merchant, category, subcategory, match_info = normalize_merchant(
+            'NETFLIX.COM',
+            rules,
+            amount=15.99
+        )
+
+        # Tags should be deduplicated
+        tags = match_info['tags']
+        assert tags.count('recurring') == 1
+        assert tags.count('entertainment') == 1
+
+        # All unique tags present, in the order rules first added them
+        assert set(tags[:2]) == {'recurring', 'entertainment'}
+        assert tags[2:] == ['streaming', 'small']
 
     def test_no_matching_rules_returns_none_match_info(self):
         """When no rules match, match_info is None."""
@@ -960,29 +945,22 @@ match: contains("NETFLIX")
 category: Subscriptions
 tags: entertainment
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
+        rules = get_rules_from_string(content)
 
-            # No rule matches
-            merchant, category, subcategory, match_info = normalize_merchant(
-                'RANDOM MERCHANT',
-                rules
-            )
+        # No rule matches
+        merchant, category, subcategory, match_info = normalize_merchant(
+            'RANDOM MERCHANT',
+            rules
+        )
 
-            assert category == 'Unknown'
-            assert match_info is None  # No tags either
-        finally:
-            os.unlink(f.name)
+        assert category == 'Unknown'
+        assert match_info is None  # No tags either
 
 
 class TestApplyTagRules:
     """Tests for apply_tag_rules function."""
 
-    def test_apply_tag_rules_basic(self):
+    def test_apply_tag_rules_basic(self, rules_from):
         """Apply tag-only rules to a transaction."""
         from tally.merchant_utils import apply_tag_rules, get_tag_only_rules
 
@@ -999,31 +977,24 @@ tags: large
 match: month == 12
 tags: holiday
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
+        tag_rules = get_tag_only_rules(rules_from(content))
 
-            tag_rules = get_tag_only_rules(f.name)
+        # Should have 2 tag-only rules (Large Purchase and Holiday)
+        assert len(tag_rules) == 2
 
-            # Should have 2 tag-only rules (Large Purchase and Holiday)
-            assert len(tag_rules) == 2
+        txn = {
+            'description': 'RANDOM MERCHANT',
+            'amount': 750.00,
+            'date': date(2025, 12, 25)
+        }
+        additional_tags = apply_tag_rules(txn, tag_rules)
 
-            txn = {
-                'description': 'RANDOM MERCHANT',
-                'amount': 750.00,
-                'date': date(2025, 12, 25)
-            }
-            additional_tags = apply_tag_rules(txn, tag_rules)
+        assert 'large' in additional_tags
+        assert 'holiday' in additional_tags
+        # entertainment not included (Netflix has category, not tag-only)
+        assert 'entertainment' not in additional_tags
 
-            assert 'large' in additional_tags
-            assert 'holiday' in additional_tags
-            # entertainment not included (Netflix has category, not tag-only)
-            assert 'entertainment' not in additional_tags
-        finally:
-            os.unlink(f.name)
-
-    def test_apply_tag_rules_with_dynamic_tags(self):
+    def test_apply_tag_rules_with_dynamic_tags(self, rules_from):
         """Apply tag-only rules with dynamic tag expressions."""
         from tally.merchant_utils import apply_tag_rules, get_tag_only_rules
 
@@ -1031,24 +1002,17 @@ tags: holiday
 match: source != ""
 tags: {source}
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
+        tag_rules = get_tag_only_rules(rules_from(content))
+        assert len(tag_rules) == 1
 
-            tag_rules = get_tag_only_rules(f.name)
-            assert len(tag_rules) == 1
+        txn = {
+            'description': 'PURCHASE',
+            'amount': 50.00,
+            'source': 'AmexGold'
+        }
+        additional_tags = apply_tag_rules(txn, tag_rules)
 
-            txn = {
-                'description': 'PURCHASE',
-                'amount': 50.00,
-                'source': 'AmexGold'
-            }
-            additional_tags = apply_tag_rules(txn, tag_rules)
-
-            assert 'amexgold' in additional_tags
-        finally:
-            os.unlink(f.name)
+        assert 'amexgold' in additional_tags
 
     def test_get_tag_only_rules_empty_for_csv(self):
         """get_tag_only_rules returns empty for non-.rules files."""
@@ -1067,12 +1031,14 @@ tags: {source}
         assert result == []
 
 
-class TestNormalizeMerchantWithLocation:
-    """Tests for normalize_merchant with location parameter."""
+@pytest.fixture
+def store_rules():
+    """Hawaii vs regular store rules.
 
-    def test_location_passed_to_rule_matching(self):
-        """Location is available in rule expressions."""
-        content = """[Hawaii Store]
+    Function-scoped: get_rules_from_string loads the engine that
+    normalize_merchant uses, so each test must load its own.
+    """
+    content = """[Hawaii Store]
 match: contains("STORE") and regex(field.location, "\\\\bHI$")
 category: Travel
 subcategory: Shopping
@@ -1082,73 +1048,56 @@ match: contains("STORE")
 category: Shopping
 subcategory: Retail
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-
-            # Hawaii store should match the Hawaii rule
-            merchant, category, subcategory, _ = normalize_merchant(
-                "ABC STORE",
-                rules,
-                amount=50.00,
-                location="HONOLULU\nHI"
-            )
-            assert merchant == "Hawaii Store"
-            assert category == "Travel"
-            assert subcategory == "Shopping"
-
-            # Non-Hawaii store should match the regular rule
-            merchant, category, subcategory, _ = normalize_merchant(
-                "ABC STORE",
-                rules,
-                amount=50.00,
-                location="SEATTLE\nWA"
-            )
-            assert merchant == "Regular Store"
-            assert category == "Shopping"
-            assert subcategory == "Retail"
+    return get_rules_from_string(content)
 
-        finally:
-            os.unlink(f.name)
 
-    def test_location_with_contains(self):
-        """contains() works with field.location."""
-        content = """[Lahaina Shop]
+@pytest.fixture
+def lahaina_rules():
+    """Location-only rule, loaded per test like store_rules."""
+    content = """[Lahaina Shop]
 match: contains(field.location, "LAHAINA")
 category: Travel
 subcategory: Shopping
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
-
-            # Lahaina location should match
-            merchant, category, subcategory, _ = normalize_merchant(
-                "RANDOM SHOP",
-                rules,
-                amount=50.00,
-                location="LAHAINA\nHI"
-            )
-            assert merchant == "Lahaina Shop"
-            assert category == "Travel"
+    return get_rules_from_string(content)
 
-            # Non-Lahaina should not match
-            merchant, category, subcategory, _ = normalize_merchant(
-                "RANDOM SHOP",
-                rules,
-                amount=50.00,
-                location="SEATTLE\nWA"
-            )
-            assert category == "Unknown"
 
-        finally:
-            os.unlink(f.name)
+class TestNormalizeMerchantWithLocation:
+    """Tests for normalize_merchant with location parameter."""
+
+    @pytest.mark.parametrize("location,expected_merchant,expected_category,expected_subcategory", [
+        ("HONOLULU\nHI", "Hawaii Store", "Travel", "Shopping"),
+        ("SEATTLE\nWA", "Regular Store", "Shopping", "Retail"),
+    ])
+    def test_location_passed_to_rule_matching(
+        self, store_rules, location, expected_merchant, expected_category, expected_subcategory
+    ):
+        """Location is available in rule expressions."""
+        merchant, category, subcategory, _ = normalize_merchant(
+            "ABC STORE",
+            store_rules,
+            amount=50.00,
+            location=location
+        )
+        assert merchant == expected_merchant
+        assert category == expected_category
+        assert subcategory == expected_subcategory
+
+    @pytest.mark.parametrize("location,expected_category", [
+        ("LAHAINA\nHI", "Travel"),
+        ("SEATTLE\nWA", "Unknown"),
+    ])
+    def test_location_with_contains(self, lahaina_rules, location, expected_category):
+        """contains() works with field.location."""
+        merchant, category, subcategory, _ = normalize_merchant(
+            "RANDOM SHOP",
+            lahaina_rules,
+            amount=50.00,
+            location=location
+        )
+        assert category == expected_category
+        if expected_category == "Travel":
+            assert merchant == "Lahaina Shop"
 
     def test_location_none_doesnt_break_matching(self):
         """Rules still work when location is None."""
@@ -1157,22 +1106,15 @@ match: contains("STORE")
 category: Shopping
 subcategory: Retail
 """
-        f = tempfile.NamedTemporaryFile(mode='w', suffix='.rules', delete=False)
-        try:
-            f.write(content)
-            f.close()
-
-            rules = get_all_rules(f.name)
+        rules = get_rules_from_string(content)
+
+        # Location None should still match description-based rules
+        merchant, category, subcategory, _ = normalize_merchant(
+            "ABC STORE",
+            rules,
+            amount=50.00,
+            location=None
+        )
+        assert merchant == "Test Store"
+        assert category == "Shopping"
 
-            # Location None should still match description-based rules
-            merchant, category, subcategory, _ = normalize_merchant(
-                "ABC STORE",
-                rules,
-                amount=50.00,
-                location=None
-            )
-            assert merchant == "Test Store"
-            assert category == "Shopping"
-
-        finally:
-            os.unlink(f.name)
@@ -46,6 +46,15 @@ class TestParsePatternWithModifiers:
         assert result.amount_conditions == []
         assert result.date_conditions == []
 
+    def test_repeated_parse_returns_independent_lists(self):
+        """Repeated patterns share a cached parse but not its lists."""
+        first = parse_pattern_with_modifiers('COSTCO[amount>200]')
+        first.amount_conditions.clear()
+        second = parse_pattern_with_modifiers('COSTCO[amount>200]')
+        assert second.regex_pattern == 'COSTCO'
+        assert len(second.amount_conditions) == 1
+        assert second.amount_conditions[0].value == 200.0
+
 
 class TestAmountModifiers:
     """Tests for amount modifier parsing."""
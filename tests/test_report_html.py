@@ -10,14 +10,21 @@ Run: playwright install chromium
 """
 from __future__ import annotations
 
+import contextlib
+import csv
+import io
 import os
 import re
-import subprocess
+import sys
 import warnings
 from typing import TYPE_CHECKING
+from unittest import mock
 
 import pytest
 
+from tally.cli import main as tally_main
+from tally.merchant_utils import clear_engine_cache
+
 # Skip all tests if Playwright not installed
 try:
     from playwright.sync_api import expect
@@ -38,8 +45,99 @@ pytestmark = pytest.mark.skipif(
     reason="Playwright not installed"
 )
 
+# Percentages as rendered in the report
+_PCT_SIMPLE = re.compile(r'([\d.]+)%')  # "45.2%" in merchant rows
+_PCT_SECTION = re.compile(r'\(([\d.]+)%\)')  # "(45.2%)" in section headers
+_PCT_LABELED = re.compile(r'\(([\d.]+)%([^)]*)\)')  # "(45.2%)" or "(12% income)"
+_ACTIVE_RE = re.compile(r"(?:^|\s)active(?:\s|$)")  # "active" as a whole class name
+
+
+def _generate_report(report_file, config_dir, *options):
+    """Run 'tally run' in-process to write an HTML report, failing the test on error."""
+    argv = ["tally", "run", *options, "-o", report_file, config_dir]
+    stderr = io.StringIO()
+    try:
+        # stdout is never read, so don't buffer it; stderr is kept for failures
+        with mock.patch.object(sys, "argv", argv), \
+                open(os.devnull, "w") as devnull, \
+                contextlib.redirect_stdout(devnull), \
+                contextlib.redirect_stderr(stderr):
+            tally_main()
+    except SystemExit as e:
+        if e.code:
+            pytest.fail(f"Failed to generate report: {stderr.getvalue()}")
+    finally:
+        # Don't leak this report's rules engine into other tests
+        clear_engine_cache()
+
+
+def _build_report(tmp_path_factory, name, settings, rules, data, *options):
+    """Lay out a tally config under a fresh temp dir and generate its report.
+
+    data maps file names under data/ to their CSV content. Returns the path
+    of the generated report.
+    """
+    tmp_dir = tmp_path_factory.mktemp(name)
+    config_dir = tmp_dir / "config"
+    data_dir = tmp_dir / "data"
+    output_dir = tmp_dir / "output"
+
+    config_dir.mkdir()
+    data_dir.mkdir()
+    output_dir.mkdir()
+
+    # UTF-8 throughout, e.g. for a £ currency format on Windows
+    (config_dir / "settings.yaml").write_text(settings, encoding="utf-8")
+    (config_dir / "merchants.rules").write_text(rules, encoding="utf-8")
+    for file_name, content in data.items():
+        (data_dir / file_name).write_text(content, encoding="utf-8")
+
+    report_file = output_dir / "report.html"
+    _generate_report(str(report_file), str(config_dir), *options)
+    return str(report_file)
+
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="class")
+def class_context(browser, browser_context_args):
+    """One browser context shared by the pages of a test class.
+
+    Report state (filters, sort order, grouping) lives in each page and its
+    URL hash, so pages in the same context don't see each other's changes.
+    The only shared state is the saved theme in localStorage, which
+    SharedContextPages clears after each test. Built from
+    browser_context_args, like pytest-playwright's own context, so --device
+    and other context options still apply.
+    """
+    context = browser.new_context(**browser_context_args)
+    yield context
+    context.close()
+
+
+def _open_report(context, report_path):
+    """Open a report in a new page of the given context and wait for it to load.
+
+    Pages opened this way are shared by a test class, so only use them in
+    tests that don't change page state; the rest use the page fixture.
+    """
+    page = context.new_page()
+    page.goto(f"file://{report_path}")
+    page.wait_for_load_state("networkidle")
+    return page
+
+
+class SharedContextPages:
+    """Mixin giving each test a fresh page from the class's shared context."""
+
+    @pytest.fixture
+    def page(self, class_context):
+        page = class_context.new_page()
+        yield page
+        # Storage is per context; about:blank pages can't touch it
+        page.evaluate("() => { try { localStorage.clear(); } catch (e) {} }")
+        page.close()
+
+
+@pytest.fixture(scope="session")
 def report_path(tmp_path_factory):
     """Generate a test report with known fixture data.
 
@@ -50,15 +148,6 @@ def report_path(tmp_path_factory):
     - David's total: $772.49
     - Sarah's total: $258.49
     """
-    tmp_dir = tmp_path_factory.mktemp("report_test")
-    config_dir = tmp_dir / "config"
-    data_dir = tmp_dir / "data"
-    output_dir = tmp_dir / "output"
-
-    config_dir.mkdir()
-    data_dir.mkdir()
-    output_dir.mkdir()
-
     # Create test CSV
     csv_content = """Date,Description,Amount,Card Holder
 01/05/2024,AMAZON MARKETPLACE,45.99,David
@@ -74,7 +163,6 @@ def report_path(tmp_path_factory):
 03/10/2024,TARGET,234.00,David
 03/15/2024,TARGET,67.00,Sarah
 """
-    (data_dir / "transactions.csv").write_text(csv_content)
 
     # Create settings
     settings_content = """year: 2024
@@ -86,7 +174,6 @@ data_sources:
 
 merchants_file: config/merchants.rules
 """
-    (config_dir / "settings.yaml").write_text(settings_content)
 
     # Create merchants rules with tags
     rules_content = """[Amazon]
@@ -113,28 +200,18 @@ category: Shopping
 subcategory: Retail
 tags: {field.card_holder}
 """
-    (config_dir / "merchants.rules").write_text(rules_content)
 
-    # Generate the report
-    report_file = output_dir / "report.html"
-    result = subprocess.run(
-        ["uv", "run", "tally", "run", "-o", str(report_file), str(config_dir)],
-        capture_output=True,
-        text=True,
-        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return _build_report(
+        tmp_path_factory, "report_test", settings_content, rules_content,
+        {"transactions.csv": csv_content}
     )
 
-    if result.returncode != 0:
-        pytest.fail(f"Failed to generate report: {result.stderr}")
-
-    return str(report_file)
-
 
 # =============================================================================
 # Category 1: UI Navigation Tests
 # =============================================================================
 
-class TestUINavigation:
+class TestUINavigation(SharedContextPages):
     """Tests for interactive UI elements."""
 
     def test_report_loads_without_errors(self, page: Page, report_path):
@@ -175,10 +252,10 @@ class TestUINavigation:
         # Expand Amazon to see transactions
         amazon_row = page.get_by_test_id("merchant-row-Amazon")
         amazon_row.click()
-        # Wait for expansion
-        page.wait_for_timeout(200)
         # Get transaction rows for Amazon (they contain AMAZON MARKETPLACE in description)
         amazon_txns = page.locator(".txn-row:has-text('AMAZON MARKETPLACE')")
+        # Wait for expansion to render the rows
+        amazon_txns.first.wait_for(state="visible", timeout=2000)
         dates = amazon_txns.locator(".txn-date").all_text_contents()
         # Amazon has transactions on: Jan 5, Jan 10, Feb 1, Mar 1
         # Should be sorted descending: Mar 1, Feb 1, Jan 10, Jan 5
@@ -217,9 +294,12 @@ class TestUINavigation:
         expect(david_badge).to_be_visible()
         expect(sarah_badge).to_be_visible()
 
-        # Get computed colors
-        david_color = david_badge.evaluate("el => getComputedStyle(el).color")
-        sarah_color = sarah_badge.evaluate("el => getComputedStyle(el).color")
+        # Get computed colors of all badges in one round-trip
+        badges = page.get_by_test_id("tag-badge").evaluate_all(
+            "els => els.map(el => [el.textContent, getComputedStyle(el).color])"
+        )
+        david_color = next(color for text, color in badges if "david" in text.lower())
+        sarah_color = next(color for text, color in badges if "sarah" in text.lower())
 
         # Colors should be set (not default/black)
         assert david_color != "rgb(0, 0, 0)", "David tag should have a color"
@@ -231,14 +311,15 @@ class TestUINavigation:
     def test_same_tag_has_consistent_color(self, page: Page, report_path):
         """Same tag has the same color across different merchants."""
         page.goto(f"file://{report_path}")
-        # Get all David tag badges
-        david_badges = page.get_by_test_id("tag-badge").filter(has_text="David").all()
+        # Get the colors of all David tag badges in one round-trip
+        colors = page.get_by_test_id("tag-badge").filter(has_text="David").evaluate_all(
+            "els => els.map(el => getComputedStyle(el).color)"
+        )
 
         # Should have multiple David badges (across merchants)
-        assert len(david_badges) >= 2, "Should have multiple David tags"
+        assert len(colors) >= 2, "Should have multiple David tags"
 
         # All David badges should have the same color
-        colors = [badge.evaluate("el => getComputedStyle(el).color") for badge in david_badges]
         assert all(c == colors[0] for c in colors), "Same tag should have consistent color"
 
 
@@ -246,7 +327,7 @@ class TestUINavigation:
 # Category 2: Calculation/Data Accuracy Tests
 # =============================================================================
 
-class TestCalculationAccuracy:
+class TestCalculationAccuracy(SharedContextPages):
     """Tests for correct totals, counts, and percentages."""
 
     def test_unfiltered_total_spending(self, page: Page, report_path):
@@ -327,7 +408,26 @@ class TestCalculationAccuracy:
 # Category 3: Edge Cases and Complex Calculations
 # =============================================================================
 
-@pytest.fixture(scope="module")
+# Edge case transactions: (Date, Description, Amount)
+EDGE_CASE_ROWS = [
+    ("01/05/2024", "AMAZON MARKETPLACE", "200.00"),
+    ("01/10/2024", "AMAZON REFUND", "-100.00"),
+    ("01/15/2024", "WHOLE FOODS MARKET", "300.00"),
+    ("01/20/2024", "STARBUCKS", "50.00"),
+    ("02/01/2024", "TARGET", "400.00"),
+    ("02/05/2024", "TARGET REFUND", "-50.00"),
+    ("02/10/2024", "WHOLE FOODS MARKET", "350.00"),
+    ("02/15/2024", "NETFLIX", "15.00"),
+    ("02/20/2024", "SPOTIFY", "10.00"),
+    ("03/01/2024", "AMAZON MARKETPLACE", "450.00"),
+    ("03/05/2024", "STARBUCKS", "75.00"),
+    ("03/10/2024", "WHOLE FOODS MARKET", "400.00"),
+    ("03/15/2024", "PAYROLL DEPOSIT", "-3000.00"),
+    ("03/20/2024", "TRANSFER TO SAVINGS", "-500.00"),
+]
+
+
+@pytest.fixture(scope="session")
 def edge_case_report_path(tmp_path_factory):
     """Generate a test report with edge case data.
 
@@ -352,34 +452,12 @@ def edge_case_report_path(tmp_path_factory):
     - Transfers: $500
     - Cash flow: $3,000 - $2,100 - $500 = $400
     """
-    tmp_dir = tmp_path_factory.mktemp("edge_case_test")
-    config_dir = tmp_dir / "config"
-    data_dir = tmp_dir / "data"
-    output_dir = tmp_dir / "output"
-
-    config_dir.mkdir()
-    data_dir.mkdir()
-    output_dir.mkdir()
-
     # Create test CSV with edge cases
-    # Format: Date, Description, Amount
-    csv_content = """Date,Description,Amount
-01/05/2024,AMAZON MARKETPLACE,200.00
-01/10/2024,AMAZON REFUND,-100.00
-01/15/2024,WHOLE FOODS MARKET,300.00
-01/20/2024,STARBUCKS,50.00
-02/01/2024,TARGET,400.00
-02/05/2024,TARGET REFUND,-50.00
-02/10/2024,WHOLE FOODS MARKET,350.00
-02/15/2024,NETFLIX,15.00
-02/20/2024,SPOTIFY,10.00
-03/01/2024,AMAZON MARKETPLACE,450.00
-03/05/2024,STARBUCKS,75.00
-03/10/2024,WHOLE FOODS MARKET,400.00
-03/15/2024,PAYROLL DEPOSIT,-3000.00
-03/20/2024,TRANSFER TO SAVINGS,-500.00
-"""
-    (data_dir / "transactions.csv").write_text(csv_content)
+    csv_file = io.StringIO()
+    writer = csv.writer(csv_file, lineterminator="\n")
+    writer.writerow(("Date", "Description", "Amount"))
+    writer.writerows(EDGE_CASE_ROWS)
+    csv_content = csv_file.getvalue()
 
     # Create settings
     settings_content = """year: 2024
@@ -391,7 +469,6 @@ data_sources:
 
 merchants_file: config/merchants.rules
 """
-    (config_dir / "settings.yaml").write_text(settings_content)
 
     # Create merchants rules with refund and income/transfer tags
     # Note: More specific rules must come first (refunds before general)
@@ -452,43 +529,81 @@ category: Transfers
 subcategory: Savings
 tags: transfer
 """
-    (config_dir / "merchants.rules").write_text(rules_content)
 
-    # Generate the report
-    report_file = output_dir / "report.html"
-    result = subprocess.run(
-        ["uv", "run", "tally", "run", "-o", str(report_file), str(config_dir)],
-        capture_output=True,
-        text=True,
-        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return _build_report(
+        tmp_path_factory, "edge_case_test", settings_content, rules_content,
+        {"transactions.csv": csv_content}
     )
 
-    if result.returncode != 0:
-        pytest.fail(f"Failed to generate report: {result.stderr}")
 
-    return str(report_file)
+def _wait_for_chart(page, canvas_index=0):
+    """Wait until Chart.js has drawn a chart on the given canvas."""
+    page.wait_for_function(
+        """index => {
+            const canvas = document.querySelectorAll('canvas')[index];
+            return canvas && typeof Chart !== 'undefined' && Chart.getChart(canvas);
+        }""",
+        arg=canvas_index,
+        timeout=5000,
+    )
+
+
+@pytest.fixture(scope="class")
+def edge_case_page(class_context, edge_case_report_path):
+    """The edge case report, loaded once for tests that only read it."""
+    return _open_report(class_context, edge_case_report_path)
+
 
+@pytest.fixture(scope="class")
+def edge_case_charts(edge_case_page):
+    """Chart.js data from the edge case report, read in one round-trip.
 
-class TestEdgeCasesAndCalculations:
+    'monthly' is the monthly spending chart (first canvas) and 'byCategory'
+    the category pie chart (second canvas). Each maps to {byLabel, labels,
+    data}, or {error} if the chart couldn't be found.
+    """
+    _wait_for_chart(edge_case_page)
+    _wait_for_chart(edge_case_page, canvas_index=1)
+    return edge_case_page.evaluate("""() => {
+        const canvases = document.querySelectorAll('canvas');
+        const read = (index, name) => {
+            const canvas = canvases[index];
+            if (!canvas) return { error: `No ${name} canvas found` };
+
+            // Chart.js 3+ keeps the chart instance keyed by its canvas
+            const chartInstance = Chart.getChart(canvas);
+            if (!chartInstance) return { error: `No ${name} chart instance found` };
+
+            const labels = chartInstance.data.labels;
+            const data = chartInstance.data.datasets[0].data;
+            const byLabel = {};
+            labels.forEach((label, idx) => {
+                byLabel[label] = data[idx];
+            });
+            return { byLabel, labels, data };
+        };
+        return { monthly: read(0, 'monthly'), byCategory: read(1, 'pie') };
+    }""")
+
+
+class TestEdgeCasesAndCalculations(SharedContextPages):
     """Tests for edge cases: refunds, cash flow, percentages, monthly averages."""
 
     # -------------------------------------------------------------------------
     # Credits/Refunds Section Tests
     # -------------------------------------------------------------------------
 
-    def test_credits_shown_in_cashflow_summary(self, page: Page, edge_case_report_path):
+    def test_credits_shown_in_cashflow_summary(self, edge_case_page: Page):
         """Credits are shown in the cash flow summary card."""
-        page.goto(f"file://{edge_case_report_path}")
         # Credits should appear in cash flow breakdown
-        cashflow_card = page.get_by_test_id("cashflow-card")
+        cashflow_card = edge_case_page.get_by_test_id("cashflow-card")
         credits_item = cashflow_card.locator(".breakdown-item", has_text="Credits")
         expect(credits_item).to_be_visible()
 
-    def test_credits_amount_positive_in_summary(self, page: Page, edge_case_report_path):
+    def test_credits_amount_positive_in_summary(self, edge_case_page: Page):
         """Credits are displayed as positive amounts in the summary card."""
-        page.goto(f"file://{edge_case_report_path}")
         # Credits should show with + prefix (refunds reduce spending)
-        cashflow_card = page.get_by_test_id("cashflow-card")
+        cashflow_card = edge_case_page.get_by_test_id("cashflow-card")
         credits_value = cashflow_card.locator(".breakdown-item", has_text="Credits").locator(".value")
         expect(credits_value).to_contain_text("+")
 
@@ -496,42 +611,38 @@ class TestEdgeCasesAndCalculations:
     # Cash Flow Calculation Tests
     # -------------------------------------------------------------------------
 
-    def test_income_total_displayed(self, page: Page, edge_case_report_path):
+    def test_income_total_displayed(self, edge_case_page: Page):
         """Income is shown in the cash flow card breakdown."""
-        page.goto(f"file://{edge_case_report_path}")
         # Income: $3,000 (payroll) - shown as breakdown item in cashflow card
-        cashflow_card = page.get_by_test_id("cashflow-card")
+        cashflow_card = edge_case_page.get_by_test_id("cashflow-card")
         expect(cashflow_card.locator(".income-label")).to_be_visible()
         expect(cashflow_card.locator("text=$3,000")).to_be_visible()
 
-    def test_transfers_in_filtered_view(self, page: Page, edge_case_report_path):
+    def test_transfers_in_filtered_view(self, edge_case_page: Page):
         """Transfers appear in filtered view card breakdown."""
-        page.goto(f"file://{edge_case_report_path}")
         # Transfers show in the filtered view card (no separate transfers card)
-        filtered_card = page.get_by_test_id("filtered-spending-card")
+        filtered_card = edge_case_page.get_by_test_id("filtered-spending-card")
         expect(filtered_card).to_be_visible()
 
-    def test_cash_flow_calculation(self, page: Page, edge_case_report_path):
+    def test_cash_flow_calculation(self, edge_case_page: Page):
         """Net cash flow = income - spending (transfers excluded, they just move money)."""
-        page.goto(f"file://{edge_case_report_path}")
         # Cash flow: $3,000 - $2,100 = $900
         # Note: spending is net of refunds ($2,250 - $150 = $2,100)
         # Transfers are excluded since they just move money between accounts
-        expect(page.get_by_test_id("cashflow-amount")).to_contain_text("$900")
+        expect(edge_case_page.get_by_test_id("cashflow-amount")).to_contain_text("$900")
 
     # -------------------------------------------------------------------------
     # Excluded Transaction Tests
     # Note: When income exists, cash flow card is shown instead of excluded card
     # -------------------------------------------------------------------------
 
-    def test_income_shown_in_cashflow_card(self, page: Page, edge_case_report_path):
+    def test_income_shown_in_cashflow_card(self, edge_case_page: Page):
         """Cash flow card shows income in breakdown."""
-        page.goto(f"file://{edge_case_report_path}")
         # Cash flow card should be visible with income breakdown
-        expect(page.get_by_test_id("cashflow-card")).to_be_visible()
-        expect(page.get_by_test_id("cashflow-card").locator(".income-label")).to_be_visible()
+        expect(edge_case_page.get_by_test_id("cashflow-card")).to_be_visible()
+        expect(edge_case_page.get_by_test_id("cashflow-card").locator(".income-label")).to_be_visible()
         # Filtered view card should also be visible
-        expect(page.get_by_test_id("filtered-spending-card")).to_be_visible()
+        expect(edge_case_page.get_by_test_id("filtered-spending-card")).to_be_visible()
 
     def test_income_clickable_adds_filter(self, page: Page, edge_case_report_path):
         """Clicking income in cash flow card adds an income tag filter."""
@@ -545,57 +656,52 @@ class TestEdgeCasesAndCalculations:
     # Monthly Average Tests (shown in category section headers)
     # -------------------------------------------------------------------------
 
-    def test_category_monthly_average_displayed(self, page: Page, edge_case_report_path):
+    def test_category_monthly_average_displayed(self, edge_case_page: Page):
         """Category sections show monthly average (total / numMonths)."""
-        page.goto(f"file://{edge_case_report_path}")
         # Food category: $1,175 / 3 months = $392/mo
-        food_section = page.get_by_test_id("section-cat-Food")
+        food_section = edge_case_page.get_by_test_id("section-cat-Food")
         expect(food_section.locator(".section-monthly")).to_contain_text("$392/mo")
 
-    def test_monthly_average_updates_with_month_filter(self, page: Page, edge_case_report_path):
+    def test_monthly_average_updates_with_month_filter(self, edge_case_page: Page):
         """Monthly averages recalculate when filtering to specific month."""
-        page.goto(f"file://{edge_case_report_path}")
 
         # Click on monthly chart to filter to a specific month
         # The chart allows clicking on bars to add month filters
         # For now, just verify the section header shows /mo format
-        food_section = page.get_by_test_id("section-cat-Food")
+        food_section = edge_case_page.get_by_test_id("section-cat-Food")
         expect(food_section.locator(".section-monthly")).to_be_visible()
 
     # -------------------------------------------------------------------------
     # Percentage Calculation Tests
     # -------------------------------------------------------------------------
 
-    def test_category_percentage_displayed(self, page: Page, edge_case_report_path):
+    def test_category_percentage_displayed(self, edge_case_page: Page):
         """Category sections show percentage of total spending."""
-        page.goto(f"file://{edge_case_report_path}")
         # Food category should show a percentage
-        food_section = page.get_by_test_id("section-cat-Food")
+        food_section = edge_case_page.get_by_test_id("section-cat-Food")
         # Look for percentage pattern like "(XX.X%)"
         expect(food_section.locator(".section-pct")).to_be_visible()
 
-    def test_category_percentages_sum_to_100(self, page: Page, edge_case_report_path):
+    def test_category_percentages_sum_to_100(self, edge_case_page: Page):
         """Spending category percentages sum to approximately 100%.
 
         Percentages are calculated against grossSpending for spending portions only.
         Income/investment portions have their own percentages (labeled "income"/"invest").
         """
-        page.goto(f"file://{edge_case_report_path}")
-        import re
-        # Get all percentage values from positive category sections
-        pct_elements = page.locator("[data-testid^='section-cat-'] .section-pct").all()
-        spending_percentages = []
-        for el in pct_elements:
-            text = el.inner_text()
-            if "%" in text:
-                # Find all percentage patterns - spending ones don't have "income" or "invest" label
-                # Format: "(X%)" for spending, "(Y% income)" for income, "(Z% invest)" for investment
-                for match in re.finditer(r'\(([\d.]+)%([^)]*)\)', text):
-                    pct = float(match.group(1))
-                    label = match.group(2).strip()
-                    # Only sum spending percentages (no label)
-                    if not label:
-                        spending_percentages.append(pct)
+        # Collect all percentages from category sections in one round-trip.
+        # Spending ones don't have an "income" or "invest" label.
+        # Format: "(X%)" for spending, "(Y% income)" for income, "(Z% invest)" for investment
+        spending_percentages = edge_case_page.evaluate("""() => {
+            const out = [];
+            const re = /\\(([\\d.]+)%([^)]*)\\)/g;
+            for (const el of document.querySelectorAll("[data-testid^='section-cat-'] .section-pct")) {
+                for (const m of el.innerText.matchAll(re)) {
+                    // Only sum spending percentages (no label)
+                    if (!m[2].trim()) out.push(parseFloat(m[1]));
+                }
+            }
+            return out;
+        }""")
 
         # Verify we have spending percentages
         assert len(spending_percentages) >= 3, f"Expected at least 3 spending categories, got {len(spending_percentages)}"
@@ -606,18 +712,14 @@ class TestEdgeCasesAndCalculations:
         total_pct = sum(spending_percentages)
         assert 99 <= total_pct <= 101, f"Spending percentages sum to {total_pct}%, expected ~100%"
 
-    def test_merchant_percentage_within_category(self, page: Page, edge_case_report_path):
+    def test_merchant_percentage_within_category(self, edge_case_page: Page):
         """Merchant percentages within a category sum to 100%."""
-        page.goto(f"file://{edge_case_report_path}")
-        # Check Food category merchants
-        food_section = page.get_by_test_id("section-cat-Food")
-        pct_cells = food_section.locator("td.pct").all()
+        # Check Food category merchants, reading every cell in one round-trip
+        pct_texts = edge_case_page.get_by_test_id("section-cat-Food").locator("td.pct").all_inner_texts()
         total_pct = 0
-        for el in pct_cells:
-            text = el.inner_text()
+        for text in pct_texts:
             if "%" in text and text != "100%":  # Skip total row
-                import re
-                match = re.search(r'([\d.]+)%', text)
+                match = _PCT_SIMPLE.search(text)
                 if match:
                     total_pct += float(match.group(1))
 
@@ -628,34 +730,30 @@ class TestEdgeCasesAndCalculations:
     # Category Total = Sum of Merchants Tests
     # -------------------------------------------------------------------------
 
-    def test_category_total_matches_merchant_sum(self, page: Page, edge_case_report_path):
+    def test_category_total_matches_merchant_sum(self, edge_case_page: Page):
         """Category total equals sum of its merchant totals."""
-        page.goto(f"file://{edge_case_report_path}")
         # Food category: Whole Foods ($1,050) + Starbucks ($125) = $1,175
-        food_section = page.get_by_test_id("section-cat-Food")
+        food_section = edge_case_page.get_by_test_id("section-cat-Food")
         expect(food_section.locator(".section-ytd")).to_contain_text("$1,175")
 
-    def test_grand_total_matches_category_sum(self, page: Page, edge_case_report_path):
+    def test_grand_total_matches_category_sum(self, edge_case_page: Page):
         """Grand total equals sum of all category totals."""
-        page.goto(f"file://{edge_case_report_path}")
         # Shopping: $200 + $400 + $450 = $1,050 (Amazon + Target)
         # Food: $1,175
         # Subscriptions: $25
         # Total positive spending: $1,050 + $1,175 + $25 = $2,250
         # The filtered view card shows total spending
-        expect(page.get_by_test_id("filtered-spending-card")).to_be_visible()
+        expect(edge_case_page.get_by_test_id("filtered-spending-card")).to_be_visible()
 
     # -------------------------------------------------------------------------
     # Sorting Tests
     # -------------------------------------------------------------------------
 
-    def test_sort_by_total_descending_default(self, page: Page, edge_case_report_path):
+    def test_sort_by_total_descending_default(self, edge_case_page: Page):
         """Merchants are sorted by total descending by default."""
-        page.goto(f"file://{edge_case_report_path}")
         # In Food category, Whole Foods ($1,050) should be before Starbucks ($125)
-        food_section = page.get_by_test_id("section-cat-Food")
-        rows = food_section.locator(".merchant-row").all()
-        first_merchant = rows[0].locator(".merchant-name").inner_text()
+        food_section = edge_case_page.get_by_test_id("section-cat-Food")
+        first_merchant = food_section.locator(".merchant-row").first.locator(".merchant-name").inner_text()
         assert "Whole Foods" in first_merchant
 
     def test_sort_by_name_ascending(self, page: Page, edge_case_report_path):
@@ -665,8 +763,7 @@ class TestEdgeCasesAndCalculations:
         # Click the Merchant header to sort by name
         food_section.locator("th", has_text="Merchant").click()
         # Now Starbucks should be first (alphabetically before Whole Foods)
-        rows = food_section.locator(".merchant-row").all()
-        first_merchant = rows[0].locator(".merchant-name").inner_text()
+        first_merchant = food_section.locator(".merchant-row").first.locator(".merchant-name").inner_text()
         assert "Starbucks" in first_merchant
 
     def test_sort_by_count(self, page: Page, edge_case_report_path):
@@ -676,8 +773,7 @@ class TestEdgeCasesAndCalculations:
         # Click Count header
         food_section.locator("th", has_text="Count").click()
         # Both have 2-3 transactions, verify sort happened
-        rows = food_section.locator(".merchant-row").all()
-        assert len(rows) >= 2
+        assert food_section.locator(".merchant-row").count() >= 2
 
     # -------------------------------------------------------------------------
     # Filter Interaction with Calculations
@@ -687,24 +783,29 @@ class TestEdgeCasesAndCalculations:
         """Applying a filter updates totals, percentages, and averages consistently."""
         page.goto(f"file://{edge_case_report_path}")
 
-        # Get initial total from filtered view card
-        initial_total = page.get_by_test_id("filtered-amount").inner_text()
-
-        # Filter to Food category only by clicking a merchant
-        page.get_by_test_id("section-cat-Food").locator(".merchant-name").first.click()
+        # Filter to Whole Foods, the first (largest) merchant in Food
+        food_section = page.get_by_test_id("section-cat-Food")
+        food_section.locator(".merchant-name").first.click()
+        expect(page.get_by_test_id("filter-chip")).to_be_visible()
 
-        # Wait for filter to apply
-        page.wait_for_timeout(100)
+        # Filtered view card: Whole Foods only, $300 + $350 + $400 = $1,050
+        # across 3 transactions (no income, so net is plain spending)
+        filtered_card = page.get_by_test_id("filtered-spending-card")
+        expect(page.get_by_test_id("filtered-amount")).to_have_text("$1,050")
+        expect(
+            filtered_card.locator(".breakdown-item", has_text="Transactions").locator(".value")
+        ).to_have_text("3")
 
-        # Verify the total changed (now showing only that merchant)
-        # This confirms filtering affects calculations
-        # The specific value depends on what merchant was clicked
+        # Food section total and merchant percentage follow the filter:
+        # Whole Foods is now 100% of the filtered Food total, not 89.4%
+        expect(food_section.locator(".section-ytd")).to_have_text("$1,050")
+        expect(food_section.locator("td.pct")).to_have_text(["100.0%"])
 
     # -------------------------------------------------------------------------
     # Chart Aggregation Bug Tests
     # -------------------------------------------------------------------------
 
-    def test_chart_aggregations_exclude_negative_amounts(self, page: Page, edge_case_report_path):
+    def test_chart_aggregations_exclude_negative_amounts(self, edge_case_charts):
         """Monthly spending chart should only include positive amounts.
 
         Bug: chartAggregations sums ALL transaction amounts including negative ones
@@ -719,37 +820,13 @@ class TestEdgeCasesAndCalculations:
         Correct January total (positive only): $550
         Buggy January total (all amounts): $450
         """
-        page.goto(f"file://{edge_case_report_path}")
-        page.wait_for_timeout(500)  # Wait for Vue and Chart.js to initialize
-
-        # Access the Chart.js instance data from the monthly chart canvas
-        result = page.evaluate("""() => {
-            // Chart.js stores chart instance as a property on canvas
-            const canvas = document.querySelector('canvas');
-            if (!canvas) return { error: 'No canvas found' };
-
-            // Chart.js 3+ stores instance in Chart.instances or on element
-            const chartInstance = Chart.getChart(canvas);
-            if (!chartInstance) return { error: 'No chart instance found' };
-
-            // Get the data from the chart
-            const labels = chartInstance.data.labels;
-            const data = chartInstance.data.datasets[0].data;
-
-            // Return as object with month labels as keys
-            const byMonth = {};
-            labels.forEach((label, idx) => {
-                byMonth[label] = data[idx];
-            });
-            return { byMonth, labels, data };
-        }""")
-
+        result = edge_case_charts['monthly']
         if 'error' in result:
             pytest.fail(f"Could not access chart data: {result['error']}")
 
         # January should show $550 (positive amounts only), not $450 (with refund subtracted)
         # The month label format is "Jan 2024"
-        january_total = result['byMonth'].get('Jan 2024', 0)
+        january_total = result['byLabel'].get('Jan 2024', 0)
 
         # This assertion documents the expected behavior after the fix:
         # Only positive amounts should be included in the chart
@@ -761,7 +838,7 @@ class TestEdgeCasesAndCalculations:
             f"Chart data: {result}"
         )
 
-    def test_chart_category_totals_exclude_negative_amounts(self, page: Page, edge_case_report_path):
+    def test_chart_category_totals_exclude_negative_amounts(self, edge_case_charts):
         """Category totals in chart should only include positive amounts.
 
         Bug: chartAggregations.byCategory sums ALL transaction amounts including
@@ -769,34 +846,11 @@ class TestEdgeCasesAndCalculations:
 
         Fixture Refunds category total: -$150 (should NOT appear in chart data)
         """
-        page.goto(f"file://{edge_case_report_path}")
-        page.wait_for_timeout(500)
-
-        # Access the category pie chart data
-        result = page.evaluate("""() => {
-            // Find the pie chart canvas (second canvas)
-            const canvases = document.querySelectorAll('canvas');
-            if (canvases.length < 2) return { error: 'Pie chart canvas not found' };
-
-            const pieCanvas = canvases[1];  // Pie chart is second
-            const chartInstance = Chart.getChart(pieCanvas);
-            if (!chartInstance) return { error: 'No pie chart instance found' };
-
-            // Get category labels and values
-            const labels = chartInstance.data.labels;
-            const data = chartInstance.data.datasets[0].data;
-
-            const byCategory = {};
-            labels.forEach((label, idx) => {
-                byCategory[label] = data[idx];
-            });
-            return { byCategory, labels, data };
-        }""")
-
+        result = edge_case_charts['byCategory']
         if 'error' in result:
             pytest.fail(f"Could not access pie chart data: {result['error']}")
 
-        by_category = result['byCategory']
+        by_category = result['byLabel']
 
         # Refunds category should NOT be in chart data (all negative amounts)
         # or if present, should have 0 value (not -150)
@@ -812,7 +866,7 @@ class TestEdgeCasesAndCalculations:
 # Autocomplete Category/Subcategory Tests
 # =============================================================================
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def category_subcategory_report_path(tmp_path_factory):
     """Generate a test report with varied categories and subcategories.
 
@@ -820,15 +874,6 @@ def category_subcategory_report_path(tmp_path_factory):
     - Top-level categories (Food, Transport, Subscriptions)
     - Subcategories (Grocery, Coffee, Gas, Rideshare, Streaming, Music)
     """
-    tmp_dir = tmp_path_factory.mktemp("category_subcat_test")
-    config_dir = tmp_dir / "config"
-    data_dir = tmp_dir / "data"
-    output_dir = tmp_dir / "output"
-
-    config_dir.mkdir()
-    data_dir.mkdir()
-    output_dir.mkdir()
-
     csv_content = """Date,Description,Amount
 01/05/2025,WHOLEFDS MKT 123,85.50
 01/08/2025,TRADER JOE 456,65.00
@@ -839,7 +884,6 @@ def category_subcategory_report_path(tmp_path_factory):
 02/01/2025,SPOTIFY PREMIUM,9.99
 02/05/2025,AMAZON PURCHASE,75.00
 """
-    (data_dir / "transactions.csv").write_text(csv_content)
 
     settings_content = """year: 2025
 
@@ -850,7 +894,6 @@ data_sources:
 
 merchants_file: config/merchants.rules
 """
-    (config_dir / "settings.yaml").write_text(settings_content)
 
     # Categories: Food, Transport, Subscriptions, Shopping
     # Subcategories: Grocery, Coffee, Gas, Rideshare, Streaming, Music
@@ -894,20 +937,14 @@ match: contains("AMAZON")
 category: Shopping
 subcategory: Shopping
 """
-    (config_dir / "merchants.rules").write_text(rules_content)
-
-    # Generate report
-    report_path = output_dir / "spending.html"
-    subprocess.run(
-        ["uv", "run", "tally", "run", "--format", "html", "-o", str(report_path), str(config_dir)],
-        check=True,
-        capture_output=True
-    )
 
-    return str(report_path)
+    return _build_report(
+        tmp_path_factory, "category_subcat_test", settings_content, rules_content,
+        {"transactions.csv": csv_content}, "--format", "html"
+    )
 
 
-class TestAutocompleteCategories:
+class TestAutocompleteCategories(SharedContextPages):
     """Tests for autocomplete category/subcategory distinction."""
 
     def test_autocomplete_shows_category_type(self, page: Page, category_subcategory_report_path):
@@ -919,9 +956,6 @@ class TestAutocompleteCategories:
         search.click()
         search.fill("Food")
 
-        # Wait for autocomplete
-        page.wait_for_timeout(100)
-
         # Check that Food appears with 'category' type
         # Use .type.category to find items with category badge
         autocomplete = page.locator(".autocomplete-list")
@@ -937,8 +971,6 @@ class TestAutocompleteCategories:
         search.click()
         search.fill("Gro")  # Should match "Food > Grocery" subcategory
 
-        page.wait_for_timeout(100)
-
         autocomplete = page.locator(".autocomplete-list")
         # Find item with subcategory badge showing "Food > Grocery"
         grocery_item = autocomplete.locator(".autocomplete-item:has(.type.subcategory)", has_text="Food > Grocery")
@@ -955,13 +987,11 @@ class TestAutocompleteCategories:
         # Search for "Shop" - should show Shopping as category
         search.click()
         search.fill("Shop")
-        page.wait_for_timeout(100)
         shopping_item = autocomplete.locator(".autocomplete-item:has(.type.category)", has_text="Shopping")
         expect(shopping_item).to_be_visible()
 
         # Search for "Stream" - should show Streaming as subcategory (with parent)
         search.fill("Stream")
-        page.wait_for_timeout(100)
         streaming_item = autocomplete.locator(".autocomplete-item:has(.type.subcategory)", has_text="Streaming")
         expect(streaming_item).to_be_visible()
 
@@ -973,15 +1003,11 @@ class TestAutocompleteCategories:
         search.click()
         search.fill("Grocery")
 
-        page.wait_for_timeout(100)
-
         # Click the Grocery subcategory item (has .type.subcategory)
         autocomplete = page.locator(".autocomplete-list")
         grocery_item = autocomplete.locator(".autocomplete-item:has(.type.subcategory)", has_text="Grocery")
         grocery_item.click()
 
-        page.wait_for_timeout(100)
-
         # Check filter chip exists with subcategory class and 'sc' prefix
         filter_chips = page.get_by_test_id("filter-chips")
         chip = filter_chips.locator(".filter-chip.subcategory")
@@ -996,15 +1022,11 @@ class TestAutocompleteCategories:
         search.click()
         search.fill("Transport")
 
-        page.wait_for_timeout(100)
-
         # Click the Transport category item (has .type.category)
         autocomplete = page.locator(".autocomplete-list")
         transport_item = autocomplete.locator(".autocomplete-item:has(.type.category)", has_text="Transport")
         transport_item.click()
 
-        page.wait_for_timeout(100)
-
         # Check filter chip exists with category class and 'c' prefix
         filter_chips = page.get_by_test_id("filter-chips")
         chip = filter_chips.locator(".filter-chip.category")
@@ -1019,15 +1041,11 @@ class TestAutocompleteCategories:
         search.click()
         search.fill("Grocery")
 
-        page.wait_for_timeout(100)
-
         # Click the Grocery subcategory
         autocomplete = page.locator(".autocomplete-list")
         grocery_item = autocomplete.locator(".autocomplete-item:has(.type.subcategory)", has_text="Grocery")
         grocery_item.click()
 
-        page.wait_for_timeout(200)
-
         # Should only show Whole Foods and Trader Joes (both in Grocery subcategory)
         # Starbucks (Coffee subcategory) should not be visible
         expect(page.locator(".merchant-row", has_text="Whole Foods")).to_be_visible()
@@ -1042,45 +1060,33 @@ class TestAutocompleteCategories:
         search.click()
         search.fill("Shopping")
 
-        page.wait_for_timeout(100)
-
         autocomplete = page.locator(".autocomplete-list")
         # Shopping should appear as category (with .type.category badge)
-        category_items = autocomplete.locator(".autocomplete-item:has(.type.category)", has_text="Shopping").all()
-        assert len(category_items) == 1
+        category_items = autocomplete.locator(".autocomplete-item:has(.type.category)", has_text="Shopping")
+        expect(category_items).to_have_count(1)
 
         # Shopping should NOT appear as subcategory
-        subcategory_items = autocomplete.locator(".autocomplete-item:has(.type.subcategory)", has_text="Shopping").all()
-        assert len(subcategory_items) == 0
+        subcategory_items = autocomplete.locator(".autocomplete-item:has(.type.subcategory)", has_text="Shopping")
+        expect(subcategory_items).to_have_count(0)
 
 
 # =============================================================================
 # Category 5: Extra Fields Search Tests
 # =============================================================================
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def extra_fields_report_path(tmp_path_factory):
     """Generate a report with extra_fields data for search testing.
 
     Uses supplemental data source pattern (like investment trades) to add
     extra_fields via let: + field: directives.
     """
-    tmp_dir = tmp_path_factory.mktemp("extra_fields_test")
-    config_dir = tmp_dir / "config"
-    data_dir = tmp_dir / "data"
-    output_dir = tmp_dir / "output"
-
-    config_dir.mkdir()
-    data_dir.mkdir()
-    output_dir.mkdir()
-
     # Main transactions CSV
     csv_content = """Date,Description,Amount
 01/15/2024,COSTCO WHOLESALE,287.45
 01/20/2024,TARGET STORE,156.78
 02/01/2024,AMAZON MARKETPLACE,89.99
 """
-    (data_dir / "transactions.csv").write_text(csv_content)
 
     # Supplemental data: receipt items matched by amount
     items_content = """date,amount,item
@@ -1091,7 +1097,6 @@ def extra_fields_report_path(tmp_path_factory):
 01/20/2024,156.78,Baby Wipes
 01/20/2024,156.78,Coffee K-Cups
 """
-    (data_dir / "items.csv").write_text(items_content)
 
     # Create settings with supplemental source
     settings_content = """year: 2024
@@ -1110,7 +1115,6 @@ data_sources:
 
 merchants_file: config/merchants.rules
 """
-    (config_dir / "settings.yaml").write_text(settings_content)
 
     # Rules that query supplemental data to add extra_fields
     rules_content = """[Costco]
@@ -1133,24 +1137,14 @@ match: contains("AMAZON")
 category: Shopping
 subcategory: Online
 """
-    (config_dir / "merchants.rules").write_text(rules_content)
 
-    # Generate the report
-    report_file = output_dir / "report.html"
-    result = subprocess.run(
-        ["uv", "run", "tally", "run", "-o", str(report_file), str(config_dir)],
-        capture_output=True,
-        text=True,
-        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return _build_report(
+        tmp_path_factory, "extra_fields_test", settings_content, rules_content,
+        {"transactions.csv": csv_content, "items.csv": items_content}
     )
 
-    if result.returncode != 0:
-        pytest.fail(f"Failed to generate report: {result.stderr}")
-
-    return str(report_file)
-
 
-class TestExtraFieldsSearch:
+class TestExtraFieldsSearch(SharedContextPages):
     """Tests for searching extra_fields values.
 
     Uses URL hash #s:text to trigger text search filters.
@@ -1174,9 +1168,6 @@ class TestExtraFieldsSearch:
         # Wait for filter to be applied
         expect(page.get_by_test_id("filter-chip")).to_be_visible()
 
-        # Wait for Vue to process the watch and expand merchants
-        page.wait_for_timeout(500)
-
         # Transaction row should be visible (merchant expanded)
         # The description appears in the expanded transaction detail
         expect(page.locator(".txn-desc >> text=COSTCO WHOLESALE").first).to_be_visible()
@@ -1188,9 +1179,6 @@ class TestExtraFieldsSearch:
         # Wait for filter to be applied
         expect(page.get_by_test_id("filter-chip")).to_be_visible()
 
-        # Wait for Vue to process the watch and expand merchants
-        page.wait_for_timeout(500)
-
         # The extra-fields trigger should have match-highlight class
         trigger = page.locator(".extra-fields-trigger.match-highlight")
         expect(trigger).to_be_visible()
@@ -1215,9 +1203,6 @@ class TestExtraFieldsSearch:
         # Clear filter
         page.get_by_test_id("filter-chip-remove").first.click()
 
-        # Wait for filter to be cleared
-        page.wait_for_timeout(300)
-
         # All merchants should be visible again
         expect(page.get_by_test_id("merchant-row-Costco")).to_be_visible()
         expect(page.get_by_test_id("merchant-row-Target")).to_be_visible()
@@ -1228,7 +1213,7 @@ class TestExtraFieldsSearch:
 # Currency Formatting Tests (Issue #63)
 # =============================================================================
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def currency_format_report_path(tmp_path_factory):
     """Generate a test report with non-USD currency format (British Pounds).
 
@@ -1237,15 +1222,6 @@ def currency_format_report_path(tmp_path_factory):
     - Merchant totals
     - Chart Y-axis labels
     """
-    tmp_dir = tmp_path_factory.mktemp("currency_format_test")
-    config_dir = tmp_dir / "config"
-    data_dir = tmp_dir / "data"
-    output_dir = tmp_dir / "output"
-
-    config_dir.mkdir()
-    data_dir.mkdir()
-    output_dir.mkdir()
-
     csv_content = """Date,Description,Amount
 01/05/2025,TESCO EXPRESS 123,85.50
 01/08/2025,SAINSBURYS 456,65.00
@@ -1255,7 +1231,6 @@ def currency_format_report_path(tmp_path_factory):
 02/01/2025,NETFLIX STREAMING,15.99
 02/05/2025,AMAZON UK,75.00
 """
-    (data_dir / "transactions.csv").write_text(csv_content)
 
     # Use British Pound currency format
     settings_content = """year: 2025
@@ -1269,8 +1244,6 @@ data_sources:
 
 merchants_file: config/merchants.rules
 """
-    # Must specify UTF-8 encoding for £ symbol to work on Windows
-    (config_dir / "settings.yaml").write_text(settings_content, encoding="utf-8")
 
     rules_content = """[Tesco]
 match: contains("TESCO")
@@ -1306,17 +1279,17 @@ subcategory: Streaming
 match: contains("AMAZON")
 category: Shopping
 """
-    (config_dir / "merchants.rules").write_text(rules_content)
-
-    # Generate report
-    report_path = output_dir / "spending.html"
-    subprocess.run(
-        ["uv", "run", "tally", "run", "--format", "html", "-o", str(report_path), str(config_dir)],
-        check=True,
-        capture_output=True
+
+    return _build_report(
+        tmp_path_factory, "currency_format_test", settings_content, rules_content,
+        {"transactions.csv": csv_content}, "--format", "html"
     )
 
-    return str(report_path)
+
+@pytest.fixture(scope="class")
+def currency_page(class_context, currency_format_report_path):
+    """The currency format report, loaded once; its tests only read it."""
+    return _open_report(class_context, currency_format_report_path)
 
 
 class TestCurrencyFormatting:
@@ -1328,12 +1301,10 @@ class TestCurrencyFormatting:
     - Chart Y-axis labels
     """
 
-    def test_dashboard_uses_currency_format(self, page: Page, currency_format_report_path):
+    def test_dashboard_uses_currency_format(self, currency_page: Page):
         """Dashboard total should use configured currency symbol (£)."""
-        page.goto(f"file://{currency_format_report_path}")
-
         # The cashflow amount should show £ symbol, not $
-        cashflow_amount = page.get_by_test_id("cashflow-amount")
+        cashflow_amount = currency_page.get_by_test_id("cashflow-amount")
         expect(cashflow_amount).to_be_visible()
         amount_text = cashflow_amount.text_content()
 
@@ -1341,25 +1312,22 @@ class TestCurrencyFormatting:
         assert "£" in amount_text, f"Expected £ in cashflow amount, got: {amount_text}"
         assert "$" not in amount_text, f"Found $ in cashflow amount, expected £: {amount_text}"
 
-    def test_merchant_amounts_use_currency_format(self, page: Page, currency_format_report_path):
+    def test_merchant_amounts_use_currency_format(self, currency_page: Page):
         """Merchant amounts should use configured currency symbol (£)."""
-        page.goto(f"file://{currency_format_report_path}")
-
         # Find a merchant row and check its total
-        merchant_total = page.get_by_test_id("merchant-total").first
+        merchant_total = currency_page.get_by_test_id("merchant-total").first
         expect(merchant_total).to_be_visible()
         amount_text = merchant_total.text_content()
 
         assert "£" in amount_text, f"Expected £ in merchant amount, got: {amount_text}"
         assert "$" not in amount_text, f"Found $ in merchant amount, expected £: {amount_text}"
 
-    def test_chart_yaxis_uses_currency_format(self, page: Page, currency_format_report_path):
+    def test_chart_yaxis_uses_currency_format(self, currency_page: Page):
         """Chart Y-axis should use configured currency symbol (£)."""
-        page.goto(f"file://{currency_format_report_path}")
-        page.wait_for_timeout(500)  # Wait for Chart.js to render
+        _wait_for_chart(currency_page)
 
         # Access the Chart.js instance and check Y-axis ticks
-        result = page.evaluate("""() => {
+        result = currency_page.evaluate("""() => {
             const canvas = document.querySelector('canvas');
             if (!canvas) return { error: 'No canvas found' };
 
@@ -1396,44 +1364,53 @@ class TestCurrencyFormatting:
 # Category 5: Grouping Toggle Tests
 # =============================================================================
 
-class TestGroupingToggle:
+def _view_button(page, mode):
+    """A button in the grouping view toggle: 'merchant', 'subcategory' or 'section'."""
+    return page.get_by_test_id(f"view-toggle-{mode}")
+
+
+@pytest.fixture(scope="class")
+def report_page(class_context, report_path):
+    """The main report, loaded once for tests that only read it."""
+    return _open_report(class_context, report_path)
+
+
+class TestGroupingToggle(SharedContextPages):
     """Tests for the merchant/subcategory grouping toggle."""
 
-    def test_group_toggle_exists(self, page: Page, report_path):
+    def test_group_toggle_exists(self, report_page: Page):
         """Group toggle buttons exist in category view."""
-        page.goto(f"file://{report_path}")
         # The view toggle should be visible (unified toggle with Merchant/Subcategory/View buttons)
-        view_toggle = page.locator(".view-toggle")
+        view_toggle = report_page.get_by_test_id("view-toggle")
         expect(view_toggle).to_be_visible()
 
-    def test_merchant_mode_is_default(self, page: Page, report_path):
+    def test_merchant_mode_is_default(self, report_page: Page):
         """Merchant grouping is the default mode."""
-        page.goto(f"file://{report_path}")
         # The "Merchant" button should be active by default
-        merchant_btn = page.locator(".view-toggle button", has_text="Merchant")
-        expect(merchant_btn).to_have_class(re.compile(r"active"))
+        merchant_btn = _view_button(report_page, "merchant")
+        expect(merchant_btn).to_have_class(_ACTIVE_RE)
 
     def test_toggle_to_subcategory_mode(self, page: Page, report_path):
         """Clicking Subcategory button switches to subcategory grouping."""
         page.goto(f"file://{report_path}")
 
         # Click subcategory button
-        subcategory_btn = page.locator(".view-toggle button", has_text="Subcategory")
+        subcategory_btn = _view_button(page, "subcategory")
         subcategory_btn.click()
 
         # Subcategory button should now be active
-        expect(subcategory_btn).to_have_class(re.compile(r"active"))
+        expect(subcategory_btn).to_have_class(_ACTIVE_RE)
 
         # Merchant button should not be active
-        merchant_btn = page.locator(".view-toggle button", has_text="Merchant")
-        expect(merchant_btn).not_to_have_class(re.compile(r"active"))
+        merchant_btn = _view_button(page, "merchant")
+        expect(merchant_btn).not_to_have_class(_ACTIVE_RE)
 
     def test_subcategory_mode_shows_subcategories(self, page: Page, report_path):
         """In subcategory mode, rows show subcategory names."""
         page.goto(f"file://{report_path}")
 
         # Switch to subcategory mode
-        subcategory_btn = page.locator(".view-toggle button", has_text="Subcategory")
+        subcategory_btn = _view_button(page, "subcategory")
         subcategory_btn.click()
 
         # Should see subcategory names in first column (Online, Grocery, etc.)
@@ -1446,15 +1423,15 @@ class TestGroupingToggle:
         page.goto(f"file://{report_path}")
 
         # Switch to subcategory mode
-        subcategory_btn = page.locator(".view-toggle button", has_text="Subcategory")
+        subcategory_btn = _view_button(page, "subcategory")
         subcategory_btn.click()
 
         # Switch back to merchant mode
-        merchant_btn = page.locator(".view-toggle button", has_text="Merchant")
+        merchant_btn = _view_button(page, "merchant")
         merchant_btn.click()
 
         # Merchant button should be active
-        expect(merchant_btn).to_have_class(re.compile(r"active"))
+        expect(merchant_btn).to_have_class(_ACTIVE_RE)
 
         # Should see merchant names again
         shopping_section = page.get_by_test_id("section-cat-Shopping")
@@ -1465,7 +1442,7 @@ class TestGroupingToggle:
         page.goto(f"file://{report_path}")
 
         # Switch to subcategory mode
-        subcategory_btn = page.locator(".view-toggle button", has_text="Subcategory")
+        subcategory_btn = _view_button(page, "subcategory")
         subcategory_btn.click()
 
         # The second column header should say "Merchants"
@@ -1487,7 +1464,7 @@ class TestGroupingToggle:
         page.goto(f"file://{report_path}")
 
         # Switch to subcategory mode
-        page.locator(".view-toggle button", has_text="Subcategory").click()
+        _view_button(page, "subcategory").click()
 
         # Click on "Online" subcategory in Shopping to expand
         shopping_section = page.get_by_test_id("section-cat-Shopping")
@@ -1502,7 +1479,7 @@ class TestGroupingToggle:
         page.goto(f"file://{report_path}")
 
         # Switch to subcategory mode
-        page.locator(".view-toggle button", has_text="Subcategory").click()
+        _view_button(page, "subcategory").click()
 
         # Online subcategory should show "1 merchant"
         shopping_section = page.get_by_test_id("section-cat-Shopping")
@@ -1514,7 +1491,7 @@ class TestGroupingToggle:
         page.goto(f"file://{report_path}")
 
         # Switch to subcategory mode
-        page.locator(".view-toggle button", has_text="Subcategory").click()
+        _view_button(page, "subcategory").click()
 
         # Click on the subcategory name (first cell) in Online row
         shopping_section = page.get_by_test_id("section-cat-Shopping")
@@ -1531,7 +1508,7 @@ class TestGroupingToggle:
         page.goto(f"file://{report_path}")
 
         # Switch to subcategory mode
-        page.locator(".view-toggle button", has_text="Subcategory").click()
+        _view_button(page, "subcategory").click()
 
         # Click on "1 merchant" in the second column
         shopping_section = page.get_by_test_id("section-cat-Shopping")
@@ -1548,21 +1525,12 @@ class TestGroupingToggle:
 # Category 6: Missing Subcategory Tests
 # =============================================================================
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def report_with_missing_subcategories(tmp_path_factory):
     """Generate a report where some merchants have no subcategory defined.
 
     Tests the 'Other' fallback behavior in subcategory grouping mode.
     """
-    tmp_dir = tmp_path_factory.mktemp("missing_subcategory_test")
-    config_dir = tmp_dir / "config"
-    data_dir = tmp_dir / "data"
-    output_dir = tmp_dir / "output"
-
-    config_dir.mkdir()
-    data_dir.mkdir()
-    output_dir.mkdir()
-
     # Create test CSV
     csv_content = """Date,Description,Amount
 01/05/2024,COSTCO WHOLESALE,150.00
@@ -1571,7 +1539,6 @@ def report_with_missing_subcategories(tmp_path_factory):
 01/15/2024,TARGET STORE,89.00
 01/18/2024,BESTBUY ELECTRONICS,299.99
 """
-    (data_dir / "transactions.csv").write_text(csv_content)
 
     # Create settings
     settings_content = """year: 2024
@@ -1584,7 +1551,6 @@ data_sources:
 
 merchants_file: config/merchants.rules
 """
-    (config_dir / "settings.yaml").write_text(settings_content)
 
     # Create merchants rules - some WITHOUT subcategory
     rules_content = """[Costco]
@@ -1610,24 +1576,14 @@ subcategory: Department Store
 match: normalized("BESTBUY")
 category: Electronics
 """
-    (config_dir / "merchants.rules").write_text(rules_content)
 
-    # Generate the report
-    report_file = output_dir / "report.html"
-    result = subprocess.run(
-        ["uv", "run", "tally", "run", "-o", str(report_file), str(config_dir)],
-        capture_output=True,
-        text=True,
-        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return _build_report(
+        tmp_path_factory, "missing_subcategory_test", settings_content, rules_content,
+        {"transactions.csv": csv_content}
     )
 
-    if result.returncode != 0:
-        pytest.fail(f"Failed to generate report: {result.stderr}")
-
-    return str(report_file)
 
-
-class TestMissingSubcategory:
+class TestMissingSubcategory(SharedContextPages):
     """Tests for merchants without subcategories."""
 
     def test_missing_subcategory_shows_other(self, page: Page, report_with_missing_subcategories):
@@ -1635,7 +1591,7 @@ class TestMissingSubcategory:
         page.goto(f"file://{report_with_missing_subcategories}")
 
         # Switch to subcategory mode
-        page.locator(".view-toggle button", has_text="Subcategory").click()
+        _view_button(page, "subcategory").click()
 
         # Electronics section (Best Buy has no subcategory)
         electronics_section = page.get_by_test_id("section-cat-Electronics")
@@ -1646,7 +1602,7 @@ class TestMissingSubcategory:
         page.goto(f"file://{report_with_missing_subcategories}")
 
         # Switch to subcategory mode
-        page.locator(".view-toggle button", has_text="Subcategory").click()
+        _view_button(page, "subcategory").click()
 
         # Retail has Target (Department Store) and Amazon (no subcategory -> Other)
         retail_section = page.get_by_test_id("section-cat-Retail")
@@ -1660,7 +1616,7 @@ class TestMissingSubcategory:
         # Should be in merchant mode by default
         # Best Buy row should have an empty subcategory cell
         electronics_section = page.get_by_test_id("section-cat-Electronics")
-        bestbuy_row = electronics_section.locator("tr", has_text="Best Buy")
+        bestbuy_row = electronics_section.get_by_test_id("merchant-row-Best Buy")
         # Second cell (subcategory) should be empty
         subcategory_cell = bestbuy_row.locator("td").nth(1)
         expect(subcategory_cell).to_have_text("")
@@ -1670,18 +1626,9 @@ class TestMissingSubcategory:
 # Category 7: Credits Display Tests
 # =============================================================================
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def report_with_credits(tmp_path_factory):
     """Generate a report with credits/refunds to test summary display."""
-    tmp_dir = tmp_path_factory.mktemp("credits_test")
-    config_dir = tmp_dir / "config"
-    data_dir = tmp_dir / "data"
-    output_dir = tmp_dir / "output"
-
-    config_dir.mkdir()
-    data_dir.mkdir()
-    output_dir.mkdir()
-
     # Create test CSV with negative amounts (credits)
     csv_content = """Date,Description,Amount
 01/05/2024,AMAZON MARKETPLACE,45.99
@@ -1689,7 +1636,6 @@ def report_with_credits(tmp_path_factory):
 01/15/2024,WHOLE FOODS,125.50
 01/20/2024,STORE CREDIT,-15.00
 """
-    (data_dir / "transactions.csv").write_text(csv_content)
 
     # Create settings
     settings_content = """year: 2024
@@ -1702,7 +1648,6 @@ data_sources:
 
 merchants_file: config/merchants.rules
 """
-    (config_dir / "settings.yaml").write_text(settings_content)
 
     # Create merchants rules
     rules_content = """[Amazon]
@@ -1720,40 +1665,32 @@ match: normalized("STORE CREDIT")
 category: Shopping
 subcategory: Credits
 """
-    (config_dir / "merchants.rules").write_text(rules_content)
 
-    # Generate the report
-    report_file = output_dir / "report.html"
-    result = subprocess.run(
-        ["uv", "run", "tally", "run", "-o", str(report_file), str(config_dir)],
-        capture_output=True,
-        text=True,
-        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return _build_report(
+        tmp_path_factory, "credits_test", settings_content, rules_content,
+        {"transactions.csv": csv_content}
     )
 
-    if result.returncode != 0:
-        pytest.fail(f"Failed to generate report: {result.stderr}")
 
-    return str(report_file)
+@pytest.fixture(scope="class")
+def credits_page(class_context, report_with_credits):
+    """The credits report, loaded once; its tests only read it."""
+    return _open_report(class_context, report_with_credits)
 
 
 class TestCreditsDisplay:
     """Tests for credits/refunds display in summary cards."""
 
-    def test_credits_shown_in_cash_flow(self, page: Page, report_with_credits):
+    def test_credits_shown_in_cash_flow(self, credits_page: Page):
         """Credits are displayed in the Cash Flow summary card."""
-        page.goto(f"file://{report_with_credits}")
-
         # Cash flow card should show Credits line
-        cashflow_card = page.get_by_test_id("cashflow-card")
+        cashflow_card = credits_page.get_by_test_id("cashflow-card")
         expect(cashflow_card.locator(".breakdown-item", has_text="Credits")).to_be_visible()
 
-    def test_credits_positive_display(self, page: Page, report_with_credits):
+    def test_credits_positive_display(self, credits_page: Page):
         """Credits are shown as positive amounts with + prefix."""
-        page.goto(f"file://{report_with_credits}")
-
         # Find the credits line in cash flow
-        cashflow_card = page.get_by_test_id("cashflow-card")
+        cashflow_card = credits_page.get_by_test_id("cashflow-card")
         credits_item = cashflow_card.locator(".breakdown-item", has_text="Credits")
         credits_value = credits_item.locator(".value")
         # Should show positive amount (the $40 in credits)
@@ -1764,7 +1701,7 @@ class TestCreditsDisplay:
 # Category Percentage Bug Tests (Issue: Subcategory Filter)
 # =============================================================================
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def subcategory_filter_report_path(tmp_path_factory):
     """Generate a report with multiple subcategories to test percentage calculation.
 
@@ -1784,15 +1721,6 @@ def subcategory_filter_report_path(tmp_path_factory):
     - Shopping category: $200 total
       - Online: $200 (Amazon)
     """
-    tmp_dir = tmp_path_factory.mktemp("subcategory_filter_test")
-    config_dir = tmp_dir / "config"
-    data_dir = tmp_dir / "data"
-    output_dir = tmp_dir / "output"
-
-    config_dir.mkdir()
-    data_dir.mkdir()
-    output_dir.mkdir()
-
     csv_content = """Date,Description,Amount
 01/05/2025,WHOLE FOODS MKT,200.00
 01/08/2025,TRADER JOES,100.00
@@ -1800,7 +1728,6 @@ def subcategory_filter_report_path(tmp_path_factory):
 01/15/2025,DOORDASH DELIVERY,100.00
 01/20/2025,AMAZON PURCHASE,200.00
 """
-    (data_dir / "transactions.csv").write_text(csv_content)
 
     settings_content = """year: 2025
 
@@ -1811,7 +1738,6 @@ data_sources:
 
 merchants_file: config/merchants.rules
 """
-    (config_dir / "settings.yaml").write_text(settings_content)
 
     rules_content = """[Whole Foods]
 match: contains("WHOLE FOODS")
@@ -1838,24 +1764,49 @@ match: contains("AMAZON")
 category: Shopping
 subcategory: Online
 """
-    (config_dir / "merchants.rules").write_text(rules_content)
-
-    # Generate report
-    report_path = output_dir / "spending.html"
-    result = subprocess.run(
-        ["uv", "run", "tally", "run", "--format", "html", "-o", str(report_path), str(config_dir)],
-        capture_output=True,
-        text=True,
-        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+    return _build_report(
+        tmp_path_factory, "subcategory_filter_test", settings_content, rules_content,
+        {"transactions.csv": csv_content}, "--format", "html"
     )
 
-    if result.returncode != 0:
-        pytest.fail(f"Failed to generate report: {result.stderr}")
 
-    return str(report_path)
+@pytest.fixture(scope="class")
+def subcategory_filter_page(class_context, subcategory_filter_report_path):
+    """The subcategory filter report, loaded once for the whole class.
+
+    Only for tests that set filters through the URL hash: _set_filter_hash
+    replaces whatever filters the previous test left behind, but not search
+    or autocomplete state, so tests that type use their own page.
+    """
+    return _open_report(class_context, subcategory_filter_report_path)
 
 
-class TestSubcategoryFilterPercentage:
+def _set_filter_hash(page, filter_hash):
+    """Replace the page's filters by changing the URL hash, without a reload.
+
+    Clears the hash first so the report's hashchange handler always resets
+    the active filters, then applies filter_hash ('' for no filters).
+    """
+    page.evaluate("""async (filterHash) => {
+        const setHash = hash => new Promise(resolve => {
+            if (location.hash === hash) return resolve();
+            window.addEventListener('hashchange', resolve, { once: true });
+            location.hash = hash;
+        });
+        await setHash('');
+        await setHash(filterHash);
+    }""", filter_hash)
+
+
+def _section_pct(section):
+    """The percentage in a category section header, once it has rendered."""
+    pct = section.locator(".section-pct")
+    expect(pct).to_have_text(_PCT_SECTION)
+    return float(_PCT_SECTION.search(pct.inner_text()).group(1))
+
+
+class TestSubcategoryFilterPercentage(SharedContextPages):
     """Tests for category percentage calculation when filtering by subcategory.
 
     Bug: When filtering to a subcategory (e.g., Food > Delivery), the category
@@ -1865,44 +1816,34 @@ class TestSubcategoryFilterPercentage:
     typeTotals with filtered grossSpending, producing percentages > 100%.
     """
 
-    def test_unfiltered_category_percentage_valid(self, page: Page, subcategory_filter_report_path):
+    def test_unfiltered_category_percentage_valid(self, subcategory_filter_page: Page):
         """Without filters, category percentages should be between 0-100%."""
-        page.goto(f"file://{subcategory_filter_report_path}")
+        page = subcategory_filter_page
+        _set_filter_hash(page, "")
+        expect(page.get_by_test_id("filter-chip")).to_have_count(0)
 
         # Get Food category percentage
-        food_section = page.get_by_test_id("section-cat-Food")
-        pct_text = food_section.locator(".section-pct").inner_text()
-
-        # Extract percentage value
-        match = re.search(r'\(([\d.]+)%\)', pct_text)
-        assert match, f"Could not find percentage in: {pct_text}"
-        pct_value = float(match.group(1))
+        pct_value = _section_pct(page.get_by_test_id("section-cat-Food"))
 
         # Food is $500 out of $700 total = ~71.4%
         assert 0 <= pct_value <= 100, f"Unfiltered percentage {pct_value}% should be 0-100%"
         assert 70 <= pct_value <= 73, f"Food percentage should be ~71.4%, got {pct_value}%"
 
-    def test_subcategory_filter_percentage_valid(self, page: Page, subcategory_filter_report_path):
+    def test_subcategory_filter_percentage_valid(self, subcategory_filter_page: Page):
         """When filtering by subcategory, category percentage should still be valid (0-100%).
 
         This is the main bug test. With the bug present, filtering to Food > Delivery
         would show ~500% (unfiltered $500 / filtered $100).
         """
-        # Navigate with subcategory filter applied via URL hash
-        page.goto(f"file://{subcategory_filter_report_path}#+sc:Delivery")
+        # Apply subcategory filter via URL hash
+        page = subcategory_filter_page
+        _set_filter_hash(page, "#+sc:Delivery")
 
         # Wait for filter to be applied
-        page.wait_for_timeout(300)
         expect(page.get_by_test_id("filter-chip")).to_be_visible()
 
         # Get Food category percentage
-        food_section = page.get_by_test_id("section-cat-Food")
-        pct_text = food_section.locator(".section-pct").inner_text()
-
-        # Extract percentage value
-        match = re.search(r'\(([\d.]+)%\)', pct_text)
-        assert match, f"Could not find percentage in: {pct_text}"
-        pct_value = float(match.group(1))
+        pct_value = _section_pct(page.get_by_test_id("section-cat-Food"))
 
         # With bug: ~500% (unfiltered Food total $500 / filtered Delivery $100)
         # Fixed: Should be 100% (filtered Food $100 / filtered total $100)
@@ -1921,48 +1862,35 @@ class TestSubcategoryFilterPercentage:
         search.click()
         search.fill("Coffee")
 
-        page.wait_for_timeout(100)
-
         # Click the Coffee subcategory item (with subcategory badge)
         autocomplete = page.locator(".autocomplete-list")
         coffee_item = autocomplete.locator(".autocomplete-item:has(.type.subcategory)", has_text="Coffee")
         coffee_item.click()
 
-        page.wait_for_timeout(300)
-
         # Verify filter is applied
         expect(page.get_by_test_id("filter-chip")).to_be_visible()
 
         # Get Food category percentage
-        food_section = page.get_by_test_id("section-cat-Food")
-        pct_text = food_section.locator(".section-pct").inner_text()
-
-        # Extract and verify percentage
-        match = re.search(r'\(([\d.]+)%\)', pct_text)
-        assert match, f"Could not find percentage in: {pct_text}"
-        pct_value = float(match.group(1))
+        pct_value = _section_pct(page.get_by_test_id("section-cat-Food"))
 
         assert 0 <= pct_value <= 100, (
             f"Category percentage {pct_value}% exceeds 100% when filtered by subcategory. "
             f"Bug: typeTotals.spending uses unfiltered total, grossSpending uses filtered total."
         )
 
-    def test_multiple_subcategory_filters_percentage_valid(self, page: Page, subcategory_filter_report_path):
+    def test_multiple_subcategory_filters_percentage_valid(self, subcategory_filter_page: Page):
         """Multiple subcategory filters should still produce valid percentages."""
         # Filter to both Grocery and Coffee subcategories via URL hash
-        page.goto(f"file://{subcategory_filter_report_path}#+sc:Grocery+sc:Coffee")
-
-        page.wait_for_timeout(300)
+        page = subcategory_filter_page
+        _set_filter_hash(page, "#+sc:Grocery+sc:Coffee")
 
-        # Verify filters are applied (should have 2 filter chips)
-        filter_chips = page.get_by_test_id("filter-chip").all()
-        assert len(filter_chips) >= 1, "Expected at least one filter chip"
+        # Wait for filters to be applied (should have 2 filter chips)
+        expect(page.get_by_test_id("filter-chip").first).to_be_visible()
 
         # Get all category percentages
-        pct_elements = page.locator("[data-testid^='section-cat-'] .section-pct").all()
-        for el in pct_elements:
-            text = el.inner_text()
-            for match in re.finditer(r'\(([\d.]+)%([^)]*)\)', text):
+        pct_texts = page.locator("[data-testid^='section-cat-'] .section-pct").all_inner_texts()
+        for text in pct_texts:
+            for match in _PCT_LABELED.finditer(text):
                 pct = float(match.group(1))
                 label = match.group(2).strip()
                 if not label:  # Only check spending percentages